@@ -0,0 +1,202 @@
+"""
+ALE Determination
+Aggregates monthly hours of service into the full-time and full-time-equivalent
+counts behind Applicable Large Employer status and Form 1094-C Part III.
+
+Hours are reduced per (group, employee, month) and then per (group, month) with
+grouped bincounts, so every client or aggregated (controlled) group in the
+input is counted in one pass regardless of membership size.
+"""
+
+from typing import List, Dict, Any, Optional, Sequence, Tuple
+from dataclasses import dataclass
+import logging
+import math
+
+import numpy as np
+
+from .compliance import ACA_CONSTANTS
+
+logger = logging.getLogger(__name__)
+
+FTE_HOURS_DIVISOR = 120  # Part-time hours per full-time equivalent (and cap per employee-month)
+
+
+@dataclass
+class ALEDetermination:
+    """ALE status and monthly counts for one employer or aggregated group"""
+    group_id: str
+    tax_year: int
+    is_ale: bool
+    
+    # Prior calendar year, which decides ALE status for the tax year
+    average_employee_count: int  # Average monthly full-time + FTE count, rounded down
+    prior_year_full_time_counts: List[int]
+    prior_year_fte_counts: List[float]  # Part-time hours / 120
+    
+    # Tax year, as reported on Form 1094-C Part III
+    full_time_counts: List[int]  # Column (b)
+    total_employee_counts: List[int]  # Column (c)
+    employee_count: int = 0  # Distinct employees with hours in the tax year
+    full_time_employee_count: int = 0  # Distinct employees full-time in any tax-year month (1095-C recipients)
+    
+    has_prior_year_data: bool = True
+
+
+class ALEEngine:
+    """
+    Grouped, vectorized ALE determination.
+    
+    An employee is full-time in a month with at least fte_hours_threshold
+    hours of service; other employees contribute their hours (capped at 120)
+    divided by 120 as full-time equivalents. An employer is an ALE for the
+    tax year when its prior-year average monthly full-time + FTE count,
+    rounded down, reaches the ALE threshold. Hours of one employee at several
+    members of an aggregated group are combined.
+    """
+    
+    def __init__(
+        self,
+        fte_hours_threshold: float = ACA_CONSTANTS["fte_hours_threshold"],
+        ale_threshold: int = ACA_CONSTANTS["ale_threshold"]
+    ):
+        self.fte_hours_threshold = fte_hours_threshold
+        self.ale_threshold = ale_threshold
+    
+    def determine(
+        self,
+        group_ids: Sequence[str],
+        employee_ids: Sequence[str],
+        years: Sequence[int],
+        months: Sequence[int],
+        hours: Sequence[float],
+        tax_year: int
+    ) -> Dict[str, ALEDetermination]:
+        """
+        Determine ALE status and monthly counts for every group in the input.
+        
+        Args:
+            group_ids: Client or aggregated group id per row
+            employee_ids: Employee id per row (integer arrays are coded
+                without a per-row dict lookup)
+            years: Calendar year per row
+            months: Month (1-12) per row
+            hours: Hours of service per row
+            tax_year: Year being determined; rows outside it and the prior
+                year are ignored
+        
+        Returns:
+            ALEDetermination per group id
+        """
+        group_keys, group_codes = _factorize(group_ids)
+        employee_keys, employee_codes = _factorize(employee_ids)
+        n_groups, n_employees = len(group_keys), max(len(employee_keys), 1)
+        
+        # Month slot 0-11 = prior year, 12-23 = tax year
+        slots = (np.asarray(years, dtype=np.int64) - (tax_year - 1)) * 12 + np.asarray(months, dtype=np.int64) - 1
+        in_range = (slots >= 0) & (slots < 24)
+        slots, group_codes, employee_codes = slots[in_range], group_codes[in_range], employee_codes[in_range]
+        row_hours = np.asarray(hours, dtype=np.float64)[in_range]
+        
+        # Hours per (group, employee, month)
+        cells = (group_codes * n_employees + employee_codes) * 24 + slots
+        cell_keys, cell_of_row = np.unique(cells, return_inverse=True)
+        cell_hours = np.bincount(cell_of_row, weights=row_hours, minlength=len(cell_keys))
+        
+        # Counts per (group, month)
+        group_month = (cell_keys // 24 // n_employees) * 24 + cell_keys % 24
+        full_time = cell_hours >= self.fte_hours_threshold
+        part_time_hours = np.where(full_time, 0.0, np.minimum(cell_hours, FTE_HOURS_DIVISOR))
+        size = n_groups * 24
+        full_time_counts = np.bincount(group_month, weights=full_time, minlength=size).reshape(n_groups, 24)
+        fte_counts = np.bincount(group_month, weights=part_time_hours, minlength=size).reshape(n_groups, 24) / FTE_HOURS_DIVISOR
+        employee_counts = np.bincount(group_month, minlength=size).reshape(n_groups, 24)
+        
+        prior_full_time, prior_fte = full_time_counts[:, :12], fte_counts[:, :12]
+        averages = np.floor((prior_full_time.sum(axis=1) + prior_fte.sum(axis=1)) / 12 + 1e-9)
+        has_prior = employee_counts[:, :12].sum(axis=1) > 0
+        
+        # Distinct employees per group in the tax year, and those full-time in any month of it
+        group_employee = cell_keys // 24
+        in_tax_year = cell_keys % 24 >= 12
+        distinct_employees = np.bincount(np.unique(group_employee[in_tax_year]) // n_employees, minlength=n_groups)
+        distinct_full_time = np.bincount(
+            np.unique(group_employee[in_tax_year & full_time]) // n_employees, minlength=n_groups
+        )
+        
+        prior_full_time = prior_full_time.astype(np.int64).tolist()
+        prior_fte = np.round(prior_fte, 2).tolist()
+        full_time_counts = full_time_counts[:, 12:].astype(np.int64).tolist()
+        employee_counts = employee_counts[:, 12:].tolist()
+        return {
+            group_id: ALEDetermination(
+                group_id=group_id,
+                tax_year=tax_year,
+                is_ale=bool(averages[g] >= self.ale_threshold),
+                average_employee_count=int(averages[g]),
+                prior_year_full_time_counts=prior_full_time[g],
+                prior_year_fte_counts=prior_fte[g],
+                full_time_counts=full_time_counts[g],
+                total_employee_counts=employee_counts[g],
+                employee_count=int(distinct_employees[g]),
+                full_time_employee_count=int(distinct_full_time[g]),
+                has_prior_year_data=bool(has_prior[g])
+            )
+            for g, group_id in enumerate(group_keys)
+        }
+    
+    def determine_rows(
+        self,
+        rows: List[Dict[str, Any]],
+        tax_year: int,
+        group_id: Optional[str] = None
+    ) -> Dict[str, ALEDetermination]:
+        """
+        Determine ALE status from monthly_hours-style rows.
+        
+        Args:
+            rows: Dicts with employee_id, year, month and hours_of_service
+                (or hours_worked), plus group_id or client_id
+            tax_year: Year being determined
+            group_id: Treat every row as one aggregated group with this id
+        
+        Returns:
+            ALEDetermination per group id
+        """
+        return self.determine(
+            group_ids=[group_id or r.get("group_id") or r.get("client_id", "") for r in rows],
+            employee_ids=[r.get("employee_id", "") for r in rows],
+            years=[r.get("year", 0) for r in rows],
+            months=[r.get("month", 0) for r in rows],
+            hours=[_hours_of_service(r) for r in rows],
+            tax_year=tax_year
+        )
+
+
+def _factorize(values: Sequence[Any]) -> Tuple[List[Any], np.ndarray]:
+    """Distinct values (in first-seen order for objects) and the code of each row"""
+    if isinstance(values, np.ndarray) and values.dtype.kind in "iu":
+        keys, codes = np.unique(values, return_inverse=True)
+        return keys.tolist(), codes.astype(np.int64)
+    index: Dict[Any, int] = {}
+    codes = np.fromiter(
+        (index.setdefault(v, len(index)) for v in values),
+        dtype=np.int64,
+        count=len(values)
+    )
+    return list(index), codes
+
+
+def _hours_of_service(row: Dict[str, Any]) -> float:
+    value = row.get("hours_of_service")
+    if value is None:
+        value = row.get("hours_worked", 0)
+    try:
+        hours = float(value or 0)
+    except (TypeError, ValueError):
+        return 0.0
+    return hours if math.isfinite(hours) else 0.0
+
+
+# Singleton instance
+ale_engine = ALEEngine()
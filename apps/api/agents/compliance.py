@@ -3,61 +3,62 @@ Compliance Agent
 Applies ACA rules to determine FTE status, affordability, and penalty risk.
 """
 
-from typing import List, Dict, Any, Optional, Tuple
-from dataclasses import dataclass, field
-from datetime import datetime, date
+from typing import List, Dict, Any, Optional, Tuple, AsyncIterator, Iterable, Sequence, Union
+from dataclasses import asdict, dataclass, replace
+from datetime import datetime, date, timedelta
 from enum import Enum
-from decimal import Decimal
+from functools import lru_cache
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from collections import OrderedDict, deque
+from concurrent.futures.process import BrokenProcessPool
+import asyncio
+import hashlib
+import json
 import logging
+import pickle
+
+import numpy as np
+
+from .tax_rules import DEFAULT_TAX_YEAR, tax_rules
+from .worker_pool import get_worker_pool, shutdown_worker_pool
 
 logger = logging.getLogger(__name__)
 
 
-# ACA Constants for 2026
+# ACA Constants (figures that change by tax year live in tax_rules)
 ACA_CONSTANTS = {
-    "affordability_threshold_2026": 0.0912,  # 9.12% for 2026
     "fte_hours_threshold": 130,  # Monthly hours for FTE
     "fte_weekly_threshold": 30,  # Weekly hours for FTE
     "ale_threshold": 50,  # Full-time equivalent employees for ALE status
     "lookback_period_standard": 12,  # Standard measurement period (months)
     "lookback_period_initial": 3,  # Initial measurement period minimum
+    "initial_measurement_months": 12,  # Initial measurement period for new variable-hour employees
+    "administrative_period_months": 2,  # Between a standard measurement period and its stability period
+    "initial_administrative_period_months": 1,  # Between an initial measurement period and its stability period
+    "stability_period_months": 12,
+    "part_time_hours_threshold": 60,  # Monthly average below which look-back is part-time
+    "max_waiting_period_days": 90,  # Longest waiting period before coverage must be offered
 }
 
-# IRS Coverage Codes (Line 14)
-COVERAGE_CODES = {
-    "1A": "Qualifying offer (employee only)",
-    "1B": "MEC providing MV, employee cost ≤ 9.5% mainland FPL",
-    "1C": "Employee's lowest cost ≤ 9.5% Form W-2 wages",
-    "1D": "Employee's lowest cost ≤ 9.5% rate of pay",
-    "1E": "MEC providing MV to employee, dependents, but not spouse",
-    "1F": "MEC providing MV to employee only",
-    "1G": "Offer to employee who was not full-time",
-    "1H": "No offer of coverage",
-    "1I": "Qualifying offer transition relief 2015",
-    "1J": "MEC providing MV, spouse and dependents",
-    "1K": "MEC providing MV to employee, spouse, but not dependents",
-    "1L": "ICHRA offered to employee only",
-    "1M": "ICHRA offered to employee and dependents",
-    "1N": "ICHRA offered to employee, spouse, and dependents",
-    "1O": "ICHRA offered, spouse not offered",
-    "1P": "Reserved",
-    "1Q": "Reserved",
-    "1R": "Reserved",
-    "1S": "ICHRA offered, employee's share affordability unknown",
-}
+ALL_MONTHS = (1 << 12) - 1  # Month bitmask with every month set (bit 0 = January)
 
-# IRS Safe Harbor Codes (Line 15)
-SAFE_HARBOR_CODES = {
-    "2A": "Employee not employed during month",
-    "2B": "Employee not full-time during month",
-    "2C": "Employee enrolled in coverage offered",
-    "2D": "Employee in limited non-assessment period",
-    "2E": "Multiemployer interim rule relief",
-    "2F": "W-2 safe harbor",
-    "2G": "Federal poverty line safe harbor",
-    "2H": "Rate of pay safe harbor",
-    "2I": "Non-calendar year transition relief",
-}
+# Employee fields an assessment depends on; a change to any of them forces reassessment
+COMPLIANCE_INPUT_FIELDS = (
+    "employee_id", "record_id", "employment_type", "hire_date", "termination_date",
+    "hours_worked", "annual_salary", "hourly_rate", "offer_months", "enrolled_months", "tax_year",
+)
+DEFAULT_FINGERPRINT_CLIENTS = 16  # Clients whose assessments are kept for reuse
+
+AssessmentKey = Tuple[str, int]  # (employee_id, tax_year)
+PARALLEL_ASSESSMENT_THRESHOLD = 10000  # Batch size from which assessment moves to a process pool
+DEFAULT_ASSESSMENT_SHARD_SIZE = 1000  # Employees per process pool shard
+
+RATE_OF_PAY_MONTHLY_HOURS = 130  # Hours assumed by the rate of pay safe harbor
+
+# Affordability safe harbors and the Line 16 code reporting each
+SAFE_HARBORS = ("W2", "rate_of_pay", "FPL")
+SAFE_HARBOR_LINE_16 = {"W2": "2F", "rate_of_pay": "2H", "FPL": "2G"}
+_W2, _RATE_OF_PAY, _FPL = range(len(SAFE_HARBORS))
 
 
 class ComplianceStatus(str, Enum):
@@ -80,6 +81,40 @@ class PenaltyType(str, Enum):
     SECTION_4980H_B = "4980h_b"  # Unaffordable/inadequate coverage
 
 
+class ReasonCode(str, Enum):
+    """Why an assessment or penalty risk was flagged; text is rendered on demand"""
+    FTE_UNDETERMINED = "fte_undetermined"
+    LOW_FTE_CONFIDENCE = "low_fte_confidence"
+    UNAFFORDABLE = "unaffordable"
+    NO_OFFER = "no_offer"  # 4980H(a)
+    OVER_THRESHOLD = "over_threshold"  # 4980H(b)
+
+
+# Issue text per reason code ({} takes the code's detail, e.g. a confidence or threshold)
+REASON_ISSUES = {
+    ReasonCode.FTE_UNDETERMINED: "FTE status cannot be determined - insufficient hours data",
+    ReasonCode.LOW_FTE_CONFIDENCE: "Low confidence ({}%) in FTE determination",
+    ReasonCode.UNAFFORDABLE: "Coverage fails affordability test",
+    ReasonCode.NO_OFFER: "No coverage offered to full-time employee",
+    ReasonCode.OVER_THRESHOLD: "Coverage exceeds {:.2f}% affordability threshold",
+}
+
+# Recommendations per reason code (for penalty reasons, the mitigation options)
+REASON_RECOMMENDATIONS = {
+    ReasonCode.FTE_UNDETERMINED: ("Collect 3-12 months of hours data for look-back measurement",),
+    ReasonCode.LOW_FTE_CONFIDENCE: ("Review hours tracking process for accuracy",),
+    ReasonCode.UNAFFORDABLE: ("Consider offering lower-cost plan tier",),
+    ReasonCode.NO_OFFER: ("Extend coverage offer immediately", "Review classification - may be part-time"),
+    ReasonCode.OVER_THRESHOLD: ("Reduce employee premium contribution", "Offer lower-cost plan option"),
+}
+
+
+@lru_cache(maxsize=1024)
+def render_issue(code: ReasonCode, detail: Any = None) -> str:
+    """Issue text for a reason code, rendered once per code and detail"""
+    return REASON_ISSUES[code].format(detail)
+
+
 @dataclass
 class MonthlyHours:
     """Hours worked in a specific month"""
@@ -103,20 +138,90 @@ class FTEDetermination:
     is_new_hire: bool = False
 
 
+def to_cents(amount: Any) -> int:
+    """Dollar amount (number or numeric string) to integer cents, rounding half up"""
+    return int((Decimal(str(amount)) * 100).quantize(Decimal("1"), rounding=ROUND_HALF_UP))
+
+
+def to_basis_points(fraction: Any) -> int:
+    """Fraction (number or numeric string, e.g. 0.0912) to integer basis points, rounding half up"""
+    return int((Decimal(str(fraction)) * 10000).quantize(Decimal("1"), rounding=ROUND_HALF_UP))
+
+
+def _cents_or_none(amount: Any) -> Optional[int]:
+    """to_cents for a set, finite amount; None when missing, zero or not a number"""
+    if not amount:
+        return None
+    try:
+        value = Decimal(str(amount))
+    except InvalidOperation:
+        return None
+    if not value.is_finite() or not value:
+        return None
+    return int((value * 100).quantize(Decimal("1"), rounding=ROUND_HALF_UP))
+
+
+def to_dollars(cents: int) -> Decimal:
+    """Integer cents to a Decimal dollar amount"""
+    return Decimal(cents).scaleb(-2)
+
+
 @dataclass
 class AffordabilityCalculation:
-    """Result of affordability test"""
+    """
+    Result of affordability test.
+    
+    Amounts are held in integer cents and the threshold in basis points; the
+    Decimal properties are for the API and form layers. The wages of every
+    safe harbor are kept, not only those of the one used.
+    """
     employee_id: str
     is_affordable: bool
-    employee_contribution: Decimal
-    household_income: Optional[Decimal]
-    safe_harbor_used: str  # "W2", "FPL", "rate_of_pay"
-    affordability_percentage: Decimal
-    threshold: Decimal
+    employee_contribution_cents: int
+    household_income_cents: Optional[int]  # Annual W-2 wages, when known
+    safe_harbor_used: str  # Most favorable of SAFE_HARBORS
+    threshold_bp: int
     
     # For rate of pay safe harbor
-    hourly_rate: Optional[Decimal] = None
+    hourly_rate_cents: Optional[int] = None
     monthly_hours_assumed: int = 130
+    
+    # For FPL safe harbor
+    federal_poverty_line_cents: int = tax_rules.get(DEFAULT_TAX_YEAR).federal_poverty_line_cents
+    
+    @property
+    def employee_contribution(self) -> Decimal:
+        return to_dollars(self.employee_contribution_cents)
+    
+    @property
+    def household_income(self) -> Optional[Decimal]:
+        return to_dollars(self.household_income_cents) if self.household_income_cents is not None else None
+    
+    @property
+    def hourly_rate(self) -> Optional[Decimal]:
+        return to_dollars(self.hourly_rate_cents) if self.hourly_rate_cents is not None else None
+    
+    @property
+    def threshold(self) -> Decimal:
+        return Decimal(self.threshold_bp).scaleb(-4)
+    
+    @property
+    def line_16_code(self) -> str:
+        return SAFE_HARBOR_LINE_16[self.safe_harbor_used]
+    
+    @property
+    def affordability_percentage(self) -> Decimal:
+        """Employee contribution as a share of the safe harbor monthly wage"""
+        if self.safe_harbor_used == "rate_of_pay":
+            monthly_wage = self.hourly_rate * self.monthly_hours_assumed
+            return self.employee_contribution / monthly_wage if monthly_wage > 0 else Decimal("0")
+        # One division, so an exactly-at-threshold share compares equal
+        if self.safe_harbor_used == "W2":
+            annual = self.household_income
+            return self.employee_contribution * 12 / annual if annual > 0 else Decimal("0")
+        if self.safe_harbor_used == "FPL":
+            return self.employee_contribution * 12 / to_dollars(self.federal_poverty_line_cents)
+        return Decimal("0")
 
 
 @dataclass
@@ -124,10 +229,82 @@ class PenaltyRisk:
     """Assessment of potential ACA penalty exposure"""
     employee_id: str
     penalty_type: PenaltyType
-    potential_penalty_amount: Decimal
+    potential_penalty_cents: int
     months_at_risk: List[int]
-    reason: str
-    mitigation_options: List[str]
+    reason_code: ReasonCode
+    threshold_bp: Optional[int] = None  # Affordability threshold behind a 4980H(b) risk
+    
+    @property
+    def potential_penalty_amount(self) -> Decimal:
+        return to_dollars(self.potential_penalty_cents)
+    
+    @property
+    def reason(self) -> str:
+        detail = Decimal(self.threshold_bp).scaleb(-2) if self.threshold_bp is not None else None
+        return render_issue(self.reason_code, detail)
+    
+    @property
+    def mitigation_options(self) -> List[str]:
+        return list(REASON_RECOMMENDATIONS[self.reason_code])
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Fields plus the rendered reason and mitigation options (which asdict() omits)"""
+        data = asdict(self)
+        data["reason"] = self.reason
+        data["mitigation_options"] = self.mitigation_options
+        return data
+
+
+@dataclass
+class MeasurementDetermination:
+    """FTE status of one employee under the look-back measurement method, as of a date"""
+    employee_id: str
+    as_of: str
+    status: FTEStatus  # VARIABLE_HOUR while a new employee is still being measured
+    period: str  # "standard", "initial", "initial_measurement" or "none"
+    is_ongoing: bool  # Employed for a whole standard measurement period
+    average_monthly_hours: float
+    months_measured: int  # Months with hours data in the measurement period
+    
+    # Periods behind the status, as YYYY-MM months (empty when period is "none")
+    measurement_start: str
+    measurement_end: str
+    stability_start: str
+    stability_end: str
+
+
+@dataclass
+class HoursCalendar:
+    """Cumulative monthly hours on a calendar grid, one row per employee"""
+    first_month: int  # Month ordinal (year * 12 + month - 1) of column 1
+    hours: np.ndarray  # hours[:, k] = hours before month first_month + k
+    months: np.ndarray  # months[:, k] = months with hours data before first_month + k
+    
+    def window(self, start: Any, end: Any) -> Tuple[np.ndarray, np.ndarray]:
+        """Hours and months with data in months start..end-1 (ordinals, broadcast per employee)"""
+        rows = np.arange(len(self.hours))[:, None]
+        last = self.hours.shape[1] - 1
+        lo = np.clip(np.asarray(start) - self.first_month, 0, last)
+        hi = np.clip(np.asarray(end) - self.first_month, 0, last)
+        hi = np.maximum(hi, lo)
+        return self.hours[rows, hi] - self.hours[rows, lo], self.months[rows, hi] - self.months[rows, lo]
+
+
+@dataclass
+class MonthlyCodes:
+    """Form 1095-C Part II codes for each month of the tax year"""
+    employee_id: str
+    
+    # Month bitmasks, bit 0 = January
+    employed_months: int
+    full_time_months: int
+    waiting_months: int  # Limited non-assessment period
+    offer_months: int
+    enrolled_months: int
+    
+    line_14: List[str]  # Offer of coverage, 12 entries
+    line_15: List[Optional[Decimal]]  # Employee required contribution
+    line_16: List[Optional[str]]  # Safe harbor / relief code
 
 
 @dataclass
@@ -150,9 +327,43 @@ class ComplianceAssessment:
     # Risk
     penalty_risk: Optional[PenaltyRisk]
     
-    # Recommendations
-    issues: List[str] = field(default_factory=list)
-    recommendations: List[str] = field(default_factory=list)
+    # Reasons behind the status; issues and recommendations render from them on access
+    reason_codes: Tuple[ReasonCode, ...] = ()
+    
+    # Month-by-month codes
+    monthly_codes: Optional[MonthlyCodes] = None
+    tax_year: Optional[int] = None
+    
+    @property
+    def issues(self) -> List[str]:
+        issues = [render_issue(code, self._reason_detail(code)) for code in self.reason_codes]
+        if self.penalty_risk:
+            issues.extend(self.penalty_risk.mitigation_options)
+        return issues
+    
+    @property
+    def recommendations(self) -> List[str]:
+        return [text for code in self.reason_codes for text in REASON_RECOMMENDATIONS[code]]
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Plain-dict form of the assessment, including the rendered text.
+        
+        issues and recommendations are properties rendered from reason_codes,
+        so dataclasses.asdict() leaves them out (and the constructor does not
+        take them); serialize through this instead.
+        """
+        data = asdict(self)
+        data["issues"] = self.issues
+        data["recommendations"] = self.recommendations
+        if self.penalty_risk is not None:
+            data["penalty_risk"] = self.penalty_risk.to_dict()
+        return data
+    
+    def _reason_detail(self, code: ReasonCode) -> Any:
+        if code == ReasonCode.LOW_FTE_CONFIDENCE:
+            return self.fte_determination.confidence
+        return None
 
 
 @dataclass
@@ -164,8 +375,1024 @@ class ComplianceResult:
     at_risk: int
     non_compliant: int
     assessments: List[ComplianceAssessment]
-    aggregate_penalty_exposure: Decimal
+    aggregate_penalty_cents: int
     duration_ms: int
+    reused: int = 0  # Assessments served unchanged from the fingerprint store
+    
+    @property
+    def aggregate_penalty_exposure(self) -> Decimal:
+        return to_dollars(self.aggregate_penalty_cents)
+
+
+@dataclass
+class PenaltyScenario:
+    """
+    A what-if variant of the coverage terms behind an assessment.
+    
+    Fields left as None keep the batch's own value; premium and offer
+    override the matching coverage_data keys.
+    """
+    name: str
+    employee_monthly_premium: Optional[Any] = None  # Dollars
+    contribution_change: Any = 0  # Dollars added to the premium (negative for a cut)
+    safe_harbor: Optional[str] = None  # One of SAFE_HARBORS; None keeps each employee's usual one
+    affordability_threshold: Optional[Any] = None  # Fraction of wages, e.g. 0.0912
+    offer_made: Optional[bool] = None
+
+
+@dataclass
+class ScenarioExposure:
+    """Penalty exposure of a population under one PenaltyScenario"""
+    name: str
+    full_time_employees: int
+    no_offer_count: int  # Full-time employees exposed under 4980H(a)
+    unaffordable_count: int  # Full-time employees exposed under 4980H(b)
+    section_4980h_a_cents: int
+    section_4980h_b_cents: int
+    
+    @property
+    def total_penalty_cents(self) -> int:
+        return self.section_4980h_a_cents + self.section_4980h_b_cents
+    
+    @property
+    def total_penalty_exposure(self) -> Decimal:
+        return to_dollars(self.total_penalty_cents)
+
+
+@dataclass
+class SafeHarborUsage:
+    """How one affordability safe harbor fares across a population"""
+    safe_harbor: str
+    line_16_code: str
+    eligible: int  # Employees whose wage data the safe harbor can use
+    affordable: int  # Employees it proves affordable
+    only_affordable: int  # Employees no other safe harbor proves affordable
+    selected: int  # Employees for whom it is the most favorable
+    average_contribution_cents: int  # Over selected employees
+    average_headroom_cents: int  # Monthly contribution left before the threshold, over selected employees
+
+
+@dataclass
+class SafeHarborSummary:
+    """Safe harbor distribution over the full-time employees of a population"""
+    total_employees: int
+    affordable: int  # Affordable under their most favorable safe harbor
+    usage: List[SafeHarborUsage]
+
+
+@dataclass
+class ClientComplianceTotals:
+    """Running totals over the latest assessment of each of a client's employees"""
+    total_assessed: int = 0
+    compliant: int = 0
+    at_risk: int = 0
+    non_compliant: int = 0
+    pending_review: int = 0
+    aggregate_penalty_cents: int = 0
+    
+    @property
+    def aggregate_penalty_exposure(self) -> Decimal:
+        return to_dollars(self.aggregate_penalty_cents)
+    
+    def apply(self, assessment: ComplianceAssessment, sign: int) -> None:
+        """Add (sign=1) or remove (sign=-1) one assessment"""
+        self.total_assessed += sign
+        status = assessment.status.value
+        setattr(self, status, getattr(self, status) + sign)
+        if assessment.penalty_risk:
+            self.aggregate_penalty_cents += sign * assessment.penalty_risk.potential_penalty_cents
+
+
+class AssessmentFingerprintStore:
+    """
+    In-process store of each client's latest assessment per employee and tax
+    year, keyed by a fingerprint of the inputs it was computed from.
+    
+    Entries are keyed by (employee_id, tax_year), so a batch carrying prior-year
+    corrections alongside current filings keeps one assessment for each.
+    
+    Unchanged employees are served from the store and client totals are kept
+    up to date by applying only the assessments that changed. The least
+    recently used clients are dropped beyond max_clients.
+    """
+    
+    def __init__(self, max_clients: int = DEFAULT_FINGERPRINT_CLIENTS):
+        self.max_clients = max_clients
+        self._entries: "OrderedDict[str, Dict[AssessmentKey, Tuple[bytes, ComplianceAssessment]]]" = OrderedDict()
+        self._totals: Dict[str, ClientComplianceTotals] = {}
+    
+    def fingerprint(self, client_id: str, key: AssessmentKey) -> Optional[bytes]:
+        """Fingerprint of the stored assessment, if any"""
+        entry = self._client(client_id).get(key)
+        return entry[0] if entry is not None else None
+    
+    def get(self, client_id: str, key: AssessmentKey, fingerprint: bytes) -> Optional[ComplianceAssessment]:
+        """Previous assessment, if it was computed from identical inputs"""
+        entry = self._client(client_id).get(key)
+        if entry is not None and entry[0] == fingerprint:
+            return entry[1]
+        return None
+    
+    def put(
+        self,
+        client_id: str,
+        key: AssessmentKey,
+        fingerprint: bytes,
+        assessment: ComplianceAssessment
+    ) -> None:
+        entries = self._client(client_id)
+        totals = self._totals[client_id]
+        previous = entries.get(key)
+        if previous is not None:
+            totals.apply(previous[1], -1)
+        totals.apply(assessment, 1)
+        entries[key] = (fingerprint, assessment)
+    
+    def totals(self, client_id: str) -> ClientComplianceTotals:
+        """Totals over every employee and tax year assessed for the client so far"""
+        self._client(client_id)
+        return replace(self._totals[client_id])
+    
+    def assessments(self, client_id: str) -> List[ComplianceAssessment]:
+        """Latest assessment of each employee and tax year assessed for the client"""
+        if client_id not in self._entries:
+            return []
+        return [assessment for _, assessment in self._client(client_id).values()]
+    
+    def forget(self, client_id: str) -> None:
+        self._entries.pop(client_id, None)
+        self._totals.pop(client_id, None)
+    
+    def _client(self, client_id: str) -> Dict[AssessmentKey, Tuple[bytes, ComplianceAssessment]]:
+        if client_id in self._entries:
+            self._entries.move_to_end(client_id)
+            return self._entries[client_id]
+        
+        self._entries[client_id] = {}
+        self._totals[client_id] = ClientComplianceTotals()
+        while len(self._entries) > self.max_clients:
+            evicted, _ = self._entries.popitem(last=False)
+            del self._totals[evicted]
+        return self._entries[client_id]
+
+
+class MeasurementPeriodEngine:
+    """
+    Look-back measurement method with standard and initial measurement periods.
+    
+    An ongoing employee (employed for a whole standard measurement period) is
+    full-time for a stability period when their average monthly hours over
+    the preceding standard measurement period reach the threshold. A new
+    employee is measured over an initial measurement period starting the
+    first of the month after hire; until its administrative period ends they
+    are variable-hour, then the result holds for an initial stability period
+    (a full-time result also overrides an overlapping standard one).
+    
+    Hours are laid out on a calendar-month grid and summed cumulatively once,
+    so every window is a difference of two prefix sums: standard windows are
+    shared by the whole population, initial windows follow each hire date,
+    and any as-of date (including prior tax years) reuses the same arrays.
+    Only hours reported before the as-of month are ever read.
+    """
+    
+    _STATUSES = (FTEStatus.FULL_TIME, FTEStatus.PART_TIME, FTEStatus.VARIABLE_HOUR, FTEStatus.UNDETERMINED)
+    _PERIODS = ("standard", "initial", "initial_measurement", "none")
+    _NOT_HIRED = -(1 << 40)  # Month ordinal used for employees without a hire date
+    
+    def __init__(
+        self,
+        fte_hours_threshold: float = ACA_CONSTANTS["fte_hours_threshold"],
+        standard_months: int = ACA_CONSTANTS["lookback_period_standard"],
+        administrative_months: int = ACA_CONSTANTS["administrative_period_months"],
+        stability_months: int = ACA_CONSTANTS["stability_period_months"],
+        stability_start_month: int = 1,
+        initial_months: int = ACA_CONSTANTS["initial_measurement_months"],
+        initial_administrative_months: int = ACA_CONSTANTS["initial_administrative_period_months"]
+    ):
+        """
+        Args:
+            fte_hours_threshold: Average monthly hours for full-time status
+            standard_months: Standard measurement period length
+            administrative_months: Standard administrative period length
+            stability_months: Stability period length (standard and initial)
+            stability_start_month: Calendar month (1-12) standard stability periods start in
+            initial_months: Initial measurement period length
+            initial_administrative_months: Initial administrative period length
+        """
+        self.fte_hours_threshold = fte_hours_threshold
+        self.standard_months = standard_months
+        self.administrative_months = administrative_months
+        self.stability_months = stability_months
+        self.stability_start_month = stability_start_month
+        self.initial_months = initial_months
+        self.initial_administrative_months = initial_administrative_months
+    
+    def hours_calendar(
+        self,
+        employees: List[Dict[str, Any]],
+        window: Optional[Tuple[int, int]] = None
+    ) -> HoursCalendar:
+        """
+        Cumulative hours per employee and calendar month.
+        
+        Entries of hours_worked are placed by their period (YYYY-MM) or
+        year/month keys; entries without either are ignored and entries for
+        the same month are added up.
+        
+        Args:
+            employees: Normalized employee records with hours_worked
+            window: (start, end) month ordinals to keep, end exclusive; hours
+                outside it are ignored, so stray years cannot widen the grid
+        """
+        n = len(employees)
+        histories = [employee.get("hours_worked") or [] for employee in employees]
+        lengths = np.fromiter((len(history) for history in histories), dtype=np.int64, count=n)
+        entries = [entry for history in histories for entry in history]
+        keys = [entry.get("period") for entry in entries]
+        distinct = set(keys)
+        if None in distinct:
+            keys = [
+                key if key is not None else (entry.get("year"), entry.get("month"))
+                for key, entry in zip(keys, entries)
+            ]
+            distinct = set(keys)
+        month_of = {key: _month_ordinal(key) for key in distinct}
+        month_of = {key: -1 if month is None else month for key, month in month_of.items()}
+        months = np.fromiter(map(month_of.__getitem__, keys), dtype=np.int64, count=len(keys))
+        values = np.fromiter((entry.get("hours", 0) or 0 for entry in entries), dtype=np.float64, count=len(entries))
+        rows = np.repeat(np.arange(n), lengths)
+        dated = months >= 0
+        if window is not None:
+            dated &= (months >= window[0]) & (months < window[1])
+        months, values, rows = months[dated], values[dated], rows[dated]
+        
+        if not len(months):
+            return HoursCalendar(first_month=0, hours=np.zeros((n, 1)), months=np.zeros((n, 1), dtype=np.int64))
+        first = int(months.min())
+        span = int(months.max()) - first + 1
+        cells = rows * span + months - first
+        hours = np.bincount(cells, weights=values, minlength=n * span).reshape(n, span)
+        observed = np.bincount(cells, minlength=n * span).reshape(n, span) > 0
+        
+        cumulative_hours = np.zeros((n, span + 1))
+        cumulative_months = np.zeros((n, span + 1), dtype=np.int64)
+        np.cumsum(hours, axis=1, out=cumulative_hours[:, 1:])
+        np.cumsum(observed, axis=1, out=cumulative_months[:, 1:])
+        return HoursCalendar(first_month=first, hours=cumulative_hours, months=cumulative_months)
+    
+    def determine(
+        self,
+        employees: List[Dict[str, Any]],
+        as_of: Optional[date] = None,
+        calendar: Optional[HoursCalendar] = None
+    ) -> List[MeasurementDetermination]:
+        """
+        Determine each employee's status for the month containing as_of.
+        
+        Args:
+            employees: Normalized employee records with hire_date and hours_worked
+            as_of: Date to determine status for (defaults to today)
+            calendar: hours_calendar(employees) covering the measurement
+                window of as_of, when already built
+        
+        Returns:
+            MeasurementDetermination per employee, in input order
+        """
+        as_of = as_of or date.today()
+        month = as_of.year * 12 + as_of.month - 1
+        if calendar is None:
+            calendar = self.hours_calendar(employees, self.measurement_window(month, month))
+        start, hired = self._initial_starts(employees)
+        result = self._classify(calendar, start, hired, np.array([month]))
+        
+        as_of_text = as_of.isoformat()
+        columns = [column[:, 0].tolist() for column in result]
+        text = {ordinal: _month_text(ordinal) for ordinal in np.unique(result[-1]).tolist()}
+        text.update({ordinal - 1: _month_text(ordinal - 1) for ordinal in list(text)})
+        determinations = []
+        for employee, status, period, ongoing, average, measured, window in zip(employees, *columns):
+            determinations.append(MeasurementDetermination(
+                employee_id=employee.get("employee_id", employee.get("record_id", "unknown")),
+                as_of=as_of_text,
+                status=self._STATUSES[status],
+                period=self._PERIODS[period],
+                is_ongoing=ongoing,
+                average_monthly_hours=round(average, 1),
+                months_measured=measured,
+                measurement_start=text[window[0]],
+                measurement_end=text[window[1] - 1],
+                stability_start=text[window[2]],
+                stability_end=text[window[3] - 1]
+            ))
+        return determinations
+    
+    def full_time_months(
+        self,
+        employees: List[Dict[str, Any]],
+        tax_year: int,
+        calendar: Optional[HoursCalendar] = None
+    ) -> np.ndarray:
+        """
+        Months of the tax year each employee is full-time under the look-back method.
+        
+        Returns:
+            Month bitmask per employee (bit 0 = January)
+        """
+        months = tax_year * 12 + np.arange(12)
+        if calendar is None:
+            calendar = self.hours_calendar(employees, self.measurement_window(int(months[0]), int(months[-1])))
+        start, hired = self._initial_starts(employees)
+        statuses = self._classify(calendar, start, hired, months)[0]
+        return ((statuses == 0) << np.arange(12)).sum(axis=1)
+    
+    def is_new_hire(self, hire_date: Optional[str], as_of: date) -> bool:
+        """True while the employee's initial measurement or administrative period is running"""
+        hire = _parse_iso_date(hire_date)
+        if hire is None:
+            return False
+        start = hire.year * 12 + hire.month - 1 + (hire.day > 1)
+        return as_of.year * 12 + as_of.month - 1 < start + self.initial_months + self.initial_administrative_months
+    
+    def measurement_window(self, first_month: int, last_month: int) -> Tuple[int, int]:
+        """
+        Months of hours read to classify months first_month..last_month.
+        
+        Covers the standard measurement period of the first month and any
+        initial measurement period whose stability period reaches it; hours
+        from the classified months on are never read.
+        
+        Returns:
+            (start, end) month ordinals, end exclusive
+        """
+        standard_start = self.standard_periods(first_month)[0]
+        initial_start = first_month - self.initial_months - self.initial_administrative_months - self.stability_months + 1
+        return min(standard_start, initial_start), last_month
+    
+    def standard_periods(self, month: Any) -> Tuple[Any, Any, Any, Any]:
+        """
+        Standard measurement period and stability period covering a month.
+        
+        Args:
+            month: Month ordinal(s), year * 12 + month - 1
+        
+        Returns:
+            (measurement start, measurement end, stability start, stability end)
+            month ordinals, ends exclusive
+        """
+        anchor = self.stability_start_month - 1
+        stability_start = anchor + (month - anchor) // self.stability_months * self.stability_months
+        measurement_end = stability_start - self.administrative_months
+        return (
+            measurement_end - self.standard_months,
+            measurement_end,
+            stability_start,
+            stability_start + self.stability_months
+        )
+    
+    def _initial_starts(self, employees: List[Dict[str, Any]]) -> Tuple[np.ndarray, np.ndarray]:
+        """Initial measurement start month and hire month per employee (ordinals)"""
+        memo: Dict[Any, Tuple[int, int]] = {}
+        starts = []
+        for employee in employees:
+            hire_date = employee.get("hire_date")
+            if hire_date not in memo:
+                hire = _parse_iso_date(hire_date)
+                if hire is None:
+                    memo[hire_date] = (self._NOT_HIRED, self._NOT_HIRED)
+                else:
+                    month = hire.year * 12 + hire.month - 1
+                    memo[hire_date] = (month + (hire.day > 1), month)
+            starts.append(memo[hire_date])
+        if not starts:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        start, hired = np.array(starts, dtype=np.int64).T
+        return start, hired
+    
+    def _classify(
+        self,
+        calendar: HoursCalendar,
+        start: np.ndarray,
+        hired: np.ndarray,
+        months: np.ndarray
+    ) -> Tuple[np.ndarray, ...]:
+        """
+        Status of every employee in every given month.
+        
+        Returns:
+            (status index, period index, is ongoing, average hours, months
+            measured, (measurement start, end, stability start, end)) arrays
+            of employees x months
+        """
+        n = len(start)
+        month = months[None, :]
+        start, hired = start[:, None], hired[:, None]
+        
+        # Standard periods are the same for everyone
+        standard_start, standard_end, stability_start, stability_end = self.standard_periods(month)
+        standard_hours, standard_measured = calendar.window(standard_start, standard_end)
+        ongoing = start <= standard_start
+        
+        # Initial periods follow the hire date; a running measurement only counts months before this one
+        initial_end = start + self.initial_months
+        initial_stability_start = initial_end + self.initial_administrative_months
+        initial_stability_end = initial_stability_start + self.stability_months
+        initial_hours, initial_measured = calendar.window(start, np.minimum(initial_end, month))
+        
+        standard_average = np.divide(
+            standard_hours, standard_measured,
+            out=np.zeros(standard_hours.shape), where=standard_measured > 0
+        )
+        initial_average = np.divide(
+            initial_hours, initial_measured,
+            out=np.zeros(initial_hours.shape), where=initial_measured > 0
+        )
+        # Rounded so prefix-sum error cannot flip a threshold comparison
+        standard_full_time = np.round(standard_average, 6) >= self.fte_hours_threshold
+        initial_full_time = np.round(initial_average, 6) >= self.fte_hours_threshold
+        standard_status = np.where(standard_measured > 0, np.where(standard_full_time, 0, 1), 3)
+        initial_status = np.where(initial_measured > 0, np.where(initial_full_time, 0, 1), 3)
+        
+        in_initial_stability = (month >= initial_stability_start) & (month < initial_stability_end)
+        use_initial = np.where(
+            ongoing,
+            in_initial_stability & (initial_measured > 0) & (initial_full_time | (standard_measured == 0)),
+            month >= initial_stability_start  # Carried until the employee is ongoing
+        )
+        not_hired = month < hired
+        status = np.select([not_hired, use_initial, ongoing], [3, initial_status, standard_status], default=2)
+        period = np.select([not_hired, use_initial, ongoing], [3, 1, 0], default=2)
+        
+        shape = (n, len(months))
+        is_initial = period != 0
+        windows = np.stack([
+            np.broadcast_to(np.where(is_initial, start, standard_start), shape),
+            np.broadcast_to(np.where(is_initial, initial_end, standard_end), shape),
+            np.broadcast_to(np.where(is_initial, initial_stability_start, stability_start), shape),
+            np.broadcast_to(np.where(is_initial, initial_stability_end, stability_end), shape),
+        ], axis=-1)
+        windows[period == 3] = -1
+        return (
+            status,
+            period,
+            np.broadcast_to(ongoing, shape),
+            np.where(is_initial, initial_average, standard_average),
+            np.where(is_initial, initial_measured, standard_measured),
+            windows
+        )
+
+
+class FTELookbackEngine:
+    """
+    Vectorized FTE determination for a whole population.
+    
+    Monthly hours are loaded into an employees x months matrix, right-aligned so
+    the last column holds each employee's most recent month. Rolling averages
+    over the measurement period come from prefix sums along the month axis, and
+    every employee is classified from the latest window in one pass.
+    """
+    
+    def __init__(
+        self,
+        fte_hours_threshold: float = ACA_CONSTANTS["fte_hours_threshold"],
+        part_time_threshold: float = ACA_CONSTANTS["part_time_hours_threshold"],
+        measurement_months: int = ACA_CONSTANTS["lookback_period_standard"],
+        periods: Optional[MeasurementPeriodEngine] = None
+    ):
+        self.fte_hours_threshold = fte_hours_threshold
+        self.part_time_threshold = part_time_threshold
+        self.measurement_months = measurement_months
+        # Decides who is still a new hire (in an initial measurement period)
+        self.periods = periods or MeasurementPeriodEngine(fte_hours_threshold, standard_months=measurement_months)
+    
+    def hours_matrix(self, employees: List[Dict[str, Any]]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Load each employee's hours_worked entries (in chronological order).
+        
+        Returns:
+            (hours, observed) arrays of shape (employees, months)
+        """
+        histories = [e.get("hours_worked") or [] for e in employees]
+        lengths = np.fromiter((len(h) for h in histories), dtype=np.int64, count=len(histories))
+        months = int(lengths.max()) if len(lengths) else 0
+        total = int(lengths.sum())
+        values = np.fromiter(
+            (entry.get("hours", 0) for h in histories for entry in h),
+            dtype=np.float64,
+            count=total
+        )
+        
+        rows = np.repeat(np.arange(len(histories)), lengths)
+        first_entry = np.repeat(np.cumsum(lengths) - lengths, lengths)
+        first_col = np.repeat(months - lengths, lengths)
+        cols = first_col + np.arange(total) - first_entry
+        
+        hours = np.zeros((len(histories), months))
+        observed = np.zeros((len(histories), months), dtype=bool)
+        hours[rows, cols] = values
+        observed[rows, cols] = True
+        return hours, observed
+    
+    def rolling_averages(
+        self,
+        hours: np.ndarray,
+        observed: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Average monthly hours over the measurement period ending at each month.
+        
+        Returns:
+            (averages, months counted) arrays shaped like hours
+        """
+        n, months = hours.shape
+        hour_sums = np.zeros((n, months + 1))
+        month_counts = np.zeros((n, months + 1), dtype=np.int64)
+        np.cumsum(hours, axis=1, out=hour_sums[:, 1:])
+        np.cumsum(observed, axis=1, out=month_counts[:, 1:])
+        
+        window_start = np.maximum(np.arange(1, months + 1) - self.measurement_months, 0)
+        window_hours = hour_sums[:, 1:] - hour_sums[:, window_start]
+        window_months = month_counts[:, 1:] - month_counts[:, window_start]
+        averages = np.divide(
+            window_hours, window_months,
+            out=np.zeros_like(window_hours), where=window_months > 0
+        )
+        # Rounded so prefix-sum error cannot flip a threshold comparison
+        return np.round(averages, 6), window_months
+    
+    def determine(
+        self,
+        employees: List[Dict[str, Any]],
+        as_of: Union[date, Sequence[date], None] = None
+    ) -> List[FTEDetermination]:
+        """
+        Determine FTE status for every employee.
+        
+        Employer classifications (full_time/ft, part_time/pt) take precedence;
+        otherwise the latest look-back window decides, and employees without
+        hours data are undetermined.
+        
+        Args:
+            employees: Normalized employee records
+            as_of: Date new-hire status is determined for, or one per
+                employee (defaults to today)
+        """
+        if as_of is None or isinstance(as_of, date):
+            as_of = [as_of or date.today()] * len(employees)
+        n = len(employees)
+        hours, observed = self.hours_matrix(employees)
+        if hours.shape[1]:
+            averages, window_months = self.rolling_averages(hours, observed)
+            latest_avg, latest_months = averages[:, -1], window_months[:, -1]
+        else:
+            latest_avg, latest_months = np.zeros(n), np.zeros(n, dtype=np.int64)
+        
+        full_time = latest_avg >= self.fte_hours_threshold
+        part_time = ~full_time & (latest_avg < self.part_time_threshold)
+        statuses = np.where(full_time, 0, np.where(part_time, 1, 2)).tolist()
+        confidences = np.where(
+            full_time, np.minimum(95, 70 + latest_months * 2), np.where(part_time, 85, 70)
+        ).tolist()
+        look_back_statuses = (FTEStatus.FULL_TIME, FTEStatus.PART_TIME, FTEStatus.VARIABLE_HOUR)
+        latest_avg = latest_avg.tolist()
+        latest_months = latest_months.tolist()
+        
+        hire_dates: Dict[Tuple[Any, date], bool] = {}
+        determinations: List[FTEDetermination] = []
+        for i, (employee, employee_as_of) in enumerate(zip(employees, as_of)):
+            employee_id = employee.get("employee_id", "unknown")
+            employment_type = (employee.get("employment_type") or "").lower()
+            key = (employee.get("hire_date"), employee_as_of)
+            if key not in hire_dates:
+                hire_dates[key] = self._is_new_hire(*key)
+            is_new_hire = hire_dates[key]
+            
+            if employment_type in ["full_time", "ft"]:
+                determinations.append(FTEDetermination(
+                    employee_id=employee_id,
+                    status=FTEStatus.FULL_TIME,
+                    average_monthly_hours=130,
+                    measurement_period_start="",
+                    measurement_period_end="",
+                    method="classification",
+                    confidence=95,
+                    reasoning="Classified as full-time by employer",
+                    is_new_hire=is_new_hire
+                ))
+                continue
+            
+            if employment_type in ["part_time", "pt"]:
+                determinations.append(FTEDetermination(
+                    employee_id=employee_id,
+                    status=FTEStatus.PART_TIME,
+                    average_monthly_hours=60,
+                    measurement_period_start="",
+                    measurement_period_end="",
+                    method="classification",
+                    confidence=90,
+                    reasoning="Classified as part-time by employer",
+                    is_new_hire=is_new_hire
+                ))
+                continue
+            
+            months = latest_months[i]
+            if months:
+                history = employee["hours_worked"]
+                avg_monthly = latest_avg[i]
+                determinations.append(FTEDetermination(
+                    employee_id=employee_id,
+                    status=look_back_statuses[statuses[i]],
+                    average_monthly_hours=round(avg_monthly, 1),
+                    measurement_period_start=history[len(history) - months].get("period", ""),
+                    measurement_period_end=history[-1].get("period", ""),
+                    method="look_back",
+                    confidence=confidences[i],
+                    reasoning=f"Based on {months}-month look-back average of {avg_monthly:.1f} hours/month",
+                    is_new_hire=is_new_hire
+                ))
+                continue
+            
+            # Undetermined if no data
+            determinations.append(FTEDetermination(
+                employee_id=employee_id,
+                status=FTEStatus.UNDETERMINED,
+                average_monthly_hours=0,
+                measurement_period_start="",
+                measurement_period_end="",
+                method="none",
+                confidence=0,
+                reasoning="Insufficient data to determine FTE status",
+                is_new_hire=is_new_hire
+            ))
+        
+        return determinations
+    
+    def _is_new_hire(self, hire_date: Optional[str], as_of: date) -> bool:
+        return self.periods.is_new_hire(hire_date, as_of)
+
+
+def _month_ordinal(key: Any) -> Optional[int]:
+    """year * 12 + month - 1 for a "YYYY-MM[-DD]" period or a (year, month) pair"""
+    try:
+        if isinstance(key, tuple):
+            year, month = int(key[0]), int(key[1])
+        else:
+            year, month = int(str(key)[:4]), int(str(key)[5:7])
+    except (TypeError, ValueError):
+        return None
+    return year * 12 + month - 1 if 1 <= month <= 12 else None
+
+
+def _month_text(ordinal: int) -> str:
+    return f"{ordinal // 12:04d}-{ordinal % 12 + 1:02d}" if ordinal >= 0 else ""
+
+
+def tax_year_end(tax_year: int) -> date:
+    """Date a tax year's determinations are made as of (its last day)"""
+    return date(tax_year, 12, 31)
+
+
+def _parse_iso_date(value: Optional[str]) -> Optional[date]:
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except ValueError:
+        return None
+
+
+def month_mask(months: Optional[List[int]]) -> int:
+    """Bitmask for a list of month numbers (1-12)"""
+    mask = 0
+    for month in months or []:
+        if 1 <= month <= 12:
+            mask |= 1 << (month - 1)
+    return mask
+
+
+class MonthlyCodeEngine:
+    """
+    Month-by-month Form 1095-C Line 14/15/16 determination.
+    
+    Employment span, waiting period, offer and enrollment are each reduced to
+    a 12-bit month mask per employee. The masks are combined with bitwise
+    operations across the whole population and the codes for every
+    employee-month are selected in one pass.
+    
+    Offer and enrollment months come from the employee record (offer_months /
+    enrolled_months, month numbers 1-12) when present, otherwise from the
+    batch coverage data; with neither, full-time months after the waiting
+    period are assumed to carry a qualifying offer.
+    """
+    
+    _LINE_14_CODES = np.array(["1H", "1A", "1E", "1F", "1J", "1K"], dtype=object)
+    _LINE_16_CODES = np.array([None, "2A", "2B", "2C", "2D", "2F", "2G", "2H"], dtype=object)
+    _MONTH_BITS = 1 << np.arange(12)
+    _MASK_BELOW = (1 << np.arange(13)) - 1  # _MASK_BELOW[k] has months 0..k-1 set
+    
+    def __init__(
+        self,
+        tax_year: int,
+        max_waiting_days: int = ACA_CONSTANTS["max_waiting_period_days"]
+    ):
+        self.tax_year = tax_year
+        self.max_waiting_days = max_waiting_days
+        self.rules = tax_rules.get(tax_year)
+        self._line_15_required = np.array([code in self.rules.line_15_required_codes for code in self._LINE_14_CODES])
+    
+    def determine(
+        self,
+        employees: List[Dict[str, Any]],
+        fte_determinations: List[FTEDetermination],
+        coverage_data: Optional[Dict[str, Any]] = None,
+        safe_harbor_codes: Optional[Sequence[Optional[str]]] = None,
+        full_time_months: Optional[Sequence[int]] = None
+    ) -> List[MonthlyCodes]:
+        """
+        Determine the monthly codes for every employee.
+        
+        Args:
+            employees: Normalized employee records
+            fte_determinations: FTE determination per employee, in the same order
+            coverage_data: Optional coverage/enrollment data for the batch
+            safe_harbor_codes: Line 16 affordability safe harbor code per
+                employee (2F/2G/2H, or None), reported for full-time months
+                with an offer that was not taken up
+            full_time_months: Month bitmask per employee of the months they
+                are full-time (e.g. from MeasurementPeriodEngine stability
+                periods); defaults to every employed month for employees
+                determined full-time
+        
+        Returns:
+            MonthlyCodes per employee, in input order
+        """
+        n = len(employees)
+        if not n:
+            return []
+        waiting_days = min(
+            (coverage_data or {}).get("waiting_period_days", self.max_waiting_days),
+            self.max_waiting_days
+        )
+        
+        # Employment span and eligibility month, as month indexes into the tax year
+        span_memo: Dict[Tuple[Any, Any], Tuple[int, int, int]] = {}
+        spans = []
+        for employee in employees:
+            key = (employee.get("hire_date"), employee.get("termination_date"))
+            if key not in span_memo:
+                span_memo[key] = self._span(key[0], key[1], waiting_days)
+            spans.append(span_memo[key])
+        first, last, eligible = np.array(spans, dtype=np.int64).T
+        
+        employed = self._range_mask(first, last)
+        waiting = employed & self._range_mask(first, eligible - 1)
+        if full_time_months is not None:
+            full_time = employed & np.asarray(full_time_months, dtype=np.int64)
+        else:
+            is_full_time = np.fromiter(
+                (fte.status == FTEStatus.FULL_TIME for fte in fte_determinations),
+                dtype=bool,
+                count=n
+            )
+            full_time = np.where(is_full_time, employed, 0)
+        
+        if coverage_data:
+            default_offer = employed & ~waiting if coverage_data.get("offer_made", False) else np.zeros(n, dtype=np.int64)
+        else:
+            default_offer = full_time & ~waiting  # Assumed qualifying offer
+        default_enrolled = default_offer if (coverage_data or {}).get("enrolled", False) else np.zeros(n, dtype=np.int64)
+        enrolled = self._explicit_mask(employees, "enrolled_months", default_enrolled) & employed
+        offered = (self._explicit_mask(employees, "offer_months", default_offer) & employed) | enrolled
+        
+        # Expand to employees x months
+        bits = self._MONTH_BITS
+        in_employment = (employed[:, None] & bits) != 0
+        in_waiting = (waiting[:, None] & bits) != 0
+        in_full_time = (full_time[:, None] & bits) != 0
+        in_offer = (offered[:, None] & bits) != 0
+        in_enrollment = (enrolled[:, None] & bits) != 0
+        
+        line_14 = np.select(
+            [~in_employment, ~in_offer, in_enrollment],
+            [0, 0, self._enrolled_code_index(coverage_data)],
+            default=2 if coverage_data else 1  # Offered but not enrolled / assumed offer
+        )
+        if safe_harbor_codes is not None:
+            code_index = {code: i for i, code in enumerate(self._LINE_16_CODES.tolist())}
+            safe_harbor = np.array([code_index[code] for code in safe_harbor_codes], dtype=np.int64)[:, None]
+        else:
+            safe_harbor = 0
+        line_16 = np.select(
+            [~in_employment, in_enrollment, in_waiting, ~in_full_time, in_offer],
+            [1, 3, 4, 2, safe_harbor],
+            default=0
+        )
+        
+        premium = (coverage_data or {}).get("employee_monthly_premium")
+        if premium is not None:
+            line_15 = np.where(
+                self._line_15_required[line_14], to_dollars(to_cents(premium)), None
+            ).tolist()
+        else:
+            line_15 = [[None] * 12 for _ in range(n)]
+        
+        line_14_codes = self._LINE_14_CODES[line_14].tolist()
+        line_16_codes = self._LINE_16_CODES[line_16].tolist()
+        masks = zip(
+            employed.tolist(), full_time.tolist(), waiting.tolist(),
+            offered.tolist(), enrolled.tolist()
+        )
+        return [
+            MonthlyCodes(
+                employee_id=employee.get("employee_id", employee.get("record_id", "unknown")),
+                employed_months=employed_mask,
+                full_time_months=full_time_mask,
+                waiting_months=waiting_mask,
+                offer_months=offer_mask,
+                enrolled_months=enrolled_mask,
+                line_14=line_14_codes[i],
+                line_15=line_15[i],
+                line_16=line_16_codes[i]
+            )
+            for i, (employee, (employed_mask, full_time_mask, waiting_mask, offer_mask, enrolled_mask))
+            in enumerate(zip(employees, masks))
+        ]
+    
+    def _span(
+        self,
+        hire_date: Optional[str],
+        termination_date: Optional[str],
+        waiting_days: int
+    ) -> Tuple[int, int, int]:
+        """First and last employed month and first eligible month (0 = January)"""
+        hire = self._parse_date(hire_date)
+        termination = self._parse_date(termination_date)
+        
+        first = min(max(self._month_index(hire), 0), 12) if hire else 0
+        last = min(max(self._month_index(termination), -1), 11) if termination else 11
+        if not hire:
+            return first, last, 0
+        
+        # Coverage is due from the first of the month after the waiting period,
+        # as with the limited non-assessment period for new hires
+        eligible_date = hire + timedelta(days=waiting_days)
+        eligible = self._month_index(eligible_date) + (eligible_date.day > 1)
+        return first, last, min(max(eligible, 0), 12)
+    
+    def _month_index(self, day: date) -> int:
+        return (day.year - self.tax_year) * 12 + day.month - 1
+    
+    def _parse_date(self, value: Optional[str]) -> Optional[date]:
+        if not value:
+            return None
+        try:
+            return datetime.strptime(value, "%Y-%m-%d").date()
+        except ValueError:
+            return None
+    
+    def _range_mask(self, first: np.ndarray, last: np.ndarray) -> np.ndarray:
+        """Mask of months first..last inclusive, empty where first > last"""
+        lo = np.clip(first, 0, 12)
+        hi = np.clip(last + 1, 0, 12)
+        return np.where(lo < hi, self._MASK_BELOW[hi] - self._MASK_BELOW[lo], 0)
+    
+    def _explicit_mask(
+        self,
+        employees: List[Dict[str, Any]],
+        key: str,
+        default: np.ndarray
+    ) -> np.ndarray:
+        """Per-employee month list where given, the batch default elsewhere"""
+        explicit = [employee.get(key) for employee in employees]
+        if all(months is None for months in explicit):
+            return default
+        return np.array([
+            month_mask(months) if months is not None else default_mask
+            for months, default_mask in zip(explicit, default.tolist())
+        ], dtype=np.int64)
+    
+    def _enrolled_code_index(self, coverage_data: Optional[Dict[str, Any]]) -> int:
+        """Line 14 code for enrolled months, by who the coverage reaches"""
+        covers_spouse = (coverage_data or {}).get("covers_spouse", False)
+        covers_dependents = (coverage_data or {}).get("covers_dependents", False)
+        if covers_spouse and covers_dependents:
+            return 4  # 1J
+        if covers_dependents:
+            return 2  # 1E
+        if covers_spouse:
+            return 5  # 1K
+        return 3  # 1F
+
+
+class SafeHarborOptimizer:
+    """
+    Evaluates the W-2, rate of pay and FPL affordability safe harbors side by side.
+    
+    Each safe harbor reduces to an annual wage basis per employee: W-2 wages,
+    hourly rate x 130 hours x 12, or the poverty line. Coverage is affordable
+    under a safe harbor when 12 x contribution <= threshold x basis, tested
+    for the whole population at once in integer cents and basis points. The
+    most favorable safe harbor is the one with the largest basis, so it
+    proves affordability whenever any of them can.
+    """
+    
+    def __init__(self, federal_poverty_line_cents: Optional[int] = None):
+        if federal_poverty_line_cents is None:
+            federal_poverty_line_cents = tax_rules.get(DEFAULT_TAX_YEAR).federal_poverty_line_cents
+        self.federal_poverty_line_cents = federal_poverty_line_cents
+    
+    def wage_bases(
+        self,
+        hourly_cents: np.ndarray,
+        annual_cents: np.ndarray,
+        federal_poverty_line_cents: Any = None
+    ) -> np.ndarray:
+        """
+        Annual wage basis per employee and safe harbor.
+        
+        Args:
+            hourly_cents: Hourly rate per employee (0 where unknown)
+            annual_cents: Annual W-2 wages per employee (0 where unknown)
+            federal_poverty_line_cents: Poverty line (scalar or per employee,
+                e.g. by tax year); defaults to the optimizer's
+        
+        Returns:
+            Employees x SAFE_HARBORS array, -1 where a safe harbor's wage is
+            unknown or not positive
+        """
+        hourly_cents = np.asarray(hourly_cents, dtype=np.int64)
+        annual_cents = np.asarray(annual_cents, dtype=np.int64)
+        bases = np.empty((len(hourly_cents), len(SAFE_HARBORS)), dtype=np.int64)
+        bases[:, _W2] = np.where(annual_cents > 0, annual_cents, -1)
+        bases[:, _RATE_OF_PAY] = np.where(hourly_cents > 0, hourly_cents * RATE_OF_PAY_MONTHLY_HOURS * 12, -1)
+        bases[:, _FPL] = (
+            self.federal_poverty_line_cents if federal_poverty_line_cents is None else federal_poverty_line_cents
+        )
+        return bases
+    
+    def affordable(self, bases: np.ndarray, contribution_cents: Any, threshold_bp: Any) -> np.ndarray:
+        """
+        Whether each safe harbor proves affordability.
+        
+        Args:
+            bases: Output of wage_bases
+            contribution_cents: Monthly employee contribution (scalar or per employee)
+            threshold_bp: Affordability threshold (scalar or per employee)
+        
+        Returns:
+            Employees x SAFE_HARBORS boolean array
+        """
+        contribution = np.asarray(contribution_cents, dtype=np.int64).reshape(-1, 1)
+        threshold = np.asarray(threshold_bp, dtype=np.int64).reshape(-1, 1)
+        return (bases >= 0) & (contribution * 12 * 10000 <= threshold * bases)
+    
+    def select(self, bases: np.ndarray) -> np.ndarray:
+        """Index into SAFE_HARBORS of the most favorable safe harbor per employee"""
+        return bases.argmax(axis=1)
+    
+    def summarize(self, affordabilities: List[AffordabilityCalculation]) -> SafeHarborSummary:
+        """
+        Safe harbor distribution over a population's affordability calculations.
+        
+        Args:
+            affordabilities: One calculation per full-time employee
+        
+        Returns:
+            SafeHarborSummary with one SafeHarborUsage per safe harbor
+        """
+        n = len(affordabilities)
+        contribution = _int_column((a.employee_contribution_cents for a in affordabilities), n)
+        threshold = _int_column((a.threshold_bp for a in affordabilities), n)
+        bases = self.wage_bases(
+            _int_column((a.hourly_rate_cents or 0 for a in affordabilities), n),
+            _int_column((a.household_income_cents or 0 for a in affordabilities), n)
+        )
+        # Each calculation keeps the poverty line it was tested against
+        bases[:, _FPL] = _int_column((a.federal_poverty_line_cents for a in affordabilities), n)
+        
+        affordable = self.affordable(bases, contribution, threshold)
+        selected = self.select(bases)
+        headroom = threshold * bases[np.arange(n), selected] // (12 * 10000) - contribution
+        sole = affordable & (affordable.sum(axis=1) == 1)[:, None]
+        
+        usage = []
+        for h, safe_harbor in enumerate(SAFE_HARBORS):
+            chosen = selected == h
+            count = int(chosen.sum())
+            usage.append(SafeHarborUsage(
+                safe_harbor=safe_harbor,
+                line_16_code=SAFE_HARBOR_LINE_16[safe_harbor],
+                eligible=int((bases[:, h] >= 0).sum()),
+                affordable=int(affordable[:, h].sum()),
+                only_affordable=int(sole[:, h].sum()),
+                selected=count,
+                average_contribution_cents=int(contribution[chosen].sum()) // count if count else 0,
+                average_headroom_cents=int(headroom[chosen].sum()) // count if count else 0
+            ))
+        return SafeHarborSummary(
+            total_employees=n,
+            affordable=int(affordable.any(axis=1).sum()),
+            usage=usage
+        )
 
 
 class ComplianceAgent:
@@ -174,38 +1401,462 @@ class ComplianceAgent:
     affordability, and penalty risk for each employee.
     """
     
-    def __init__(self, tax_year: int = 2026):
+    def __init__(
+        self,
+        tax_year: int = DEFAULT_TAX_YEAR,
+        fingerprint_store: Optional[AssessmentFingerprintStore] = None,
+        parallel_threshold: int = PARALLEL_ASSESSMENT_THRESHOLD,
+        shard_size: int = DEFAULT_ASSESSMENT_SHARD_SIZE
+    ):
+        """
+        Args:
+            tax_year: Tax year assessed (employees may override it with
+                their own tax_year field)
+            fingerprint_store: Store of previous assessments to reuse, if any
+            parallel_threshold: Batch size from which assess_compliance uses a
+                process pool (0 always assesses inline)
+            shard_size: Employees per process pool shard
+        """
         self.tax_year = tax_year
-        self.affordability_threshold = Decimal(str(ACA_CONSTANTS["affordability_threshold_2026"]))
+        self.fingerprint_store = fingerprint_store
+        self.parallel_threshold = parallel_threshold
+        self.shard_size = shard_size
+        self.rules = tax_rules.get(tax_year)
+        self.affordability_threshold = self.rules.affordability_threshold
+        self.affordability_threshold_bp = self.rules.affordability_threshold_bp
         self.fte_hours_threshold = ACA_CONSTANTS["fte_hours_threshold"]
+        self.measurement_engine = MeasurementPeriodEngine(fte_hours_threshold=self.fte_hours_threshold)
+        self.fte_engine = FTELookbackEngine(
+            fte_hours_threshold=self.fte_hours_threshold,
+            periods=self.measurement_engine
+        )
+        self.code_engine = MonthlyCodeEngine(tax_year)
+        self._code_engines = {tax_year: self.code_engine}
+        self.safe_harbor_optimizer = SafeHarborOptimizer(self.rules.federal_poverty_line_cents)
     
     async def assess_compliance(
         self,
         employees: List[Dict[str, Any]],
         client_id: str,
-        coverage_data: Optional[Dict[str, Any]] = None
+        coverage_data: Optional[Dict[str, Any]] = None,
+        max_workers: Optional[int] = None
     ) -> ComplianceResult:
         """
         Assess ACA compliance for a batch of employees.
         
+        With a fingerprint store, employees whose compliance inputs are
+        unchanged since their last assessment reuse it instead of being
+        reassessed. Batches of parallel_threshold employees or more are
+        assessed in shards on the shared worker pool, so the event loop keeps
+        serving other requests; the result is the same either way.
+        
         Args:
             employees: List of normalized employee records
             client_id: Client ID
             coverage_data: Optional coverage/enrollment data
-            
+            max_workers: Worker processes for large batches (defaults to the CPU count)
+        
         Returns:
             ComplianceResult with assessments for each employee
         """
         start_time = datetime.now()
-        assessments: List[ComplianceAssessment] = []
-        total_penalty = Decimal("0")
+        known = self._known_fingerprints(employees, client_id)
+        
+        if self.parallel_threshold and len(employees) >= self.parallel_threshold:
+            loop = asyncio.get_running_loop()
+            offsets = range(0, len(employees), self.shard_size)
+            pool = get_worker_pool(max_workers)
+            try:
+                shards = await asyncio.gather(*[
+                    loop.run_in_executor(
+                        pool,
+                        _assess_shard,
+                        self.tax_year,
+                        employees[offset:offset + self.shard_size],
+                        client_id,
+                        coverage_data,
+                        known[offset:offset + self.shard_size] if known is not None else None
+                    )
+                    for offset in offsets
+                ])
+            except BrokenProcessPool:
+                shutdown_worker_pool()  # A worker died; the next call starts a fresh pool
+                raise
+            fingerprints = [fp for shard_fps, _ in shards for fp in shard_fps] if known is not None else None
+            assessments = [assessment for _, shard in shards for assessment in shard]
+        else:
+            fingerprints, assessments = self._assess_rows(employees, client_id, coverage_data, known)
+        
+        return self._collect(employees, client_id, coverage_data, fingerprints, assessments, start_time)
+    
+    def fingerprints(
+        self,
+        employees: List[Dict[str, Any]],
+        coverage_data: Optional[Dict[str, Any]] = None
+    ) -> List[bytes]:
+        """
+        Fingerprint each employee's compliance inputs.
+        
+        Covers COMPLIANCE_INPUT_FIELDS and (as the hash key) the tax year, the
+        rule tables version, thresholds and batch coverage data. Determinations
+        are made as of the end of the tax year, so new-hire status follows
+        from the hire date and tax year already covered.
+        """
+        context = hashlib.blake2b(
+            json.dumps(
+                [self.tax_year, tax_rules.version, self.fte_hours_threshold, coverage_data],
+                sort_keys=True,
+                default=str
+            ).encode("utf-8"),
+            digest_size=32
+        ).digest()
+        
+        fingerprints = []
+        for employee in employees:
+            payload = pickle.dumps(
+                [employee.get(name) for name in COMPLIANCE_INPUT_FIELDS],
+                protocol=pickle.HIGHEST_PROTOCOL
+            )
+            fingerprints.append(hashlib.blake2b(payload, digest_size=16, key=context).digest())
+        return fingerprints
+    
+    async def assess_compliance_stream(
+        self,
+        employee_batches: AsyncIterator[List[Dict[str, Any]]],
+        client_id: str,
+        coverage_data: Optional[Dict[str, Any]] = None,
+        processes: int = 0
+    ) -> AsyncIterator[ComplianceResult]:
+        """
+        Assess ACA compliance for an async stream of employee batches.
+        
+        Each batch is assessed as soon as it arrives, so results are available
+        before the whole population has been normalized.
+        
+        Args:
+            employee_batches: Async iterator of normalized employee record lists
+            client_id: Client ID
+            coverage_data: Optional coverage/enrollment data
+            processes: Batches assessed ahead of the consumer on the shared
+                worker pool (0 assesses each batch with assess_compliance)
+        
+        Yields:
+            ComplianceResult per batch, in input order
+        """
+        if not processes:
+            async for employees in employee_batches:
+                yield await self.assess_compliance(employees, client_id, coverage_data)
+            return
+        
+        loop = asyncio.get_running_loop()
+        pending: deque = deque()
+        pool = get_worker_pool(processes)
+        try:
+            async for employees in employee_batches:
+                start_time = datetime.now()
+                known = self._known_fingerprints(employees, client_id)
+                pending.append((employees, start_time, loop.run_in_executor(
+                    pool, _assess_shard, self.tax_year, employees, client_id, coverage_data, known
+                )))
+                if len(pending) >= processes:
+                    employees, start_time, future = pending.popleft()
+                    fingerprints, assessments = await future
+                    yield self._collect(employees, client_id, coverage_data, fingerprints, assessments, start_time)
+            while pending:
+                employees, start_time, future = pending.popleft()
+                fingerprints, assessments = await future
+                yield self._collect(employees, client_id, coverage_data, fingerprints, assessments, start_time)
+        except BrokenProcessPool:
+            shutdown_worker_pool()  # A worker died; the next call starts a fresh pool
+            raise
+        finally:
+            # Batches still queued when the consumer stops are not assessed
+            for _, _, future in pending:
+                future.cancel()
+    
+    def simulate_scenarios(
+        self,
+        employees: List[Dict[str, Any]],
+        scenarios: List[PenaltyScenario],
+        coverage_data: Optional[Dict[str, Any]] = None,
+        fte_determinations: Optional[List[FTEDetermination]] = None
+    ) -> List[ScenarioExposure]:
+        """
+        Penalty exposure of a population under many coverage scenarios.
+        
+        Full-time status and safe harbor wage bases are derived once and
+        sorted, and since a contribution is affordable exactly when the basis
+        reaches 12 x contribution / threshold, the unaffordable count of every
+        scenario is one binary search. Without a forced safe harbor each
+        employee keeps the most favorable one; a forced W-2 or rate of pay
+        safe harbor applies where its wage is known. Employees are counted
+        under the rules of their own tax year (a scenario's threshold, when
+        set, applies to every year). Exposure matches assess_compliance run
+        with the scenario's coverage data.
+        
+        Args:
+            employees: List of normalized employee records
+            scenarios: Variants to evaluate
+            coverage_data: Coverage/enrollment data the scenarios start from
+            fte_determinations: FTE determinations already made for employees
+        
+        Returns:
+            ScenarioExposure per scenario, in order
+        """
+        if fte_determinations is None:
+            fte_determinations = self._determine_fte(employees)
+        full_time = [emp for emp, fte in zip(employees, fte_determinations) if fte.status == FTEStatus.FULL_TIME]
         
-        for emp in employees:
-            assessment = await self._assess_employee(emp, client_id, coverage_data)
-            assessments.append(assessment)
+        contribution = np.zeros(len(scenarios), dtype=np.int64)
+        threshold_override_bp = np.full(len(scenarios), -1, dtype=np.int64)  # -1 keeps each tax year's threshold
+        no_offer = np.zeros(len(scenarios), dtype=bool)
+        for s, scenario in enumerate(scenarios):
+            if scenario.safe_harbor is not None and scenario.safe_harbor not in SAFE_HARBORS:
+                raise ValueError(f"Unknown safe harbor for scenario {scenario.name!r}: {scenario.safe_harbor}")
+            coverage = dict(coverage_data or {})
+            if scenario.employee_monthly_premium is not None:
+                coverage["employee_monthly_premium"] = scenario.employee_monthly_premium
+            if scenario.offer_made is not None:
+                coverage["offer_made"] = scenario.offer_made
+            contribution[s] = max(
+                0, to_cents(coverage.get("employee_monthly_premium", 0) or 0) + to_cents(scenario.contribution_change or 0)
+            )
+            if scenario.affordability_threshold is not None:
+                threshold_override_bp[s] = to_basis_points(scenario.affordability_threshold)
+            # Same test as _determine_coverage_codes: any coverage data without an offer is code 1H
+            no_offer[s] = bool(coverage) and not coverage.get("offer_made", False)
+        harbors = np.array([scenario.safe_harbor or "" for scenario in scenarios], dtype=object)
+        
+        # Each tax year has its own threshold, poverty line and penalty amounts,
+        # as in assess_compliance, so employees are counted per year and summed
+        by_year: Dict[int, List[Dict[str, Any]]] = {}
+        for emp in full_time:
+            by_year.setdefault(self._tax_year(emp), []).append(emp)
+        
+        no_offer_counts = np.zeros(len(scenarios), dtype=np.int64)
+        unaffordable_counts = np.zeros(len(scenarios), dtype=np.int64)
+        a_cents = np.zeros(len(scenarios), dtype=np.int64)
+        b_cents = np.zeros(len(scenarios), dtype=np.int64)
+        for year, group in sorted(by_year.items()):
+            rules = tax_rules.get(year)
+            hourly, _ = self._cents_column(group, "hourly_rate")
+            annual, _ = self._cents_column(group, "annual_salary")
+            bases = self.safe_harbor_optimizer.wage_bases(hourly, annual, rules.federal_poverty_line_cents)
+            best = bases.max(axis=1)
+            sorted_bases = {
+                "": np.sort(best),
+                "W2": np.sort(np.where(bases[:, _W2] >= 0, bases[:, _W2], best)),
+                "rate_of_pay": np.sort(np.where(bases[:, _RATE_OF_PAY] >= 0, bases[:, _RATE_OF_PAY], best)),
+                "FPL": bases[:, _FPL],
+            }
             
-            if assessment.penalty_risk:
-                total_penalty += assessment.penalty_risk.potential_penalty_amount
+            # Smallest affordable annual wage basis per scenario
+            threshold_bp = np.where(threshold_override_bp >= 0, threshold_override_bp, rules.affordability_threshold_bp)
+            cutoff = np.where(
+                threshold_bp > 0,
+                -(-contribution * 12 * 10000 // np.maximum(threshold_bp, 1)),
+                np.iinfo(np.int64).max
+            )
+            cutoff[contribution == 0] = 0
+            
+            unaffordable = np.zeros(len(scenarios), dtype=np.int64)
+            for harbor, harbor_bases in sorted_bases.items():
+                chosen = harbors == harbor
+                unaffordable[chosen] = np.searchsorted(harbor_bases, cutoff[chosen])
+            
+            year_no_offer = np.where(no_offer, len(group), 0)
+            year_unaffordable = np.where(no_offer, 0, unaffordable)
+            no_offer_counts += year_no_offer
+            unaffordable_counts += year_unaffordable
+            a_cents += year_no_offer * rules.penalty_cents[PenaltyType.SECTION_4980H_A.value]
+            b_cents += year_unaffordable * rules.penalty_cents[PenaltyType.SECTION_4980H_B.value]
+        
+        return [
+            ScenarioExposure(
+                name=scenario.name,
+                full_time_employees=len(full_time),
+                no_offer_count=a_count,
+                unaffordable_count=b_count,
+                section_4980h_a_cents=a_penalty,
+                section_4980h_b_cents=b_penalty
+            )
+            for scenario, a_count, b_count, a_penalty, b_penalty in zip(
+                scenarios, no_offer_counts.tolist(), unaffordable_counts.tolist(), a_cents.tolist(), b_cents.tolist()
+            )
+        ]
+    
+    def _known_fingerprints(
+        self,
+        employees: List[Dict[str, Any]],
+        client_id: str
+    ) -> Optional[List[Optional[bytes]]]:
+        """Stored fingerprint per employee (None if never assessed), or None without a store"""
+        if self.fingerprint_store is None:
+            return None
+        return [self.fingerprint_store.fingerprint(client_id, self._assessment_key(emp)) for emp in employees]
+    
+    def _assess_rows(
+        self,
+        employees: List[Dict[str, Any]],
+        client_id: str,
+        coverage_data: Optional[Dict[str, Any]],
+        known: Optional[List[Optional[bytes]]] = None
+    ) -> Tuple[Optional[List[bytes]], List[Optional[ComplianceAssessment]]]:
+        """
+        Fingerprint and assess a batch synchronously (also run in pool workers).
+        
+        With known fingerprints, employees whose fingerprint is unchanged are
+        not assessed and their entry is None.
+        
+        Returns:
+            (fingerprints, or None without known fingerprints; assessments)
+        """
+        fingerprints = None
+        changed = list(range(len(employees)))
+        if known is not None:
+            fingerprints = self.fingerprints(employees, coverage_data)
+            changed = [i for i in changed if fingerprints[i] != known[i]]
+        assessments: List[Optional[ComplianceAssessment]] = [None] * len(employees)
+        changed_employees = [employees[i] for i in changed]
+        
+        # FTE status, affordability and monthly codes for the changed employees in vectorized passes
+        fte_determinations = self._determine_fte(changed_employees)
+        full_time = [j for j, fte in enumerate(fte_determinations) if fte.status == FTEStatus.FULL_TIME]
+        affordabilities: List[Optional[AffordabilityCalculation]] = [None] * len(changed_employees)
+        for j, affordability in zip(full_time, self._calculate_affordability_batch(
+            [changed_employees[j] for j in full_time], coverage_data
+        )):
+            affordabilities[j] = affordability
+        monthly_codes = self._monthly_codes(changed_employees, fte_determinations, coverage_data, affordabilities)
+        
+        for i, emp, fte, monthly, affordability in zip(
+            changed, changed_employees, fte_determinations, monthly_codes, affordabilities
+        ):
+            assessments[i] = self._assess_employee(emp, client_id, coverage_data, fte, monthly, affordability)
+        return fingerprints, assessments
+    
+    def _tax_year(self, employee: Dict[str, Any]) -> int:
+        """The employee's own tax_year, or the agent's"""
+        return int(employee.get("tax_year") or self.tax_year)
+    
+    def _assessment_key(self, employee: Dict[str, Any]) -> AssessmentKey:
+        """Fingerprint store key: one entry per employee and tax year"""
+        return _employee_id(employee), self._tax_year(employee)
+    
+    def _determine_fte(self, employees: List[Dict[str, Any]]) -> List[FTEDetermination]:
+        """FTE determinations as of the end of each employee's tax year"""
+        as_of: Dict[int, date] = {}
+        for year in map(self._tax_year, employees):
+            if year not in as_of:
+                as_of[year] = tax_year_end(year)
+        return self.fte_engine.determine(employees, [as_of[self._tax_year(emp)] for emp in employees])
+    
+    def _full_time_months(
+        self,
+        employees: List[Dict[str, Any]],
+        fte_determinations: List[FTEDetermination],
+        tax_year: int
+    ) -> np.ndarray:
+        """
+        Months of the tax year each employee is full-time.
+        
+        Look-back determinations follow the measurement engine's standard and
+        initial stability periods month by month. Employer classifications,
+        and employees without hours dated inside the measurement window, keep
+        their whole-year status.
+        """
+        engine = self.measurement_engine
+        first_month = tax_year * 12
+        calendar = engine.hours_calendar(employees, engine.measurement_window(first_month, first_month + 11))
+        measured = engine.full_time_months(employees, tax_year, calendar)
+        whole_year = np.fromiter(
+            (ALL_MONTHS if fte.status == FTEStatus.FULL_TIME else 0 for fte in fte_determinations),
+            dtype=np.int64,
+            count=len(employees)
+        )
+        by_month = np.fromiter(
+            (fte.method == "look_back" for fte in fte_determinations),
+            dtype=bool,
+            count=len(employees)
+        ) & (calendar.months[:, -1] > 0)
+        return np.where(by_month, measured, whole_year)
+    
+    def _code_engine(self, tax_year: int) -> MonthlyCodeEngine:
+        engine = self._code_engines.get(tax_year)
+        if engine is None:
+            engine = self._code_engines[tax_year] = MonthlyCodeEngine(tax_year)
+        return engine
+    
+    def _monthly_codes(
+        self,
+        employees: List[Dict[str, Any]],
+        fte_determinations: List[FTEDetermination],
+        coverage_data: Optional[Dict[str, Any]],
+        affordabilities: List[Optional[AffordabilityCalculation]]
+    ) -> List[MonthlyCodes]:
+        """Monthly codes per employee, one vectorized pass per tax year in the batch"""
+        years = [self._tax_year(employee) for employee in employees]
+        distinct = set(years)
+        if len(distinct) <= 1:
+            year = distinct.pop() if distinct else self.tax_year
+            return self._code_engine(year).determine(
+                employees,
+                fte_determinations,
+                coverage_data,
+                _safe_harbor_codes(affordabilities),
+                self._full_time_months(employees, fte_determinations, year)
+            )
+        
+        monthly_codes: List[Optional[MonthlyCodes]] = [None] * len(employees)
+        for year in sorted(distinct):
+            rows = [j for j, y in enumerate(years) if y == year]
+            year_employees = [employees[j] for j in rows]
+            year_determinations = [fte_determinations[j] for j in rows]
+            codes = self._code_engine(year).determine(
+                year_employees,
+                year_determinations,
+                coverage_data,
+                _safe_harbor_codes([affordabilities[j] for j in rows]),
+                self._full_time_months(year_employees, year_determinations, year)
+            )
+            for j, monthly in zip(rows, codes):
+                monthly_codes[j] = monthly
+        return monthly_codes
+    
+    def _collect(
+        self,
+        employees: List[Dict[str, Any]],
+        client_id: str,
+        coverage_data: Optional[Dict[str, Any]],
+        fingerprints: Optional[List[bytes]],
+        assessments: List[Optional[ComplianceAssessment]],
+        start_time: datetime
+    ) -> ComplianceResult:
+        """Fill in reused assessments, update the fingerprint store and total the batch"""
+        store = self.fingerprint_store
+        reused = 0
+        if store is not None and fingerprints is not None:
+            stale = []
+            for i, (employee, fingerprint, assessment) in enumerate(zip(employees, fingerprints, assessments)):
+                key = self._assessment_key(employee)
+                if assessment is not None:
+                    store.put(client_id, key, fingerprint, assessment)
+                    continue
+                assessments[i] = store.get(client_id, key, fingerprint)
+                if assessments[i] is None:
+                    stale.append(i)  # Replaced or evicted since the lookup
+                else:
+                    reused += 1
+            if stale:
+                _, fresh = self._assess_rows([employees[i] for i in stale], client_id, coverage_data)
+                for i, assessment in zip(stale, fresh):
+                    assessments[i] = assessment
+                    store.put(client_id, self._assessment_key(employees[i]), fingerprints[i], assessment)
+        
+        total_penalty_cents = sum(
+            assessment.penalty_risk.potential_penalty_cents
+            for assessment in assessments if assessment.penalty_risk
+        )
         
         # Count by status
         compliant = sum(1 for a in assessments if a.status == ComplianceStatus.COMPLIANT)
@@ -221,28 +1872,34 @@ class ComplianceAgent:
             at_risk=at_risk,
             non_compliant=non_compliant,
             assessments=assessments,
-            aggregate_penalty_exposure=total_penalty,
-            duration_ms=int(duration)
+            aggregate_penalty_cents=total_penalty_cents,
+            duration_ms=int(duration),
+            reused=reused
         )
     
-    async def _assess_employee(
+    def _assess_employee(
         self,
         employee: Dict[str, Any],
         client_id: str,
-        coverage_data: Optional[Dict[str, Any]]
+        coverage_data: Optional[Dict[str, Any]],
+        fte: Optional[FTEDetermination] = None,
+        monthly: Optional[MonthlyCodes] = None,
+        affordability: Optional[AffordabilityCalculation] = None
     ) -> ComplianceAssessment:
         """Assess a single employee's compliance status"""
         employee_id = employee.get("employee_id", employee.get("record_id", "unknown"))
         
-        # Step 1: Determine FTE status
-        fte = self._determine_fte_status(employee)
+        # Step 1: Determine FTE status (unless determined for the whole batch)
+        if fte is None:
+            fte = self._determine_fte_status(employee)
         
         # Step 2: Determine coverage offer code
         line_14, line_15 = self._determine_coverage_codes(employee, fte, coverage_data)
         
-        # Step 3: Calculate affordability (if applicable)
-        affordability = None
-        if fte.status == FTEStatus.FULL_TIME:
+        # Step 3: Calculate affordability (if applicable, unless calculated for the whole batch)
+        if fte.status != FTEStatus.FULL_TIME:
+            affordability = None
+        elif affordability is None:
             affordability = self._calculate_affordability(employee, coverage_data)
         
         # Step 4: Assess penalty risk
@@ -251,8 +1908,12 @@ class ComplianceAgent:
         # Step 5: Determine overall status
         status = self._determine_overall_status(fte, affordability, penalty_risk)
         
-        # Step 6: Generate recommendations
-        issues, recommendations = self._generate_recommendations(fte, affordability, penalty_risk)
+        # Step 6: Reason codes (issue and recommendation text is rendered on access)
+        reason_codes = self._reason_codes(fte, affordability)
+        
+        # Step 7: Month-by-month form codes
+        if monthly is None:
+            monthly = self._monthly_codes([employee], [fte], coverage_data, [affordability])[0]
         
         return ComplianceAssessment(
             employee_id=employee_id,
@@ -265,94 +1926,14 @@ class ComplianceAgent:
             line_15_code=line_15,
             line_16_code=None,
             penalty_risk=penalty_risk,
-            issues=issues,
-            recommendations=recommendations
+            reason_codes=reason_codes,
+            monthly_codes=monthly,
+            tax_year=self._tax_year(employee)
         )
     
     def _determine_fte_status(self, employee: Dict[str, Any]) -> FTEDetermination:
         """Determine if employee is full-time under ACA"""
-        employee_id = employee.get("employee_id", "unknown")
-        hours_data = employee.get("hours_worked", [])
-        employment_type = employee.get("employment_type", "").lower()
-        hire_date = employee.get("hire_date")
-        
-        # Check if new hire
-        is_new_hire = False
-        if hire_date:
-            try:
-                hire = datetime.strptime(hire_date, "%Y-%m-%d").date()
-                days_employed = (date.today() - hire).days
-                is_new_hire = days_employed < 365
-            except ValueError:
-                pass
-        
-        # If explicit employment type mapping exists
-        if employment_type in ["full_time", "ft"]:
-            return FTEDetermination(
-                employee_id=employee_id,
-                status=FTEStatus.FULL_TIME,
-                average_monthly_hours=130,
-                measurement_period_start="",
-                measurement_period_end="",
-                method="classification",
-                confidence=95,
-                reasoning="Classified as full-time by employer",
-                is_new_hire=is_new_hire
-            )
-        
-        if employment_type in ["part_time", "pt"]:
-            return FTEDetermination(
-                employee_id=employee_id,
-                status=FTEStatus.PART_TIME,
-                average_monthly_hours=60,
-                measurement_period_start="",
-                measurement_period_end="",
-                method="classification",
-                confidence=90,
-                reasoning="Classified as part-time by employer",
-                is_new_hire=is_new_hire
-            )
-        
-        # Use look-back measurement if hours data available
-        if hours_data:
-            total_hours = sum(h.get("hours", 0) for h in hours_data)
-            months = len(hours_data)
-            avg_monthly = total_hours / months if months > 0 else 0
-            
-            if avg_monthly >= self.fte_hours_threshold:
-                status = FTEStatus.FULL_TIME
-                confidence = min(95, 70 + (months * 2))
-            elif avg_monthly < 60:
-                status = FTEStatus.PART_TIME
-                confidence = 85
-            else:
-                status = FTEStatus.VARIABLE_HOUR
-                confidence = 70
-            
-            return FTEDetermination(
-                employee_id=employee_id,
-                status=status,
-                average_monthly_hours=round(avg_monthly, 1),
-                measurement_period_start=hours_data[0].get("period", ""),
-                measurement_period_end=hours_data[-1].get("period", "") if hours_data else "",
-                method="look_back",
-                confidence=confidence,
-                reasoning=f"Based on {months}-month look-back average of {avg_monthly:.1f} hours/month",
-                is_new_hire=is_new_hire
-            )
-        
-        # Undetermined if no data
-        return FTEDetermination(
-            employee_id=employee_id,
-            status=FTEStatus.UNDETERMINED,
-            average_monthly_hours=0,
-            measurement_period_start="",
-            measurement_period_end="",
-            method="none",
-            confidence=0,
-            reasoning="Insufficient data to determine FTE status",
-            is_new_hire=is_new_hire
-        )
+        return self._determine_fte([employee])[0]
     
     def _determine_coverage_codes(
         self,
@@ -401,62 +1982,70 @@ class ComplianceAgent:
         coverage_data: Optional[Dict[str, Any]]
     ) -> AffordabilityCalculation:
         """Calculate if coverage is affordable under ACA safe harbors"""
-        employee_id = employee.get("employee_id", "unknown")
+        return self._calculate_affordability_batch([employee], coverage_data)[0]
+    
+    def _calculate_affordability_batch(
+        self,
+        employees: List[Dict[str, Any]],
+        coverage_data: Optional[Dict[str, Any]]
+    ) -> List[AffordabilityCalculation]:
+        """
+        Affordability for many employees at once, in integer cents.
         
-        # Get employee cost
-        employee_contribution = Decimal("0")
+        Each employee gets the most favorable of the W-2, rate of pay and FPL
+        safe harbors; contribution / wage <= threshold is tested by
+        cross-multiplying integers, so no division or rounding is involved.
+        Threshold and poverty line come from each employee's tax year.
+        """
+        contribution = 0
         if coverage_data:
-            monthly_premium = coverage_data.get("employee_monthly_premium", 0)
-            employee_contribution = Decimal(str(monthly_premium))
-        
-        # Get compensation data
-        annual_salary = employee.get("annual_salary")
-        hourly_rate = employee.get("hourly_rate")
-        
-        # Use rate of pay safe harbor as default
-        if hourly_rate:
-            hourly = Decimal(str(hourly_rate))
-            assumed_monthly_wage = hourly * 130  # FTE hours
-            affordability_pct = (employee_contribution / assumed_monthly_wage) if assumed_monthly_wage > 0 else Decimal("0")
-            
-            return AffordabilityCalculation(
-                employee_id=employee_id,
-                is_affordable=affordability_pct <= self.affordability_threshold,
-                employee_contribution=employee_contribution,
-                household_income=None,
-                safe_harbor_used="rate_of_pay",
-                affordability_percentage=affordability_pct,
-                threshold=self.affordability_threshold,
-                hourly_rate=hourly,
-                monthly_hours_assumed=130
-            )
+            contribution = to_cents(coverage_data.get("employee_monthly_premium", 0) or 0)
         
-        # W-2 safe harbor
-        if annual_salary:
-            annual = Decimal(str(annual_salary))
-            monthly_wage = annual / 12
-            affordability_pct = (employee_contribution / monthly_wage) if monthly_wage > 0 else Decimal("0")
-            
-            return AffordabilityCalculation(
-                employee_id=employee_id,
-                is_affordable=affordability_pct <= self.affordability_threshold,
-                employee_contribution=employee_contribution,
-                household_income=annual,
-                safe_harbor_used="W2",
-                affordability_percentage=affordability_pct,
-                threshold=self.affordability_threshold
+        rules = [tax_rules.get(self._tax_year(employee)) for employee in employees]
+        threshold_bp = np.array([r.affordability_threshold_bp for r in rules], dtype=np.int64)
+        poverty_line = np.array([r.federal_poverty_line_cents for r in rules], dtype=np.int64)
+        hourly, _ = self._cents_column(employees, "hourly_rate")
+        annual, _ = self._cents_column(employees, "annual_salary")
+        optimizer = self.safe_harbor_optimizer
+        bases = optimizer.wage_bases(hourly, annual, poverty_line)
+        best = optimizer.select(bases)
+        is_affordable = optimizer.affordable(bases, contribution, threshold_bp)[np.arange(len(employees)), best]
+        
+        return [
+            AffordabilityCalculation(
+                employee_id=employee.get("employee_id", "unknown"),
+                is_affordable=affordable,
+                employee_contribution_cents=contribution,
+                household_income_cents=annual_cents if annual_cents > 0 else None,
+                safe_harbor_used=SAFE_HARBORS[safe_harbor],
+                threshold_bp=employee_rules.affordability_threshold_bp,
+                hourly_rate_cents=hourly_cents if hourly_cents > 0 else None,
+                monthly_hours_assumed=RATE_OF_PAY_MONTHLY_HOURS,
+                federal_poverty_line_cents=employee_rules.federal_poverty_line_cents
             )
+            for employee, employee_rules, affordable, safe_harbor, hourly_cents, annual_cents in zip(
+                employees, rules, is_affordable.tolist(), best.tolist(), hourly.tolist(), annual.tolist()
+            )
+        ]
+    
+    def _cents_column(self, employees: List[Dict[str, Any]], name: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Integer cents per employee for a dollar field, and where it is set (non-zero).
         
-        # Cannot determine
-        return AffordabilityCalculation(
-            employee_id=employee_id,
-            is_affordable=True,  # Assume affordable if no data
-            employee_contribution=employee_contribution,
-            household_income=None,
-            safe_harbor_used="unknown",
-            affordability_percentage=Decimal("0"),
-            threshold=self.affordability_threshold
-        )
+        Rounds from the decimal text exactly like to_cents (half up); wages and
+        rates repeat across a batch, so each distinct value is converted once.
+        """
+        memo: Dict[Any, Optional[int]] = {}
+        amounts = []
+        for employee in employees:
+            value = employee.get(name)
+            amount = memo.get(value, memo)
+            if amount is memo:
+                amount = memo[value] = _cents_or_none(value)
+            amounts.append(amount)
+        present = np.fromiter((amount is not None for amount in amounts), dtype=bool, count=len(amounts))
+        cents = np.fromiter((amount or 0 for amount in amounts), dtype=np.int64, count=len(amounts))
+        return cents, present
     
     def _assess_penalty_risk(
         self,
@@ -472,18 +2061,16 @@ class ComplianceAgent:
         if fte.status != FTEStatus.FULL_TIME:
             return None
         
+        rules = tax_rules.get(self._tax_year(employee))
+        
         # Check for 4980H(a) - no offer penalty
         if line_14_code == "1H":
             return PenaltyRisk(
                 employee_id=employee_id,
                 penalty_type=PenaltyType.SECTION_4980H_A,
-                potential_penalty_amount=Decimal("2880"),  # 2026 penalty per FTE
+                potential_penalty_cents=rules.penalty_cents[PenaltyType.SECTION_4980H_A.value],
                 months_at_risk=list(range(1, 13)),
-                reason="No coverage offered to full-time employee",
-                mitigation_options=[
-                    "Extend coverage offer immediately",
-                    "Review classification - may be part-time"
-                ]
+                reason_code=ReasonCode.NO_OFFER
             )
         
         # Check for 4980H(b) - affordability penalty
@@ -491,13 +2078,10 @@ class ComplianceAgent:
             return PenaltyRisk(
                 employee_id=employee_id,
                 penalty_type=PenaltyType.SECTION_4980H_B,
-                potential_penalty_amount=Decimal("4320"),  # 2026 penalty per employee
+                potential_penalty_cents=rules.penalty_cents[PenaltyType.SECTION_4980H_B.value],
                 months_at_risk=list(range(1, 13)),
-                reason=f"Coverage exceeds {self.affordability_threshold * 100:.2f}% affordability threshold",
-                mitigation_options=[
-                    "Reduce employee premium contribution",
-                    "Offer lower-cost plan option"
-                ]
+                reason_code=ReasonCode.OVER_THRESHOLD,
+                threshold_bp=rules.affordability_threshold_bp
             )
         
         return None
@@ -526,33 +2110,56 @@ class ComplianceAgent:
         
         return ComplianceStatus.COMPLIANT
     
-    def _generate_recommendations(
+    def _reason_codes(
         self,
         fte: FTEDetermination,
-        affordability: Optional[AffordabilityCalculation],
-        penalty_risk: Optional[PenaltyRisk]
-    ) -> Tuple[List[str], List[str]]:
-        """Generate issues and recommendations"""
-        issues = []
-        recommendations = []
-        
+        affordability: Optional[AffordabilityCalculation]
+    ) -> Tuple[ReasonCode, ...]:
+        """Reason codes for an assessment (penalty reasons live on its PenaltyRisk)"""
+        codes = ()
         if fte.status == FTEStatus.UNDETERMINED:
-            issues.append("FTE status cannot be determined - insufficient hours data")
-            recommendations.append("Collect 3-12 months of hours data for look-back measurement")
-        
+            codes += (ReasonCode.FTE_UNDETERMINED,)
         if fte.confidence < 80:
-            issues.append(f"Low confidence ({fte.confidence}%) in FTE determination")
-            recommendations.append("Review hours tracking process for accuracy")
-        
+            codes += (ReasonCode.LOW_FTE_CONFIDENCE,)
         if affordability and not affordability.is_affordable:
-            issues.append("Coverage fails affordability test")
-            recommendations.append("Consider offering lower-cost plan tier")
-        
-        if penalty_risk:
-            issues.extend(penalty_risk.mitigation_options)
-        
-        return issues, recommendations
+            codes += (ReasonCode.UNAFFORDABLE,)
+        return codes
+
+
+def _employee_id(employee: Dict[str, Any]) -> str:
+    return employee.get("employee_id", employee.get("record_id", "unknown"))
+
+
+def _safe_harbor_codes(affordabilities: List[Optional[AffordabilityCalculation]]) -> List[Optional[str]]:
+    """Line 16 code of the safe harbor proving affordability, per employee"""
+    return [
+        affordability.line_16_code if affordability is not None and affordability.is_affordable else None
+        for affordability in affordabilities
+    ]
+
+
+def _int_column(values: Iterable[int], count: int) -> np.ndarray:
+    return np.fromiter(values, dtype=np.int64, count=count)
+
+
+# Per-process agents used by process pool workers, by tax year
+_shard_agents: Dict[int, ComplianceAgent] = {}
+
+
+def _assess_shard(
+    tax_year: int,
+    employees: List[Dict[str, Any]],
+    client_id: str,
+    coverage_data: Optional[Dict[str, Any]],
+    known: Optional[List[Optional[bytes]]]
+) -> Tuple[Optional[List[bytes]], List[Optional[ComplianceAssessment]]]:
+    """Assess one shard of a batch (process pool worker)"""
+    agent = _shard_agents.get(tax_year)
+    if agent is None:
+        # Workers never hold a fingerprint store; the parent owns reuse
+        agent = _shard_agents[tax_year] = ComplianceAgent(tax_year)
+    return agent._assess_rows(employees, client_id, coverage_data, known)
 
 
 # Singleton instance
-compliance_agent = ComplianceAgent()
+compliance_agent = ComplianceAgent(fingerprint_store=AssessmentFingerprintStore())
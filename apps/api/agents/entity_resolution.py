@@ -0,0 +1,267 @@
+"""
+Entity Resolution
+Detects the same person appearing more than once in a census file (rehires,
+SSN typos, the same employee under two payroll entities).
+
+Records are grouped into blocks by SSN, last name + date of birth, and email,
+and pairs are only scored within a block, so the work grows with the number
+of records rather than the number of pairs.
+"""
+
+from typing import List, Dict, Any, Optional, Sequence, Tuple
+from dataclasses import dataclass
+from array import array
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Canonical fields compared between candidate duplicates, with their weights
+DUPLICATE_FIELD_WEIGHTS = {
+    "ssn": 35,
+    "date_of_birth": 20,
+    "email": 20,
+    "last_name": 15,
+    "first_name": 10,
+}
+DUPLICATE_FIELDS = tuple(DUPLICATE_FIELD_WEIGHTS)
+
+DUPLICATE_THRESHOLD = 80  # Minimum match score (0-100) to flag a pair
+MIN_COMPARED_WEIGHT = 35  # Pairs sharing less evidence than this are not scored
+MAX_BLOCK_CANDIDATES = 25  # Most recent block members compared against each record
+SSN_TYPO_CREDIT = 0.6  # Share of the SSN weight earned by a one-digit typo or transposition
+PAIR_CHUNK_SIZE = 1 << 18  # Candidate pairs scored together as one array operation
+
+_SSN, _DOB, _EMAIL, _LAST, _FIRST = range(len(DUPLICATE_FIELDS))
+_WEIGHTS = np.array([DUPLICATE_FIELD_WEIGHTS[name] for name in DUPLICATE_FIELDS], dtype=np.int64)
+
+
+@dataclass
+class DuplicateMatch:
+    """A record suspected to duplicate one seen earlier"""
+    index: int  # Position of the record within the batch passed to add()
+    record_id: str
+    duplicate_of: str  # record_id of the earlier record
+    score: int  # 0-100
+    matched_fields: List[str]
+    
+    @property
+    def review_reason(self) -> str:
+        return (
+            f"Possible duplicate of record {self.duplicate_of} "
+            f"({self.score}% match on {', '.join(self.matched_fields)})"
+        )
+
+
+def _clean(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    text = str(value).strip().lower()
+    return text or None
+
+
+def _ssn_typo(a: str, b: str) -> bool:
+    """True if two SSNs differ by one digit or one adjacent transposition"""
+    if len(a) != len(b):
+        return False
+    diffs = [i for i in range(len(a)) if a[i] != b[i]]
+    if len(diffs) == 1:
+        return True
+    return (
+        len(diffs) == 2
+        and diffs[1] == diffs[0] + 1
+        and a[diffs[0]] == b[diffs[1]]
+        and a[diffs[1]] == b[diffs[0]]
+    )
+
+
+class DuplicateDetector:
+    """
+    Incremental blocking index over the records of one client upload.
+    
+    Batches are added in order and each record is compared with earlier
+    records sharing one of its blocking keys, so a detector can span the
+    batches of a stream. Only the later record of a pair is reported.
+    
+    Candidate pairs are collected as records are indexed and scored in
+    chunks as array operations over integer codes of the field values; only
+    the best match of each flagged record is rescored field by field to name
+    the matched fields.
+    """
+    
+    def __init__(
+        self,
+        threshold: int = DUPLICATE_THRESHOLD,
+        max_block_candidates: int = MAX_BLOCK_CANDIDATES
+    ):
+        self.threshold = threshold
+        self.max_block_candidates = max_block_candidates
+        self._record_ids: List[str] = []
+        self._profiles: List[Tuple[Optional[str], ...]] = []
+        self._blocks: Dict[Tuple[str, ...], List[int]] = {}
+        # Field values as integer codes (0 = missing), len(DUPLICATE_FIELDS) per record
+        self._codes = array("q")
+        self._code_of: List[Dict[str, int]] = [{} for _ in DUPLICATE_FIELDS]
+        self._ssns: List[Optional[str]] = [None]  # SSN by code
+        self._ssn_typos: Dict[Tuple[int, int], bool] = {}
+    
+    def add(
+        self,
+        record_ids: Sequence[str],
+        columns: Dict[str, Sequence[Any]]
+    ) -> List[DuplicateMatch]:
+        """
+        Index a batch of records and report those duplicating an earlier one.
+        
+        Args:
+            record_ids: Record id per row
+            columns: Values per row for the fields in DUPLICATE_FIELDS
+                (missing fields are treated as empty)
+        
+        Returns:
+            DuplicateMatch for each row whose best earlier match reaches the threshold
+        """
+        n = len(record_ids)
+        values = [
+            columns[name] if columns.get(name) is not None else [None] * n
+            for name in DUPLICATE_FIELDS
+        ]
+        matches: List[DuplicateMatch] = []
+        base = len(self._profiles)
+        pair_records = array("q")
+        pair_candidates = array("q")
+        
+        for i, profile in enumerate(zip(*values)):
+            profile = tuple(_clean(v) for v in profile)
+            keys = self._blocking_keys(profile)
+            
+            candidates = set()
+            for key in keys:
+                block = self._blocks.get(key)
+                if block:
+                    candidates.update(block[-self.max_block_candidates:])
+            
+            position = base + i
+            if candidates:
+                pair_records.extend([position] * len(candidates))
+                pair_candidates.extend(candidates)
+            
+            self._record_ids.append(record_ids[i])
+            self._profiles.append(profile)
+            self._codes.extend(self._encode(profile))
+            for key in keys:
+                self._blocks.setdefault(key, []).append(position)
+            
+            if len(pair_records) >= PAIR_CHUNK_SIZE:
+                matches.extend(self._best_matches(pair_records, pair_candidates, base))
+                pair_records, pair_candidates = array("q"), array("q")
+        
+        if pair_records:
+            matches.extend(self._best_matches(pair_records, pair_candidates, base))
+        return matches
+    
+    def _encode(self, profile: Tuple[Optional[str], ...]) -> List[int]:
+        """Integer code of each field value, numbered per field in order of first sight"""
+        codes = []
+        for pos, value in enumerate(profile):
+            if not value:
+                codes.append(0)
+                continue
+            code_of = self._code_of[pos]
+            code = code_of.get(value)
+            if code is None:
+                code = code_of[value] = len(code_of) + 1
+                if pos == _SSN:
+                    self._ssns.append(value)
+            codes.append(code)
+        return codes
+    
+    def _best_matches(self, pair_records: array, pair_candidates: array, base: int) -> List[DuplicateMatch]:
+        """Score candidate pairs and report each record's best match over the threshold"""
+        records = np.frombuffer(pair_records, dtype=np.int64)
+        candidates = np.frombuffer(pair_candidates, dtype=np.int64)
+        codes = np.frombuffer(self._codes, dtype=np.int64).reshape(-1, len(DUPLICATE_FIELDS))
+        a, b = codes[records], codes[candidates]
+        
+        present = (a != 0) & (b != 0)
+        equal = present & (a == b)
+        compared = present.astype(np.int64) @ _WEIGHTS
+        
+        # Summed field by field in _score's order, so scores match it exactly
+        agree = np.zeros(len(records))
+        for pos in range(len(DUPLICATE_FIELDS)):
+            contribution = np.where(equal[:, pos], float(_WEIGHTS[pos]), 0.0)
+            if pos == _SSN:
+                typo = present[:, pos] & ~equal[:, pos]
+                typo[typo] = self._ssn_typo_codes(a[typo, pos], b[typo, pos])
+                contribution[typo] = _WEIGHTS[pos] * SSN_TYPO_CREDIT
+            agree = agree + contribution
+        
+        scores = np.zeros(len(records), dtype=np.int64)
+        scored = compared >= MIN_COMPARED_WEIGHT
+        scores[scored] = (agree[scored] * 100 / compared[scored]).astype(np.int64)
+        
+        # Best score per record; the earliest candidate wins ties
+        hits = np.flatnonzero(scores >= self.threshold)
+        order = hits[np.lexsort((candidates[hits], -scores[hits], records[hits]))]
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = records[order][1:] != records[order][:-1]
+        
+        matches = []
+        for record, candidate in zip(records[order[first]].tolist(), candidates[order[first]].tolist()):
+            score, matched = self._score(self._profiles[record], self._profiles[candidate])
+            matches.append(DuplicateMatch(
+                index=record - base,
+                record_id=self._record_ids[record],
+                duplicate_of=self._record_ids[candidate],
+                score=score,
+                matched_fields=matched
+            ))
+        return matches
+    
+    def _ssn_typo_codes(self, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        """_ssn_typo for pairs of SSN codes, checking each distinct pair once"""
+        result = np.empty(len(a), dtype=bool)
+        for i, pair in enumerate(zip(a.tolist(), b.tolist())):
+            typo = self._ssn_typos.get(pair)
+            if typo is None:
+                typo = self._ssn_typos[pair] = _ssn_typo(self._ssns[pair[0]], self._ssns[pair[1]])
+            result[i] = typo
+        return result
+    
+    def _blocking_keys(self, profile: Tuple[Optional[str], ...]) -> List[Tuple[str, ...]]:
+        keys = []
+        if profile[_SSN]:
+            keys.append(("ssn", profile[_SSN]))
+        if profile[_LAST] and profile[_DOB]:
+            keys.append(("name_dob", profile[_LAST], profile[_DOB]))
+        if profile[_EMAIL]:
+            keys.append(("email", profile[_EMAIL]))
+        return keys
+    
+    def _score(
+        self,
+        a: Tuple[Optional[str], ...],
+        b: Tuple[Optional[str], ...]
+    ) -> Tuple[int, List[str]]:
+        """Weighted agreement over the fields both records carry"""
+        agree = 0.0
+        compared = 0
+        matched: List[str] = []
+        for pos, name in enumerate(DUPLICATE_FIELDS):
+            x, y = a[pos], b[pos]
+            if not x or not y:
+                continue
+            weight = DUPLICATE_FIELD_WEIGHTS[name]
+            compared += weight
+            if x == y:
+                agree += weight
+                matched.append(name)
+            elif pos == _SSN and _ssn_typo(x, y):
+                agree += weight * SSN_TYPO_CREDIT
+                matched.append("ssn (typo)")
+        
+        if compared < MIN_COMPARED_WEIGHT:
+            return 0, matched
+        return int(agree * 100 / compared), matched
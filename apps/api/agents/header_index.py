@@ -0,0 +1,175 @@
+"""
+Header Index
+Character n-gram index over the canonical header vocabulary, used to resolve
+source column names that have no exact mapping (e.g. "Emp. Hire Dt").
+
+Similarity alone is not enough: "Rehire Date" or "Spouse Date of Birth" look
+like hire_date and date_of_birth. A match must also account for every word of
+the header, so a header that qualifies a field never resolves to the field.
+"""
+
+from typing import List, Dict, Optional, Tuple, FrozenSet
+from dataclasses import dataclass
+import re
+
+DEFAULT_NGRAM_SIZE = 3
+DEFAULT_MATCH_THRESHOLD = 0.75  # Minimum Dice similarity for a match
+MAX_FUZZY_CONFIDENCE = 95  # Fuzzy matches never score as high as an exact mapping
+
+# Abbreviations expanded token by token before n-grams are taken
+HEADER_ABBREVIATIONS = {
+    "addr": "address",
+    "amt": "amount",
+    "cd": "code",
+    "dt": "date",
+    "freq": "frequency",
+    "hrly": "hourly",
+    "nbr": "number",
+    "nm": "name",
+    "no": "number",
+    "num": "number",
+    "ph": "phone",
+    "sal": "salary",
+    "sec": "security",
+    "soc": "social",
+    "tel": "telephone",
+    "yr": "yearly",
+}
+
+# Header words that may go unmatched: they name the subject, not the field
+FILLER_TOKENS = frozenset({"emp", "empl", "employee", "ee", "of", "the"})
+
+# Words that make a header describe a different field (another person, an
+# earlier event, a related amount); a match must contain each one it sees
+QUALIFIER_TOKENS = frozenset({
+    "spouse", "dependent", "child", "manager", "supervisor", "employer",
+    "rehire", "prior", "previous", "former", "last", "tax", "status",
+})
+
+_NON_ALPHANUMERIC = re.compile(r"[^a-z0-9]+")
+_TOKEN = re.compile(r"[a-z]+|[0-9]+")
+
+
+@dataclass(frozen=True)
+class HeaderMatch:
+    """Best vocabulary entry for a source header"""
+    canonical: str
+    alias: str  # Normalized vocabulary entry that matched
+    score: float  # Dice similarity, 0-1
+    
+    @property
+    def confidence(self) -> int:
+        return min(MAX_FUZZY_CONFIDENCE, round(self.score * 100))
+
+
+def normalize_header(name: str) -> str:
+    """Lowercase, split on punctuation and expand common abbreviations"""
+    text = _NON_ALPHANUMERIC.sub(" ", name.lower().replace("#", " number "))
+    return " ".join(HEADER_ABBREVIATIONS.get(token, token) for token in text.split())
+
+
+def header_tokens(header: str) -> FrozenSet[str]:
+    """Words and numbers of a normalized header ("address line1" -> address, line, 1)"""
+    return frozenset(_TOKEN.findall(header))
+
+
+def covers(alias_tokens: FrozenSet[str], query_tokens: FrozenSet[str]) -> bool:
+    """
+    Whether a vocabulary entry accounts for every word of a header.
+    
+    A header word is covered by the same word, by an entry word it abbreviates
+    ("term" -> "termination") or by an entry word it inflects ("dates" ->
+    "date"); numbers must match exactly. Filler words need no cover, and
+    qualifier words must appear verbatim.
+    """
+    for token in query_tokens:
+        if token in alias_tokens or token in FILLER_TOKENS:
+            continue
+        if token in QUALIFIER_TOKENS or token.isdigit():
+            return False
+        if not any(
+            (len(token) >= 2 and alias.startswith(token)) or (len(alias) >= 4 and token.startswith(alias))
+            for alias in alias_tokens if not alias.isdigit()
+        ):
+            return False
+    return True
+
+
+class FuzzyHeaderIndex:
+    """
+    Inverted index from character n-grams to vocabulary entries.
+    
+    A lookup only scores the entries sharing at least one n-gram with the
+    query, so resolving a header costs microseconds; results are memoized.
+    """
+    
+    def __init__(
+        self,
+        vocabulary: Dict[str, str],
+        ngram_size: int = DEFAULT_NGRAM_SIZE,
+        threshold: float = DEFAULT_MATCH_THRESHOLD
+    ):
+        """
+        Args:
+            vocabulary: Known header spellings -> canonical field name; the
+                first spelling wins when two normalize to the same entry
+            ngram_size: Character n-gram length
+            threshold: Minimum similarity for a match
+        """
+        self.ngram_size = ngram_size
+        self.threshold = threshold
+        self._aliases: List[Tuple[str, str, int, FrozenSet[str]]] = []  # (alias, canonical, n-gram count, tokens)
+        self._postings: Dict[str, List[int]] = {}
+        self._memo: Dict[str, Optional[HeaderMatch]] = {}
+        
+        seen = set()
+        for spelling, canonical in vocabulary.items():
+            alias = normalize_header(spelling)
+            if not alias or alias in seen:
+                continue
+            seen.add(alias)
+            grams = self._ngrams(alias)
+            for gram in grams:
+                self._postings.setdefault(gram, []).append(len(self._aliases))
+            self._aliases.append((alias, canonical, len(grams), header_tokens(alias)))
+    
+    def match(self, name: str) -> Optional[HeaderMatch]:
+        """
+        Find the closest vocabulary entry for a header that covers all of
+        its words.
+        
+        Args:
+            name: Source column name
+        
+        Returns:
+            HeaderMatch, or None if nothing reaches the threshold
+        """
+        query = normalize_header(name)
+        if query in self._memo:
+            return self._memo[query]
+        
+        grams = self._ngrams(query)
+        tokens = header_tokens(query)
+        shared: Dict[int, int] = {}
+        for gram in grams:
+            for alias_id in self._postings.get(gram, ()):
+                shared[alias_id] = shared.get(alias_id, 0) + 1
+        
+        # Ties go to the earlier vocabulary entry, independent of hash order
+        best: Optional[HeaderMatch] = None
+        best_key: Tuple[float, int] = (0.0, 0)
+        for alias_id, overlap in shared.items():
+            alias, canonical, size, alias_tokens = self._aliases[alias_id]
+            score = 2 * overlap / (len(grams) + size)
+            if score < self.threshold or not covers(alias_tokens, tokens):
+                continue
+            if best is None or (score, -alias_id) > best_key:
+                best = HeaderMatch(canonical=canonical, alias=alias, score=score)
+                best_key = (score, -alias_id)
+        
+        self._memo[query] = best
+        return best
+    
+    def _ngrams(self, text: str) -> set:
+        padded = f" {text} "
+        return {padded[i:i + self.ngram_size] for i in range(len(padded) - self.ngram_size + 1)}
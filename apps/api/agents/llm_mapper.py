@@ -0,0 +1,222 @@
+"""
+LLM Field Mapper
+Resolves header names and field values that the deterministic mappings miss.
+Only unresolved headers and distinct unmapped values are sent (never rows), in one
+prompt per upload, with answers cached on disk and in-flight requests limited.
+"""
+
+from typing import List, Dict, Any, Optional
+from dataclasses import dataclass, field
+import asyncio
+import hashlib
+import json
+import logging
+import os
+
+import httpx
+
+from .mapping_plans import API_ROOT
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BASE_URL = os.getenv("ANTHROPIC_BASE_URL", "https://api.anthropic.com")
+DEFAULT_MODEL = os.getenv("ANTHROPIC_MODEL", "claude-3-5-sonnet-latest")
+# LLM_MAPPING_CACHE_DIR, made absolute at import; by default under the API
+# root next to the mapping plans, whatever the working directory
+DEFAULT_CACHE_DIR = os.path.abspath(
+    os.getenv("LLM_MAPPING_CACHE_DIR", os.path.join(API_ROOT, ".synapse", "llm_mapping_cache"))
+)
+DEFAULT_MAX_CONCURRENCY = 4
+MAX_VALUES_PER_FIELD = 50  # Distinct values sent per field, to bound prompt size
+
+
+@dataclass
+class LLMMappingResult:
+    """Mappings suggested by the model for one upload"""
+    field_mappings: Dict[str, str] = field(default_factory=dict)  # source header -> canonical field
+    value_mappings: Dict[str, Dict[str, str]] = field(default_factory=dict)  # field -> raw -> canonical
+    cached: bool = False
+
+
+class LLMFieldMapper:
+    """
+    Batched, cached client for LLM-assisted field mapping.
+    
+    Requests go to the Messages API at base_url, so a local fake model server
+    (or an httpx transport such as httpx.MockTransport) can stand in for the
+    real one.
+    """
+    
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str = DEFAULT_BASE_URL,
+        model: str = DEFAULT_MODEL,
+        cache_dir: Optional[str] = DEFAULT_CACHE_DIR,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        timeout: float = 60.0,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        self.model = model
+        self.cache_dir = cache_dir
+        self.timeout = timeout
+        self.transport = transport
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+    
+    async def resolve(
+        self,
+        header_signature: str,
+        unresolved_headers: List[str],
+        unmapped_values: Dict[str, List[str]],
+        canonical_fields: List[str],
+        allowed_values: Dict[str, List[str]]
+    ) -> LLMMappingResult:
+        """
+        Ask the model to map unresolved headers and values in a single prompt.
+        
+        Args:
+            header_signature: Signature of the upload's header row
+            unresolved_headers: Source headers with no deterministic mapping
+            unmapped_values: Distinct unrecognized values per canonical field
+            canonical_fields: Allowed target field names
+            allowed_values: Allowed canonical values per field
+        
+        Returns:
+            LLMMappingResult restricted to allowed targets
+        """
+        headers = sorted(set(unresolved_headers))
+        values = {
+            name: sorted(set(vals))[:MAX_VALUES_PER_FIELD]
+            for name, vals in unmapped_values.items() if vals
+        }
+        if not headers and not values:
+            return LLMMappingResult()
+        
+        cache_key = hashlib.sha256(
+            json.dumps([header_signature, headers, sorted(values.items())]).encode("utf-8")
+        ).hexdigest()
+        # Cache files are read and written in a thread, off the event loop
+        loop = asyncio.get_running_loop()
+        cached = await loop.run_in_executor(None, self._read_cache, cache_key)
+        if cached is not None:
+            cached.cached = True
+            return cached
+        
+        prompt = self._build_prompt(headers, values, canonical_fields, allowed_values)
+        async with self._semaphore:
+            answer = await self._complete(prompt)
+        
+        result = self._parse_answer(answer, headers, values, canonical_fields, allowed_values)
+        await loop.run_in_executor(None, self._write_cache, cache_key, result)
+        return result
+    
+    def _build_prompt(
+        self,
+        headers: List[str],
+        values: Dict[str, List[str]],
+        canonical_fields: List[str],
+        allowed_values: Dict[str, List[str]]
+    ) -> str:
+        return (
+            "You map HRIS/payroll export columns to a canonical employee model.\n"
+            f"Canonical fields: {json.dumps(canonical_fields)}\n"
+            f"Allowed values per field: {json.dumps(allowed_values)}\n\n"
+            f"Unmapped column headers: {json.dumps(headers)}\n"
+            f"Unrecognized values per field: {json.dumps(values)}\n\n"
+            "Reply with only a JSON object of the form "
+            '{"field_mappings": {"<header>": "<canonical field>"}, '
+            '"value_mappings": {"<field>": {"<value>": "<allowed value>"}}}. '
+            "Omit anything you cannot map confidently."
+        )
+    
+    async def _complete(self, prompt: str) -> str:
+        async with httpx.AsyncClient(timeout=self.timeout, transport=self.transport) as client:
+            response = await client.post(
+                f"{self.base_url}/v1/messages",
+                headers={
+                    "x-api-key": self.api_key,
+                    "anthropic-version": "2023-06-01",
+                    "content-type": "application/json"
+                },
+                json={
+                    "model": self.model,
+                    "max_tokens": 2048,
+                    "messages": [{"role": "user", "content": prompt}]
+                }
+            )
+            response.raise_for_status()
+            blocks = response.json().get("content", [])
+            return "".join(b.get("text", "") for b in blocks if b.get("type") == "text")
+    
+    def _parse_answer(
+        self,
+        answer: str,
+        headers: List[str],
+        values: Dict[str, List[str]],
+        canonical_fields: List[str],
+        allowed_values: Dict[str, List[str]]
+    ) -> LLMMappingResult:
+        """Extract the JSON answer, keeping only mappings onto allowed targets"""
+        start, end = answer.find("{"), answer.rfind("}")
+        if start < 0 or end < start:
+            logger.warning("LLM mapping answer contained no JSON object")
+            return LLMMappingResult()
+        
+        try:
+            parsed: Dict[str, Any] = json.loads(answer[start:end + 1])
+        except ValueError:
+            logger.warning("LLM mapping answer was not valid JSON")
+            return LLMMappingResult()
+        
+        field_mappings = {
+            header: target
+            for header, target in (parsed.get("field_mappings") or {}).items()
+            if header in headers and target in canonical_fields
+        }
+        value_mappings: Dict[str, Dict[str, str]] = {}
+        for name, mapping in (parsed.get("value_mappings") or {}).items():
+            if name not in values or not isinstance(mapping, dict):
+                continue
+            accepted = {
+                raw: target for raw, target in mapping.items()
+                if raw in values[name] and target in allowed_values.get(name, [])
+            }
+            if accepted:
+                value_mappings[name] = accepted
+        
+        return LLMMappingResult(field_mappings=field_mappings, value_mappings=value_mappings)
+    
+    def _read_cache(self, key: str) -> Optional[LLMMappingResult]:
+        if not self.cache_dir:
+            return None
+        path = os.path.join(self.cache_dir, f"{key}.json")
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                stored = json.load(f)
+            return LLMMappingResult(
+                field_mappings=stored.get("field_mappings", {}),
+                value_mappings=stored.get("value_mappings", {})
+            )
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable LLM mapping cache entry {key}: {e}")
+            return None
+    
+    def _write_cache(self, key: str, result: LLMMappingResult) -> None:
+        if not self.cache_dir:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            path = os.path.join(self.cache_dir, f"{key}.json")
+            with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+                json.dump(
+                    {"field_mappings": result.field_mappings, "value_mappings": result.value_mappings},
+                    f,
+                    ensure_ascii=False
+                )
+            os.replace(f"{path}.tmp", path)
+        except OSError as e:
+            logger.warning(f"Could not write LLM mapping cache entry {key}: {e}")
@@ -0,0 +1,175 @@
+"""
+Mapping Plan Store
+Caches compiled header-to-canonical field mappings per client and header signature,
+and persists them with each client's schema hints so repeat uploads from the same
+HRIS export skip mapping resolution.
+
+Files are written on a background thread, one client file at a time, and
+rewrites requested while one is pending are coalesced into a single write.
+"""
+
+from typing import Any, Dict, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+import hashlib
+import json
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+# MAPPING_PLAN_DIR, made absolute at import; by default under the API root
+# (apps/api), not whichever working directory the server was started from
+API_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_PLAN_DIR = os.path.abspath(
+    os.getenv("MAPPING_PLAN_DIR", os.path.join(API_ROOT, ".synapse", "mapping_plans"))
+)
+PLAN_VERSION = 2  # Bump when header resolution changes; plans saved under another version are recompiled
+
+
+@dataclass(frozen=True)
+class HeaderMappingPlan:
+    """Canonical field name for each column of a header row"""
+    signature: str
+    header: Tuple[str, ...]
+    canonical: Tuple[str, ...]
+    confidence: Tuple[int, ...]  # 100 exact/hinted, fuzzy match score, 0 unmapped
+
+
+def header_signature(header: Tuple[str, ...], hints: Dict[str, str]) -> str:
+    """Hash of a header row together with the hints used to resolve it"""
+    payload = json.dumps([list(header), sorted(hints.items())], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+
+class MappingPlanStore:
+    """
+    In-process cache of compiled mapping plans, persisted as one JSON file per
+    client holding that client's schema hints and plans keyed by header signature.
+    
+    Changes are visible immediately; the file catches up asynchronously (call
+    flush() to wait for it).
+    """
+    
+    def __init__(self, directory: Optional[str] = DEFAULT_PLAN_DIR):
+        self.directory = directory
+        self._hints: Dict[str, Dict[str, str]] = {}
+        self._plans: Dict[str, Dict[str, HeaderMappingPlan]] = {}
+        self._pending: Dict[str, Dict[str, Any]] = {}  # client_id -> latest unwritten snapshot
+        self._pending_lock = threading.Lock()
+        self._writer: Optional[ThreadPoolExecutor] = None
+    
+    def get_hints(self, client_id: str) -> Dict[str, str]:
+        """Persisted schema hints for a client (lowercased source name -> canonical)"""
+        self._load(client_id)
+        return dict(self._hints[client_id])
+    
+    def update_hints(self, client_id: str, hints: Dict[str, str], replace: bool = False) -> None:
+        """
+        Merge (or replace) a client's schema hints.
+        
+        Plans compiled under the previous hints are dropped, since their
+        canonical names may no longer be right.
+        """
+        self._load(client_id)
+        normalized = {k.lower().strip(): v for k, v in hints.items()}
+        updated = normalized if replace else {**self._hints[client_id], **normalized}
+        if updated == self._hints[client_id]:
+            return
+        
+        self._hints[client_id] = updated
+        self._plans[client_id] = {}
+        self._save(client_id)
+    
+    def get_plan(self, client_id: str, signature: str) -> Optional[HeaderMappingPlan]:
+        self._load(client_id)
+        return self._plans[client_id].get(signature)
+    
+    def put_plan(self, client_id: str, plan: HeaderMappingPlan) -> None:
+        self._load(client_id)
+        self._plans[client_id][plan.signature] = plan
+        self._save(client_id)
+    
+    def flush(self) -> None:
+        """Wait until every change made so far has been written"""
+        if self._writer is not None:
+            self._writer.submit(lambda: None).result()  # The writer runs jobs in order
+    
+    def _load(self, client_id: str) -> None:
+        if client_id in self._hints:
+            return
+        
+        self._hints[client_id] = {}
+        self._plans[client_id] = {}
+        path = self._path(client_id)
+        if not path or not os.path.exists(path):
+            return
+        
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                stored = json.load(f)
+            self._hints[client_id] = stored.get("hints", {})
+            if stored.get("version", 1) != PLAN_VERSION:
+                return
+            # Plans saved before per-column confidence was recorded are recompiled
+            self._plans[client_id] = {
+                signature: HeaderMappingPlan(
+                    signature=signature,
+                    header=tuple(plan["header"]),
+                    canonical=tuple(plan["canonical"]),
+                    confidence=tuple(plan["confidence"])
+                )
+                for signature, plan in stored.get("plans", {}).items()
+                if "confidence" in plan
+            }
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable mapping plans for client {client_id}: {e}")
+    
+    def _save(self, client_id: str) -> None:
+        path = self._path(client_id)
+        if not path:
+            return
+        
+        stored = {
+            "version": PLAN_VERSION,
+            "hints": dict(self._hints[client_id]),
+            "plans": {
+                signature: {
+                    "header": list(plan.header),
+                    "canonical": list(plan.canonical),
+                    "confidence": list(plan.confidence)
+                }
+                for signature, plan in self._plans[client_id].items()
+            }
+        }
+        with self._pending_lock:
+            queued = client_id in self._pending
+            self._pending[client_id] = stored
+            if self._writer is None:
+                self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="mapping-plans")
+        if not queued:
+            self._writer.submit(self._write, client_id, path)
+    
+    def _write(self, client_id: str, path: str) -> None:
+        """Write the latest snapshot of a client's file (writer thread)"""
+        with self._pending_lock:
+            stored = self._pending.pop(client_id)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(stored, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not persist mapping plans for client {client_id}: {e}")
+    
+    def _path(self, client_id: str) -> Optional[str]:
+        if not self.directory:
+            return None
+        safe_id = hashlib.sha256(client_id.encode("utf-8")).hexdigest()[:24]
+        return os.path.join(self.directory, f"{safe_id}.json")
+
+
+# Singleton instance
+mapping_plan_store = MappingPlanStore()
@@ -3,13 +3,28 @@ Normalization Agent
 Uses LLM (Claude) to map, validate, and enrich raw data into the canonical model.
 """
 
-from typing import List, Dict, Any, Optional, Tuple
-from dataclasses import dataclass
+from typing import List, Dict, Any, Optional, Tuple, Union, Sequence, Iterator, AsyncIterator
+from collections import deque
+from dataclasses import dataclass, field, fields, replace
 from datetime import datetime
+from array import array
 from enum import Enum
+from functools import lru_cache
 import logging
 import json
 import os
+import re
+import asyncio
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+
+from .connector import RawRecordBatch
+from .entity_resolution import DuplicateDetector, DUPLICATE_FIELDS
+from .header_index import FuzzyHeaderIndex
+from .mapping_plans import HeaderMappingPlan, MappingPlanStore, header_signature, mapping_plan_store
+from .llm_mapper import LLMFieldMapper
+from .worker_pool import get_worker_pool, shutdown_worker_pool
 
 logger = logging.getLogger(__name__)
 
@@ -38,7 +53,7 @@ class DataTransformation:
     reasoning: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class NormalizedRecord:
     """A record that has been normalized to the canonical model"""
     record_id: str
@@ -77,11 +92,146 @@ class NormalizedRecord:
     # Metadata
     data_quality_score: int
     confidence_level: ConfidenceLevel
-    transformations: List[DataTransformation]
+    transformations: Sequence[DataTransformation]
     requires_review: bool
     review_reasons: List[str]
 
 
+# Transformation types, indexed by journal type code
+TRANSFORMATION_TYPES = tuple(TransformationType)
+_TRANSFORMATION_TYPE_CODES = {t: code for code, t in enumerate(TRANSFORMATION_TYPES)}
+
+
+class TransformationJournal:
+    """
+    Transformations for a whole batch, stored as parallel compact arrays.
+    
+    Field names and reasoning strings are held once in shared tables, and each
+    entry is a record index, field id, type code, confidence and reasoning id
+    plus references to its source and normalized values. A record's entries
+    are contiguous, so its transformations are a lazy TransformationView.
+    """
+    
+    def __init__(self):
+        self.field_names: List[str] = []
+        self.strings: List[Optional[str]] = [None]
+        self.record_index = array("I")
+        self.field_id = array("H")
+        self.type_code = array("B")
+        self.confidence = array("B")
+        self.reasoning_id = array("I")
+        self.source_values: List[Any] = []
+        self.normalized_values: List[Any] = []
+        self._field_ids: Dict[str, int] = {}
+        self._string_ids: Dict[Optional[str], int] = {None: 0}
+    
+    def __len__(self) -> int:
+        return len(self.record_index)
+    
+    def __getitem__(self, i: int) -> DataTransformation:
+        return DataTransformation(
+            field=self.field_names[self.field_id[i]],
+            source_value=self.source_values[i],
+            normalized_value=self.normalized_values[i],
+            transformation_type=TRANSFORMATION_TYPES[self.type_code[i]],
+            confidence=self.confidence[i],
+            reasoning=self.strings[self.reasoning_id[i]]
+        )
+    
+    def record(
+        self,
+        record_index: int,
+        transformations: List[DataTransformation]
+    ) -> "TransformationView":
+        """Append one record's transformations and return the view over them"""
+        start = len(self)
+        for t in transformations:
+            self.record_index.append(record_index)
+            self.field_id.append(self._intern_field(t.field))
+            self.type_code.append(_TRANSFORMATION_TYPE_CODES[t.transformation_type])
+            self.confidence.append(t.confidence)
+            self.reasoning_id.append(self._intern_string(t.reasoning))
+            self.source_values.append(t.source_value)
+            self.normalized_values.append(t.normalized_value)
+        return TransformationView(self, start, len(self))
+    
+    def extend(self, other: "TransformationJournal") -> int:
+        """
+        Append another journal's entries (e.g. from a shard).
+        
+        Returns:
+            Offset of the first appended entry, to rebase views into other
+        """
+        offset = len(self)
+        field_ids = array("H", [self._intern_field(name) for name in other.field_names])
+        string_ids = array("I", [self._intern_string(s) for s in other.strings])
+        self.record_index.extend(other.record_index)
+        self.field_id.extend(field_ids[i] for i in other.field_id)
+        self.type_code.extend(other.type_code)
+        self.confidence.extend(other.confidence)
+        self.reasoning_id.extend(string_ids[i] for i in other.reasoning_id)
+        self.source_values.extend(other.source_values)
+        self.normalized_values.extend(other.normalized_values)
+        return offset
+    
+    def _intern_field(self, name: str) -> int:
+        if name not in self._field_ids:
+            self._field_ids[name] = len(self.field_names)
+            self.field_names.append(name)
+        return self._field_ids[name]
+    
+    def _intern_string(self, s: Optional[str]) -> int:
+        if s not in self._string_ids:
+            self._string_ids[s] = len(self.strings)
+            self.strings.append(s)
+        return self._string_ids[s]
+
+
+class TransformationView(Sequence[DataTransformation]):
+    """One record's transformations, built from the journal on access"""
+    
+    __slots__ = ("journal", "start", "stop")
+    
+    def __init__(self, journal: TransformationJournal, start: int, stop: int):
+        self.journal = journal
+        self.start = start
+        self.stop = stop
+    
+    def __len__(self) -> int:
+        return self.stop - self.start
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.journal[self.start + i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("transformation index out of range")
+        return self.journal[self.start + index]
+    
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, (TransformationView, list, tuple)):
+            return NotImplemented
+        return list(self) == list(other)
+    
+    def __deepcopy__(self, memo) -> List[DataTransformation]:
+        return list(self)
+    
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+
+@dataclass
+class DateParseStats:
+    """Date parsing statistics for one column of a batch"""
+    field: str
+    detected_format: Optional[str]  # strptime format, "iso", or None if undetected
+    values_parsed: int
+    cache_hits: int
+    fallback_parses: int  # Values the detected format missed
+    failures: int  # Distinct values no format could parse
+
+
 @dataclass
 class NormalizationResult:
     """Result of normalizing a batch of records"""
@@ -89,9 +239,58 @@ class NormalizationResult:
     records_normalized: int
     records_flagged: int
     records_failed: int
-    normalized_records: List[NormalizedRecord]
+    normalized_records: Sequence[NormalizedRecord]
     errors: List[str]
     duration_ms: int
+    date_parse_stats: Dict[str, DateParseStats] = field(default_factory=dict)
+    transformation_journal: Optional[TransformationJournal] = None
+    duplicates_detected: int = 0
+
+
+# Canonical fields carried on NormalizedRecord
+CANONICAL_FIELDS = [
+    f.name for f in fields(NormalizedRecord)
+    if f.name not in {
+        "record_id", "client_id", "data_quality_score", "confidence_level",
+        "transformations", "requires_review", "review_reasons"
+    }
+]
+
+# Fields scored by _calculate_quality_score
+QUALITY_REQUIRED_FIELDS = ["first_name", "last_name", "hire_date", "employment_status"]
+QUALITY_OPTIONAL_FIELDS = ["ssn", "date_of_birth", "email", "employee_id", "employment_type"]
+
+# Canonical values for mapped fields
+CANONICAL_VALUES = {
+    "employment_status": ["active", "terminated", "on_leave", "retired"],
+    "employment_type": ["full_time", "part_time", "variable_hour", "seasonal"],
+}
+
+# Date fields standardized to ISO 8601
+DATE_FIELDS = ["hire_date", "termination_date", "date_of_birth"]
+
+ISO_DATE_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+# Common formats to try, in order
+DATE_FORMATS = [
+    "%m/%d/%Y",    # 12/31/2024
+    "%m-%d-%Y",    # 12-31-2024
+    "%m/%d/%y",    # 12/31/24
+    "%Y%m%d",      # 20241231
+    "%d-%b-%Y",    # 31-Dec-2024
+    "%B %d, %Y",   # December 31, 2024
+]
+
+DEFAULT_SHARD_SIZE = 5000  # Records per worker pool shard in normalize_sharded (results are unpickled holding the GIL)
+
+DATE_SAMPLE_SIZE = 100  # Values observed before a column locks onto a format
+DATE_CACHE_SIZE = 4096  # Distinct strings cached per column
+
+# Fields for which _validate_field can emit a DataTransformation
+TRANSFORMED_FIELDS = {
+    "hire_date", "termination_date", "date_of_birth",
+    "employment_status", "employment_type", "ssn"
+}
 
 
 # Standard field mappings for common HRIS systems
@@ -240,6 +439,268 @@ EMPLOYMENT_TYPE_MAPPINGS = {
     "temporary": "seasonal",
 }
 
+# Value lookup tables for mapped fields
+VALUE_MAPPINGS = {
+    "employment_status": STATUS_MAPPINGS,
+    "employment_type": EMPLOYMENT_TYPE_MAPPINGS,
+}
+
+# Fuzzy index over every known header spelling, for headers with no exact mapping
+HEADER_INDEX = FuzzyHeaderIndex({
+    **COMMON_FIELD_MAPPINGS,
+    **{name: name for name in CANONICAL_FIELDS}
+})
+
+
+def _parse_date_format(value: str, fmt: str) -> Optional[str]:
+    """Parse a stripped date string with a single format ("iso" for ISO 8601)"""
+    if fmt == "iso":
+        return value if ISO_DATE_PATTERN.match(value) else None
+    try:
+        return datetime.strptime(value, fmt).strftime("%Y-%m-%d")
+    except ValueError:
+        return None
+
+
+def _parse_date(value: str) -> Tuple[Optional[str], Optional[str]]:
+    """Parse a stripped date string, returning (ISO date, matched format)"""
+    for fmt in ["iso"] + DATE_FORMATS:
+        parsed = _parse_date_format(value, fmt)
+        if parsed is not None:
+            return parsed, fmt
+    return None, None
+
+
+class DateColumnParser:
+    """
+    Date parser for a single column.
+    
+    The first DATE_SAMPLE_SIZE distinct values are parsed against every format
+    and the dominant one is locked in; later values try it first and fall back
+    to the full list only on a miss. The supported formats do not overlap, so
+    locking changes the cost of a parse, never its result. Results are kept in
+    a bounded LRU cache since hire dates and birth dates repeat heavily.
+    """
+    
+    def __init__(
+        self,
+        field: str,
+        sample_size: int = DATE_SAMPLE_SIZE,
+        cache_size: int = DATE_CACHE_SIZE
+    ):
+        self.field = field
+        self.sample_size = sample_size
+        self.locked_format: Optional[str] = None
+        self._format_counts: Dict[str, int] = {}
+        self._sampled = 0
+        self._values_parsed = 0
+        self._fallbacks = 0
+        self._failures = 0
+        self._parse_cached = lru_cache(maxsize=cache_size)(self._parse_uncached)
+    
+    def parse(self, value: str) -> Optional[str]:
+        """Convert a date string to ISO 8601 (YYYY-MM-DD), or None if unparseable"""
+        self._values_parsed += 1
+        return self._parse_cached(value.strip())
+    
+    @property
+    def stats(self) -> DateParseStats:
+        return DateParseStats(
+            field=self.field,
+            detected_format=self.locked_format or max(
+                self._format_counts, key=self._format_counts.get, default=None
+            ),
+            values_parsed=self._values_parsed,
+            cache_hits=self._parse_cached.cache_info().hits,
+            fallback_parses=self._fallbacks,
+            failures=self._failures
+        )
+    
+    def _parse_uncached(self, value: str) -> Optional[str]:
+        if self.locked_format is not None:
+            parsed = _parse_date_format(value, self.locked_format)
+            if parsed is not None:
+                return parsed
+            self._fallbacks += 1
+        
+        parsed, fmt = _parse_date(value)
+        if fmt is None:
+            self._failures += 1
+        elif self.locked_format is None:
+            self._format_counts[fmt] = self._format_counts.get(fmt, 0) + 1
+            self._sampled += 1
+            if self._sampled >= self.sample_size:
+                self.locked_format = max(self._format_counts, key=self._format_counts.get)
+        return parsed
+
+
+# Status inference outcomes, indexed by code (0 = nothing inferred)
+INFERRED_STATUSES: Tuple[Optional[DataTransformation], ...] = (
+    None,
+    DataTransformation(
+        field="employment_status",
+        source_value=None,
+        normalized_value="terminated",
+        transformation_type=TransformationType.INFERENCE,
+        confidence=95,
+        reasoning="Inferred from presence of termination_date"
+    ),
+    DataTransformation(
+        field="employment_status",
+        source_value=None,
+        normalized_value="active",
+        transformation_type=TransformationType.INFERENCE,
+        confidence=85,
+        reasoning="Inferred as active (has hire_date, no termination_date)"
+    ),
+)
+
+# Confidence levels, indexed by code
+CONFIDENCE_LEVELS = (ConfidenceLevel.HIGH, ConfidenceLevel.MEDIUM, ConfidenceLevel.LOW)
+
+
+def _factorize(values: Sequence[Any]) -> Tuple[np.ndarray, List[Any]]:
+    """Encode values as integer codes into their list of distinct values"""
+    index: Dict[Any, int] = {}
+    codes = np.fromiter(
+        (index.setdefault(v, len(index)) for v in values), dtype=np.intp, count=len(values)
+    )
+    return codes, list(index)
+
+
+def _object_array(values: List[Any]) -> np.ndarray:
+    """Build a 1-D object array without NumPy trying to nest the values"""
+    arr = np.empty(len(values), dtype=object)
+    arr[:] = values
+    return arr
+
+
+class ColumnarRecords(Sequence[NormalizedRecord]):
+    """
+    Normalized records held as cleaned columns.
+    
+    Each column is stored as integer codes into its distinct cleaned values;
+    NormalizedRecord objects (and their transformations) are only built when
+    a row is accessed.
+    """
+    
+    def __init__(
+        self,
+        client_id: str,
+        record_ids: Sequence[str],
+        columns: Dict[str, Tuple[np.ndarray, np.ndarray]],
+        mapping_transforms: List[DataTransformation],
+        transform_columns: List[Tuple[str, np.ndarray, List[Any], List[Optional[DataTransformation]]]],
+        inferred_status: np.ndarray,
+        quality_scores: np.ndarray,
+        confidence_levels: np.ndarray,
+        requires_review: np.ndarray
+    ):
+        self.client_id = client_id
+        self.record_ids = record_ids
+        self.columns = columns
+        self.mapping_transforms = mapping_transforms
+        self.transform_columns = transform_columns
+        self.inferred_status = inferred_status
+        self.quality_scores = quality_scores
+        self.confidence_levels = confidence_levels
+        self.requires_review = requires_review
+        self.extra_review_reasons: Dict[int, List[str]] = {}
+    
+    def __len__(self) -> int:
+        return len(self.quality_scores)
+    
+    def __iter__(self) -> Iterator[NormalizedRecord]:
+        return (self._materialize(i) for i in range(len(self)))
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._materialize(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("record index out of range")
+        return self._materialize(index)
+    
+    def column(self, name: str) -> Sequence[Any]:
+        """Cleaned values of one canonical field for every row"""
+        if name not in self.columns:
+            return [None] * len(self)
+        codes, clean = self.columns[name]
+        return clean[codes]
+    
+    def add_review_reason(self, i: int, reason: str) -> bool:
+        """Flag row i for review; returns True if it was not flagged before"""
+        self.extra_review_reasons.setdefault(i, []).append(reason)
+        newly_flagged = not self.requires_review[i]
+        self.requires_review[i] = True
+        return bool(newly_flagged)
+    
+    def _materialize(self, i: int) -> NormalizedRecord:
+        """Build the NormalizedRecord for row i"""
+        data = {name: clean[codes[i]] for name, (codes, clean) in self.columns.items()}
+        
+        transformations = [replace(t) for t in self.mapping_transforms]
+        for field_name, codes, sources, transforms in self.transform_columns:
+            code = codes[i]
+            t = transforms[code]
+            if t is not None:
+                transformations.append(DataTransformation(
+                    field=field_name,
+                    source_value=sources[code],
+                    normalized_value=t.normalized_value,
+                    transformation_type=t.transformation_type,
+                    confidence=t.confidence,
+                    reasoning=t.reasoning
+                ))
+        
+        inferred = INFERRED_STATUSES[self.inferred_status[i]]
+        if inferred is not None:
+            data["employment_status"] = inferred.normalized_value
+            transformations.append(replace(inferred))
+        
+        review_reasons = [
+            f"Low confidence ({t.confidence}%) on field '{t.field}'"
+            for t in transformations if t.confidence < 80
+        ]
+        review_reasons.extend(self.extra_review_reasons.get(i, ()))
+        
+        return NormalizedRecord(
+            record_id=self.record_ids[i],
+            client_id=self.client_id,
+            **{name: data.get(name) for name in CANONICAL_FIELDS},
+            data_quality_score=int(self.quality_scores[i]),
+            confidence_level=CONFIDENCE_LEVELS[self.confidence_levels[i]],
+            transformations=transformations,
+            requires_review=bool(self.requires_review[i]),
+            review_reasons=review_reasons
+        )
+
+
+def _merge_date_parse_stats(
+    shard_stats: List[Dict[str, DateParseStats]]
+) -> Dict[str, DateParseStats]:
+    """Combine per-shard date parse statistics into per-column totals"""
+    merged: Dict[str, DateParseStats] = {}
+    formats: Dict[str, Dict[str, int]] = {}
+    for stats in shard_stats:
+        for name, s in stats.items():
+            if s.detected_format:
+                votes = formats.setdefault(name, {})
+                votes[s.detected_format] = votes.get(s.detected_format, 0) + s.values_parsed
+            if name not in merged:
+                merged[name] = replace(s)
+                continue
+            m = merged[name]
+            m.values_parsed += s.values_parsed
+            m.cache_hits += s.cache_hits
+            m.fallback_parses += s.fallback_parses
+            m.failures += s.failures
+    
+    for name, votes in formats.items():
+        merged[name].detected_format = max(votes, key=votes.get)
+    return merged
+
 
 class NormalizerAgent:
     """
@@ -247,49 +708,256 @@ class NormalizerAgent:
     Uses a combination of deterministic rules and LLM for complex mappings.
     """
     
-    def __init__(self, anthropic_api_key: Optional[str] = None):
+    def __init__(
+        self,
+        anthropic_api_key: Optional[str] = None,
+        mapping_store: Optional[MappingPlanStore] = None,
+        llm_mapper: Optional[LLMFieldMapper] = None
+    ):
         self.api_key = anthropic_api_key or os.getenv("ANTHROPIC_API_KEY")
         self.use_llm = bool(self.api_key)
+        self.mapping_store = mapping_store or mapping_plan_store
+        self.llm_mapper = llm_mapper or (LLMFieldMapper(self.api_key) if self.use_llm else None)
         
         if not self.use_llm:
             logger.warning("No Anthropic API key - using rule-based normalization only")
     
     async def normalize_batch(
         self,
-        raw_records: List[Dict[str, Any]],
+        raw_records: Union[List[Dict[str, Any]], RawRecordBatch],
         client_id: str,
-        schema_hints: Optional[Dict[str, str]] = None
+        schema_hints: Optional[Dict[str, str]] = None,
+        duplicate_detector: Optional[DuplicateDetector] = None
     ) -> NormalizationResult:
         """
         Normalize a batch of raw records to the canonical model.
         
         Args:
-            raw_records: List of raw data dictionaries
+            raw_records: List of raw data dictionaries, or a compact RawRecordBatch
+                whose header is mapped once for all of its rows
             client_id: Client ID for these records
-            schema_hints: Optional mapping hints from previous runs
-            
+            schema_hints: Optional mapping hints; persisted for the client and
+                merged with hints from previous runs
+            duplicate_detector: Detector holding earlier batches of the same
+                upload (defaults to checking this batch alone)
+        
         Returns:
             NormalizationResult with normalized records and metadata
         """
+        hints = self._client_hints(client_id, schema_hints)
+        hints, value_hints = await self._learn_mappings(client_id, raw_records, hints)
+        result = self._normalize_rows(raw_records, client_id, hints, value_hints=value_hints)
+        return self._flag_duplicates(result, duplicate_detector or DuplicateDetector())
+    
+    async def normalize_sharded(
+        self,
+        raw_records: Union[List[Dict[str, Any]], RawRecordBatch],
+        client_id: str,
+        schema_hints: Optional[Dict[str, str]] = None,
+        max_workers: Optional[int] = None,
+        shard_size: int = DEFAULT_SHARD_SIZE
+    ) -> NormalizationResult:
+        """
+        Normalize a large batch in shards across the shared worker pool.
+        
+        The event loop only awaits the shards, and the merge and duplicate
+        check run on the default executor, so other requests keep being served
+        while the file normalizes. Records, errors and flag counts are merged
+        in input order and match normalize_batch.
+        
+        Args:
+            raw_records: List of raw data dictionaries, or a compact RawRecordBatch
+            client_id: Client ID for these records
+            schema_hints: Optional mapping hints (see normalize_batch)
+            max_workers: Worker processes (defaults to the CPU count)
+            shard_size: Records per shard
+        
+        Returns:
+            NormalizationResult with normalized records and metadata
+        """
+        start_time = datetime.now()
+        hints = self._client_hints(client_id, schema_hints)
+        hints, value_hints = await self._learn_mappings(client_id, raw_records, hints)
+        
+        shards = []
+        for offset in range(0, len(raw_records), shard_size):
+            if isinstance(raw_records, RawRecordBatch):
+                shard = raw_records.shard(offset, offset + shard_size)
+            else:
+                shard = raw_records[offset:offset + shard_size]
+            shards.append((shard, offset))
+        
+        loop = asyncio.get_running_loop()
+        pool = get_worker_pool(max_workers)
+        try:
+            results = await asyncio.gather(*[
+                loop.run_in_executor(
+                    pool, _normalize_shard, shard, client_id, hints, offset, value_hints
+                )
+                for shard, offset in shards
+            ])
+        except BrokenProcessPool:
+            shutdown_worker_pool()  # A worker died; the next call starts a fresh pool
+            raise
+        
+        return await loop.run_in_executor(None, self._merge_shards, results, start_time)
+    
+    async def normalize_stream(
+        self,
+        batches: AsyncIterator[Union[List[Dict[str, Any]], RawRecordBatch]],
+        client_id: str,
+        schema_hints: Optional[Dict[str, str]] = None,
+        processes: int = 0
+    ) -> AsyncIterator[NormalizationResult]:
+        """
+        Normalize an async stream of record batches, yielding one result per batch.
+        
+        Records are numbered across the whole stream, so record ids and errors
+        match normalize_batch over the concatenated input, while only the batches
+        in flight are held in memory. Mappings are learned from the first batch
+        and reused for the rest of the stream.
+        
+        Args:
+            batches: Async iterator of raw record lists or compact batches
+            client_id: Client ID for these records
+            schema_hints: Optional mapping hints (see normalize_batch)
+            processes: Batches normalized ahead of the consumer on the shared
+                worker pool (0 normalizes each batch inline)
+        
+        Yields:
+            NormalizationResult per batch, in input order, with duplicates of
+            records in earlier batches flagged
+        """
+        hints = self._client_hints(client_id, schema_hints)
+        value_hints: Optional[Dict[str, Dict[str, str]]] = None
+        detector = DuplicateDetector()
+        offset = 0
+        
+        if not processes:
+            async for batch in batches:
+                if value_hints is None:
+                    hints, value_hints = await self._learn_mappings(client_id, batch, hints)
+                result = self._normalize_rows(batch, client_id, hints, offset, value_hints)
+                yield self._flag_duplicates(result, detector)
+                offset += len(batch)
+            return
+        
+        loop = asyncio.get_running_loop()
+        pending: deque = deque()
+        pool = get_worker_pool(processes)
+        try:
+            async for batch in batches:
+                if value_hints is None:
+                    hints, value_hints = await self._learn_mappings(client_id, batch, hints)
+                pending.append(loop.run_in_executor(
+                    pool, _normalize_shard, batch, client_id, hints, offset, value_hints
+                ))
+                offset += len(batch)
+                if len(pending) >= processes:
+                    result = await pending.popleft()
+                    yield await loop.run_in_executor(None, self._flag_duplicates, result, detector)
+            while pending:
+                result = await pending.popleft()
+                yield await loop.run_in_executor(None, self._flag_duplicates, result, detector)
+        except BrokenProcessPool:
+            shutdown_worker_pool()  # A worker died; the next call starts a fresh pool
+            raise
+        finally:
+            # Batches still queued when the consumer stops are of no use to it
+            for future in pending:
+                future.cancel()
+    
+    def _merge_shards(self, results: List[NormalizationResult], start_time: datetime) -> NormalizationResult:
+        """Merge shard results in order and flag duplicates across all of them"""
+        # Shard journals are folded into one, and each record's view rebased onto it
+        normalized_records: List[NormalizedRecord] = []
+        errors: List[str] = []
+        journal = TransformationJournal()
+        for result in results:
+            offset = journal.extend(result.transformation_journal)
+            for record in result.normalized_records:
+                view = record.transformations
+                record.transformations = TransformationView(
+                    journal, view.start + offset, view.stop + offset
+                )
+            normalized_records.extend(result.normalized_records)
+            errors.extend(result.errors)
+        
+        duration = (datetime.now() - start_time).total_seconds() * 1000
+        
+        result = NormalizationResult(
+            success=len(errors) == 0,
+            records_normalized=len(normalized_records),
+            records_flagged=sum(r.records_flagged for r in results),
+            records_failed=len(errors),
+            normalized_records=normalized_records,
+            errors=errors,
+            duration_ms=int(duration),
+            date_parse_stats=_merge_date_parse_stats([r.date_parse_stats for r in results]),
+            transformation_journal=journal
+        )
+        # Duplicates can span shards, so they are resolved over the merged records
+        return self._flag_duplicates(result, DuplicateDetector())
+    
+    def _normalize_rows(
+        self,
+        raw_records: Union[List[Dict[str, Any]], RawRecordBatch],
+        client_id: str,
+        hints: Dict[str, str],
+        index_offset: int = 0,
+        value_hints: Optional[Dict[str, Dict[str, str]]] = None
+    ) -> NormalizationResult:
+        """Normalize records row by row (index_offset numbers records within a larger batch)"""
         start_time = datetime.now()
         normalized_records: List[NormalizedRecord] = []
         errors: List[str] = []
         flagged_count = 0
         
-        for i, raw in enumerate(raw_records):
+        date_parsers = {name: DateColumnParser(name) for name in DATE_FIELDS}
+        journal = TransformationJournal()
+        # Plans and their MAPPING transformations are built once per header;
+        # the journal copies the transformations out, so rows can share them
+        batch_plan: Optional[Tuple[HeaderMappingPlan, List[DataTransformation]]] = None
+        header_plans: Dict[Tuple[str, ...], Tuple[HeaderMappingPlan, List[DataTransformation]]] = {}
+        rows: Any = raw_records
+        if isinstance(raw_records, RawRecordBatch):
+            # Compact batches share one header, so it is mapped once for every row
+            plan = self._mapping_plan(client_id, raw_records.header, hints)
+            batch_plan = (plan, self._mapping_transforms(plan))
+            rows = raw_records.rows
+        
+        for i, raw in enumerate(rows, start=index_offset):
             try:
-                record, transformations = await self._normalize_record(
-                    raw_data=raw.get("raw_data", raw),
-                    record_id=raw.get("source_id", f"record_{i}"),
+                if batch_plan is not None:
+                    plan, mapping_transforms = batch_plan
+                    mapped_data = dict(zip(plan.canonical, raw))
+                    record_id = raw_records.source_id(i - index_offset)
+                else:
+                    raw_data = raw.get("raw_data", raw)
+                    header = tuple(raw_data)
+                    if header not in header_plans:
+                        plan = self._mapping_plan(client_id, header, hints)
+                        header_plans[header] = (plan, self._mapping_transforms(plan))
+                    plan, mapping_transforms = header_plans[header]
+                    mapped_data = dict(zip(plan.canonical, raw_data.values()))
+                    record_id = raw.get("source_id", f"record_{i}")
+                
+                record, transformations = self._normalize_mapped(
+                    mapped_data=mapped_data,
+                    record_id=record_id,
                     client_id=client_id,
-                    schema_hints=schema_hints
+                    date_parsers=date_parsers,
+                    value_hints=value_hints,
+                    mapping_transforms=mapping_transforms,
+                    journal=journal,
+                    record_index=i
                 )
                 
                 if record.requires_review:
                     flagged_count += 1
                 
                 normalized_records.append(record)
-                
+            
             except Exception as e:
                 errors.append(f"Record {i}: {str(e)}")
                 logger.error(f"Normalization failed for record {i}: {e}")
@@ -303,8 +971,378 @@ class NormalizerAgent:
             records_failed=len(errors),
             normalized_records=normalized_records,
             errors=errors,
-            duration_ms=int(duration)
+            duration_ms=int(duration),
+            date_parse_stats=self._date_parse_stats(date_parsers),
+            transformation_journal=journal
+        )
+    
+    async def normalize_columnar(
+        self,
+        batch: RawRecordBatch,
+        client_id: str,
+        schema_hints: Optional[Dict[str, str]] = None,
+        duplicate_detector: Optional[DuplicateDetector] = None
+    ) -> NormalizationResult:
+        """
+        Normalize a compact batch column-at-a-time.
+        
+        The header is mapped once, each column is cleaned once per distinct value,
+        and per-row scores are computed as array operations over the columns.
+        Records are materialized lazily and match normalize_batch field for field.
+        The column work runs on the default executor, so the event loop keeps
+        serving requests while a batch normalizes.
+        
+        Args:
+            batch: Compact batch of raw rows sharing one header
+            client_id: Client ID for these records
+            schema_hints: Optional mapping hints from previous runs
+            duplicate_detector: Detector holding earlier batches of the same
+                upload (defaults to checking this batch alone)
+        
+        Returns:
+            NormalizationResult whose normalized_records is a ColumnarRecords view
+        """
+        start_time = datetime.now()
+        hints = self._client_hints(client_id, schema_hints)
+        hints, value_hints = await self._learn_mappings(client_id, batch, hints)
+        plan = self._mapping_plan(client_id, batch.header, hints)
+        
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None,
+            self._normalize_columns,
+            batch,
+            client_id,
+            plan,
+            value_hints,
+            duplicate_detector or DuplicateDetector(),
+            start_time
+        )
+    
+    def _normalize_columns(
+        self,
+        batch: RawRecordBatch,
+        client_id: str,
+        plan: HeaderMappingPlan,
+        value_hints: Optional[Dict[str, Dict[str, str]]],
+        duplicate_detector: DuplicateDetector,
+        start_time: datetime
+    ) -> NormalizationResult:
+        """Clean, score and duplicate-check a compact batch under a resolved plan (see normalize_columnar)"""
+        n = len(batch)
+        
+        # Duplicate canonical names keep their first position and last value,
+        # as dict(zip(...)) does in the row-wise path
+        source_columns: Dict[str, int] = {}
+        for col, canonical in enumerate(plan.canonical):
+            source_columns[canonical] = col
+        
+        date_parsers = {name: DateColumnParser(name) for name in DATE_FIELDS}
+        columns: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        transform_columns = []
+        
+        # Fuzzy header matches apply the same transformation to every row
+        mapping_transforms = self._mapping_transforms(plan)
+        mapping_confidence = [t.confidence for t in mapping_transforms]
+        tx_count = np.full(n, len(mapping_transforms), dtype=np.int64)
+        conf_sum = np.full(n, sum(mapping_confidence), dtype=np.int64)
+        low_confidence = np.full(n, any(c < 80 for c in mapping_confidence), dtype=bool)
+        
+        # A value that fails to clean fails every row holding it, as in the
+        # row-wise path; each failed row keeps its first error in field order
+        failures: Dict[int, str] = {}
+        for field_name, col in source_columns.items():
+            codes, distinct = _factorize([row[col] for row in batch.rows])
+            cleaned = []
+            for k, value in enumerate(distinct):
+                try:
+                    cleaned.append(self._validate_field(field_name, value, date_parsers, value_hints))
+                except Exception as e:
+                    cleaned.append((None, None))
+                    rows = np.flatnonzero(codes == k).tolist()
+                    for i in rows:
+                        failures.setdefault(i, str(e))
+                    logger.error(f"Normalization failed for {len(rows)} records on field '{field_name}': {e}")
+            columns[field_name] = (codes, _object_array([clean for clean, _ in cleaned]))
+            
+            if field_name in TRANSFORMED_FIELDS:
+                transforms = [t for _, t in cleaned]
+                transform_columns.append((field_name, codes, distinct, transforms))
+                has = np.array([t is not None for t in transforms], dtype=bool)[codes]
+                conf = np.array([t.confidence if t else 0 for t in transforms], dtype=np.int64)[codes]
+                tx_count += has
+                conf_sum += conf
+                low_confidence |= has & (conf < 80)
+        
+        def truthy(field_name: str) -> np.ndarray:
+            if field_name not in columns:
+                return np.zeros(n, dtype=bool)
+            codes, clean = columns[field_name]
+            return np.array([bool(v) for v in clean], dtype=bool)[codes]
+        
+        # Infer missing employment status (see _infer_missing)
+        has_status = truthy("employment_status")
+        infer_terminated = ~has_status & truthy("termination_date")
+        infer_active = ~has_status & ~infer_terminated & truthy("hire_date")
+        inferred_status = infer_terminated * 1 + infer_active * 2
+        tx_count += infer_terminated | infer_active
+        conf_sum += infer_terminated * 95 + infer_active * 85
+        
+        # Quality score and confidence level (see _calculate_quality_score)
+        present = {name: truthy(name) for name in QUALITY_REQUIRED_FIELDS + QUALITY_OPTIONAL_FIELDS}
+        present["employment_status"] = has_status | infer_terminated | infer_active
+        required_present = sum(present[f].astype(np.int64) for f in QUALITY_REQUIRED_FIELDS)
+        optional_present = sum(present[f].astype(np.int64) for f in QUALITY_OPTIONAL_FIELDS)
+        
+        has_tx = tx_count > 0
+        avg_confidence = np.where(has_tx, conf_sum / np.maximum(tx_count, 1), 100.0)
+        confidence_score = np.where(has_tx, (avg_confidence / 100) * 15, 15)
+        quality_scores = np.minimum(
+            100,
+            np.trunc(
+                (required_present / len(QUALITY_REQUIRED_FIELDS)) * 60
+                + (optional_present / len(QUALITY_OPTIONAL_FIELDS)) * 25
+                + confidence_score
+            )
+        ).astype(np.int64)
+        confidence_levels = np.where(
+            avg_confidence >= 90, 0, np.where(avg_confidence >= 70, 1, 2)
+        )
+        requires_review = low_confidence | (confidence_levels == 2)
+        
+        record_ids = [batch.source_id(i) for i in range(n)]
+        errors = [f"Record {i}: {failures[i]}" for i in sorted(failures)]
+        if failures:
+            # Failed rows are left out of the records, as normalize_batch does
+            keep = np.ones(n, dtype=bool)
+            keep[list(failures)] = False
+            record_ids = [record_id for record_id, kept in zip(record_ids, keep.tolist()) if kept]
+            columns = {name: (codes[keep], clean) for name, (codes, clean) in columns.items()}
+            transform_columns = [
+                (field_name, codes[keep], distinct, transforms)
+                for field_name, codes, distinct, transforms in transform_columns
+            ]
+            inferred_status = inferred_status[keep]
+            quality_scores = quality_scores[keep]
+            confidence_levels = confidence_levels[keep]
+            requires_review = requires_review[keep]
+        
+        records = ColumnarRecords(
+            client_id=client_id,
+            record_ids=record_ids,
+            columns=columns,
+            mapping_transforms=mapping_transforms,
+            transform_columns=transform_columns,
+            inferred_status=inferred_status,
+            quality_scores=quality_scores,
+            confidence_levels=confidence_levels,
+            requires_review=requires_review
+        )
+        
+        duration = (datetime.now() - start_time).total_seconds() * 1000
+        
+        result = NormalizationResult(
+            success=len(errors) == 0,
+            records_normalized=len(records),
+            records_flagged=int(requires_review.sum()),
+            records_failed=len(errors),
+            normalized_records=records,
+            errors=errors,
+            duration_ms=int(duration),
+            date_parse_stats=self._date_parse_stats(date_parsers)
         )
+        return self._flag_duplicates(result, duplicate_detector)
+    
+    def _client_hints(
+        self,
+        client_id: str,
+        schema_hints: Optional[Dict[str, str]] = None
+    ) -> Dict[str, str]:
+        """Persist any new schema hints and return the client's effective hints"""
+        if schema_hints:
+            self.mapping_store.update_hints(client_id, schema_hints)
+        return self.mapping_store.get_hints(client_id)
+    
+    def _mapping_plan(
+        self,
+        client_id: str,
+        header: Tuple[str, ...],
+        hints: Dict[str, str]
+    ) -> HeaderMappingPlan:
+        """Look up the compiled mapping plan for a header, compiling it on first sight"""
+        signature = header_signature(header, hints)
+        plan = self.mapping_store.get_plan(client_id, signature)
+        if plan is None:
+            canonical, confidence = self._resolve_header(header, hints)
+            plan = HeaderMappingPlan(
+                signature=signature,
+                header=tuple(header),
+                canonical=canonical,
+                confidence=confidence
+            )
+            self.mapping_store.put_plan(client_id, plan)
+        return plan
+    
+    def _resolve_header(
+        self,
+        header: Tuple[str, ...],
+        hints: Dict[str, str]
+    ) -> Tuple[Tuple[str, ...], Tuple[int, ...]]:
+        """
+        Resolve every column of a header row to a canonical name.
+        
+        Exact hint and common mappings come first; remaining columns go through
+        the fuzzy header index, best score first, and may only claim canonical
+        fields no other column already maps to.
+        
+        Returns:
+            (canonical name per column, mapping confidence per column)
+        """
+        canonical = [self._map_field_name(name, hints) for name in header]
+        confidence = [0] * len(header)
+        candidates = []
+        for col, name in enumerate(header):
+            key = name.lower().strip()
+            if key in hints or key in COMMON_FIELD_MAPPINGS:
+                confidence[col] = 100
+                continue
+            match = HEADER_INDEX.match(name)
+            if match:
+                candidates.append((-match.score, col, match))
+        
+        claimed = {canonical[col] for col in range(len(header)) if confidence[col]}
+        for _, col, match in sorted(candidates, key=lambda c: c[:2]):
+            if match.canonical not in claimed:
+                canonical[col] = match.canonical
+                confidence[col] = match.confidence
+                claimed.add(match.canonical)
+        
+        return tuple(canonical), tuple(confidence)
+    
+    def _mapping_transforms(self, plan: HeaderMappingPlan) -> List[DataTransformation]:
+        """MAPPING transformations for the columns a plan resolved by fuzzy match"""
+        return [
+            DataTransformation(
+                field=canonical,
+                source_value=name,
+                normalized_value=canonical,
+                transformation_type=TransformationType.MAPPING,
+                confidence=confidence,
+                reasoning=f"Header '{name}' fuzzy-matched to '{canonical}'"
+            )
+            for name, canonical, confidence in zip(plan.header, plan.canonical, plan.confidence)
+            if 0 < confidence < 100
+        ]
+    
+    async def _learn_mappings(
+        self,
+        client_id: str,
+        raw_records: Union[List[Dict[str, Any]], RawRecordBatch],
+        hints: Dict[str, str]
+    ) -> Tuple[Dict[str, str], Dict[str, Dict[str, str]]]:
+        """
+        Ask the LLM mapper about headers and values the rules cannot resolve.
+        
+        Only distinct unresolved header names and distinct unrecognized status and
+        employment type values are sent, once per upload. Learned header mappings
+        are persisted as client hints, so later uploads resolve them without a call.
+        
+        Returns:
+            (effective hints, learned value mappings per field)
+        """
+        if not self.llm_mapper:
+            return hints, {}
+        
+        if isinstance(raw_records, RawRecordBatch):
+            headers = [raw_records.header]
+            column_rows = [(raw_records.header, row) for row in raw_records.rows]
+        else:
+            payloads = [r.get("raw_data", r) for r in raw_records if isinstance(r, dict)]
+            payloads = [p for p in payloads if isinstance(p, dict)]
+            headers = list(dict.fromkeys(tuple(p) for p in payloads))
+            column_rows = [(tuple(p), tuple(p.values())) for p in payloads]
+        
+        # Headers resolved exactly or by the fuzzy index never reach the LLM
+        plans = {header: self._mapping_plan(client_id, header, hints) for header in headers}
+        all_headers = tuple(dict.fromkeys(name for header in headers for name in header))
+        unresolved = list(dict.fromkeys(
+            name
+            for plan in plans.values()
+            for name, confidence in zip(plan.header, plan.confidence)
+            if isinstance(name, str) and confidence == 0
+        ))
+        
+        tables = VALUE_MAPPINGS
+        unmapped_values: Dict[str, set] = {name: set() for name in tables}
+        canonical_by_header = {header: plan.canonical for header, plan in plans.items()}
+        for header, row in column_rows:
+            for canonical, value in zip(canonical_by_header[header], row):
+                if canonical in tables and value not in (None, ""):
+                    if str(value).lower().strip() not in tables[canonical]:
+                        unmapped_values[canonical].add(str(value).strip())
+        
+        if not unresolved and not any(unmapped_values.values()):
+            return hints, {}
+        
+        try:
+            learned = await self.llm_mapper.resolve(
+                header_signature=header_signature(all_headers, hints),
+                unresolved_headers=unresolved,
+                unmapped_values={k: sorted(v) for k, v in unmapped_values.items()},
+                canonical_fields=CANONICAL_FIELDS,
+                allowed_values=CANONICAL_VALUES
+            )
+        except Exception as e:
+            logger.warning(f"LLM-assisted mapping unavailable, using rules only: {e}")
+            return hints, {}
+        
+        if learned.field_mappings:
+            self.mapping_store.update_hints(client_id, learned.field_mappings)
+            hints = self.mapping_store.get_hints(client_id)
+        
+        return hints, learned.value_mappings
+    
+    def _flag_duplicates(
+        self,
+        result: NormalizationResult,
+        detector: DuplicateDetector
+    ) -> NormalizationResult:
+        """Add a batch to the duplicate index and flag suspected duplicates for review"""
+        start_time = datetime.now()
+        records = result.normalized_records
+        if isinstance(records, ColumnarRecords):
+            record_ids = records.record_ids
+            columns = {name: records.column(name) for name in DUPLICATE_FIELDS}
+        else:
+            record_ids = [r.record_id for r in records]
+            columns = {name: [getattr(r, name) for r in records] for name in DUPLICATE_FIELDS}
+        
+        matches = detector.add(record_ids, columns)
+        for match in matches:
+            if isinstance(records, ColumnarRecords):
+                newly_flagged = records.add_review_reason(match.index, match.review_reason)
+            else:
+                record = records[match.index]
+                record.review_reasons.append(match.review_reason)
+                newly_flagged = not record.requires_review
+                record.requires_review = True
+            if newly_flagged:
+                result.records_flagged += 1
+        
+        result.duplicates_detected += len(matches)
+        result.duration_ms += int((datetime.now() - start_time).total_seconds() * 1000)
+        return result
+    
+    def _date_parse_stats(
+        self,
+        date_parsers: Dict[str, DateColumnParser]
+    ) -> Dict[str, DateParseStats]:
+        """Collect parse statistics for the date columns that were seen"""
+        return {
+            name: parser.stats
+            for name, parser in date_parsers.items()
+            if parser.stats.values_parsed
+        }
     
     async def _normalize_record(
         self,
@@ -314,16 +1352,35 @@ class NormalizerAgent:
         schema_hints: Optional[Dict[str, str]] = None
     ) -> Tuple[NormalizedRecord, List[DataTransformation]]:
         """Normalize a single record"""
-        transformations: List[DataTransformation] = []
-        review_reasons: List[str] = []
-        
         # Step 1: Map fields to canonical names
         mapped_data = self._map_fields(raw_data, schema_hints)
         
+        return self._normalize_mapped(mapped_data, record_id, client_id)
+    
+    def _normalize_mapped(
+        self,
+        mapped_data: Dict[str, Any],
+        record_id: str,
+        client_id: str,
+        date_parsers: Optional[Dict[str, DateColumnParser]] = None,
+        value_hints: Optional[Dict[str, Dict[str, str]]] = None,
+        mapping_transforms: Optional[List[DataTransformation]] = None,
+        journal: Optional[TransformationJournal] = None,
+        record_index: int = 0
+    ) -> Tuple[NormalizedRecord, List[DataTransformation]]:
+        """
+        Normalize a single record whose fields are already mapped to canonical names.
+        
+        With a journal, the record's transformations are appended to it under
+        record_index and the record holds a view rather than its own list.
+        """
+        transformations: List[DataTransformation] = list(mapping_transforms or [])
+        review_reasons: List[str] = []
+        
         # Step 2: Validate and clean values
         cleaned_data = {}
         for field, value in mapped_data.items():
-            clean_value, transform = self._validate_field(field, value)
+            clean_value, transform = self._validate_field(field, value, date_parsers, value_hints)
             cleaned_data[field] = clean_value
             if transform:
                 transformations.append(transform)
@@ -352,6 +1409,10 @@ class NormalizerAgent:
         else:
             confidence_level = ConfidenceLevel.LOW
         
+        recorded: Sequence[DataTransformation] = transformations
+        if journal is not None:
+            recorded = journal.record(record_index, transformations)
+        
         record = NormalizedRecord(
             record_id=record_id,
             client_id=client_id,
@@ -379,7 +1440,7 @@ class NormalizerAgent:
             pay_frequency=inferred_data.get("pay_frequency"),
             data_quality_score=quality_score,
             confidence_level=confidence_level,
-            transformations=transformations,
+            transformations=recorded,
             requires_review=len(review_reasons) > 0 or confidence_level == ConfidenceLevel.LOW,
             review_reasons=review_reasons
         )
@@ -396,27 +1457,30 @@ class NormalizerAgent:
         hints = schema_hints or {}
         
         for raw_field, value in raw_data.items():
-            # Normalize field name for lookup
-            normalized_name = raw_field.lower().strip()
-            
-            # Check hints first
-            if normalized_name in hints:
-                canonical_name = hints[normalized_name]
-            # Then check common mappings
-            elif normalized_name in COMMON_FIELD_MAPPINGS:
-                canonical_name = COMMON_FIELD_MAPPINGS[normalized_name]
-            else:
-                # Keep original if no mapping found
-                canonical_name = normalized_name.replace(" ", "_")
-            
-            mapped[canonical_name] = value
+            mapped[self._map_field_name(raw_field, hints)] = value
         
         return mapped
     
+    def _map_field_name(self, raw_field: str, hints: Dict[str, str]) -> str:
+        """Resolve a single raw field name to its canonical name"""
+        # Normalize field name for lookup
+        normalized_name = raw_field.lower().strip()
+        
+        # Check hints first
+        if normalized_name in hints:
+            return hints[normalized_name]
+        # Then check common mappings
+        if normalized_name in COMMON_FIELD_MAPPINGS:
+            return COMMON_FIELD_MAPPINGS[normalized_name]
+        # Keep original if no mapping found
+        return normalized_name.replace(" ", "_")
+    
     def _validate_field(
         self,
         field: str,
-        value: Any
+        value: Any,
+        date_parsers: Optional[Dict[str, DateColumnParser]] = None,
+        value_hints: Optional[Dict[str, Dict[str, str]]] = None
     ) -> Tuple[Any, Optional[DataTransformation]]:
         """Validate and clean a field value"""
         if value is None or value == "":
@@ -425,9 +1489,24 @@ class NormalizerAgent:
         original = value
         transform = None
         
+        # Values the deterministic tables miss but the LLM mapped for this upload
+        if value_hints and field in value_hints:
+            key = str(value).lower().strip()
+            learned = value_hints[field].get(str(value).strip())
+            if learned and key not in VALUE_MAPPINGS.get(field, {}):
+                return learned, DataTransformation(
+                    field=field,
+                    source_value=value,
+                    normalized_value=learned,
+                    transformation_type=TransformationType.INFERENCE,
+                    confidence=85,
+                    reasoning="Value mapped by LLM-assisted normalization"
+                )
+        
         # Date fields
-        if field in ["hire_date", "termination_date", "date_of_birth"]:
-            normalized = self._normalize_date(str(value))
+        if field in DATE_FIELDS:
+            parser = date_parsers.get(field) if date_parsers else None
+            normalized = parser.parse(str(value)) if parser else self._normalize_date(str(value))
             if normalized != str(value):
                 transform = DataTransformation(
                     field=field,
@@ -447,7 +1526,7 @@ class NormalizerAgent:
                 source_value=value,
                 normalized_value=normalized,
                 transformation_type=TransformationType.MAPPING,
-                confidence=100 if normalized in ["active", "terminated", "on_leave", "retired"] else 70
+                confidence=100 if normalized in CANONICAL_VALUES[field] else 70
             )
             return normalized, transform
         
@@ -459,7 +1538,7 @@ class NormalizerAgent:
                 source_value=value,
                 normalized_value=normalized,
                 transformation_type=TransformationType.MAPPING,
-                confidence=100 if normalized in ["full_time", "part_time", "variable_hour", "seasonal"] else 70
+                confidence=100 if normalized in CANONICAL_VALUES[field] else 70
             )
             return normalized, transform
         
@@ -496,33 +1575,8 @@ class NormalizerAgent:
     
     def _normalize_date(self, value: str) -> Optional[str]:
         """Convert various date formats to ISO 8601 (YYYY-MM-DD)"""
-        import re
-        from datetime import datetime as dt
-        
-        value = value.strip()
-        
-        # Already ISO format
-        if re.match(r"^\d{4}-\d{2}-\d{2}$", value):
-            return value
-        
-        # Common formats to try
-        formats = [
-            "%m/%d/%Y",    # 12/31/2024
-            "%m-%d-%Y",    # 12-31-2024
-            "%m/%d/%y",    # 12/31/24
-            "%Y%m%d",      # 20241231
-            "%d-%b-%Y",    # 31-Dec-2024
-            "%B %d, %Y",   # December 31, 2024
-        ]
-        
-        for fmt in formats:
-            try:
-                parsed = dt.strptime(value, fmt)
-                return parsed.strftime("%Y-%m-%d")
-            except ValueError:
-                continue
-        
-        return None
+        parsed, _ = _parse_date(value.strip())
+        return parsed
     
     def _infer_missing(
         self,
@@ -535,24 +1589,10 @@ class NormalizerAgent:
         if not data.get("employment_status"):
             if data.get("termination_date"):
                 data["employment_status"] = "terminated"
-                transforms.append(DataTransformation(
-                    field="employment_status",
-                    source_value=None,
-                    normalized_value="terminated",
-                    transformation_type=TransformationType.INFERENCE,
-                    confidence=95,
-                    reasoning="Inferred from presence of termination_date"
-                ))
+                transforms.append(replace(INFERRED_STATUSES[1]))
             elif data.get("hire_date"):
                 data["employment_status"] = "active"
-                transforms.append(DataTransformation(
-                    field="employment_status",
-                    source_value=None,
-                    normalized_value="active",
-                    transformation_type=TransformationType.INFERENCE,
-                    confidence=85,
-                    reasoning="Inferred as active (has hire_date, no termination_date)"
-                ))
+                transforms.append(replace(INFERRED_STATUSES[2]))
         
         return data, transforms
     
@@ -562,8 +1602,8 @@ class NormalizerAgent:
         transformations: List[DataTransformation]
     ) -> int:
         """Calculate a data quality score (0-100)"""
-        required_fields = ["first_name", "last_name", "hire_date", "employment_status"]
-        optional_fields = ["ssn", "date_of_birth", "email", "employee_id", "employment_type"]
+        required_fields = QUALITY_REQUIRED_FIELDS
+        optional_fields = QUALITY_OPTIONAL_FIELDS
         
         # Base score for required fields
         required_present = sum(1 for f in required_fields if data.get(f))
@@ -585,3 +1625,21 @@ class NormalizerAgent:
 
 # Singleton instance
 normalizer_agent = NormalizerAgent()
+
+# Per-process agent used by normalize_sharded workers
+_shard_agent: Optional[NormalizerAgent] = None
+
+
+def _normalize_shard(
+    raw_records: Union[List[Dict[str, Any]], RawRecordBatch],
+    client_id: str,
+    hints: Dict[str, str],
+    index_offset: int,
+    value_hints: Dict[str, Dict[str, str]]
+) -> NormalizationResult:
+    """Normalize one shard of a batch (process pool worker)"""
+    global _shard_agent
+    if _shard_agent is None:
+        # Workers resolve mappings in memory; the parent owns plan persistence
+        _shard_agent = NormalizerAgent(mapping_store=MappingPlanStore(directory=None))
+    return _shard_agent._normalize_rows(raw_records, client_id, hints, index_offset, value_hints)
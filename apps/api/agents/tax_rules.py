@@ -0,0 +1,179 @@
+"""
+Tax Year Rules
+Versioned ACA figures and form code tables per tax year.
+
+The raw tables below are compiled once at import into frozen TaxYearRules
+(integer cents and basis points, read-only mappings), so agents, engines and
+process pool workers share the same lookups and a batch can mix tax years.
+"""
+
+from typing import Dict, Any, Mapping, FrozenSet, Tuple
+from dataclasses import dataclass
+from decimal import Decimal
+from types import MappingProxyType
+import hashlib
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TAX_YEAR = 2026
+
+# IRS Coverage Codes (Line 14)
+COVERAGE_CODES = {
+    "1A": "Qualifying offer (employee only)",
+    "1B": "MEC providing MV, employee cost ≤ 9.5% mainland FPL",
+    "1C": "Employee's lowest cost ≤ 9.5% Form W-2 wages",
+    "1D": "Employee's lowest cost ≤ 9.5% rate of pay",
+    "1E": "MEC providing MV to employee, dependents, but not spouse",
+    "1F": "MEC providing MV to employee only",
+    "1G": "Offer to employee who was not full-time",
+    "1H": "No offer of coverage",
+    "1I": "Qualifying offer transition relief 2015",
+    "1J": "MEC providing MV, spouse and dependents",
+    "1K": "MEC providing MV to employee, spouse, but not dependents",
+    "1L": "ICHRA offered to employee only",
+    "1M": "ICHRA offered to employee and dependents",
+    "1N": "ICHRA offered to employee, spouse, and dependents",
+    "1O": "ICHRA offered, spouse not offered",
+    "1P": "Reserved",
+    "1Q": "Reserved",
+    "1R": "Reserved",
+    "1S": "ICHRA offered, employee's share affordability unknown",
+}
+
+# IRS Safe Harbor Codes (Line 15)
+SAFE_HARBOR_CODES = {
+    "2A": "Employee not employed during month",
+    "2B": "Employee not full-time during month",
+    "2C": "Employee enrolled in coverage offered",
+    "2D": "Employee in limited non-assessment period",
+    "2E": "Multiemployer interim rule relief",
+    "2F": "W-2 safe harbor",
+    "2G": "Federal poverty line safe harbor",
+    "2H": "Rate of pay safe harbor",
+    "2I": "Non-calendar year transition relief",
+}
+
+# Line 14 codes for which Line 15 (employee required contribution) must be reported
+LINE_15_REQUIRED_CODES = {"1B", "1C", "1D", "1E", "1J", "1K", "1L", "1M", "1N", "1O"}
+
+# Published figures per tax year. Dollar amounts are annual 4980H penalties
+# and the mainland single-person poverty line in effect for the FPL safe
+# harbor (the prior year's guideline).
+TAX_YEAR_RULES: Dict[int, Dict[str, Any]] = {
+    2023: {
+        "affordability_threshold": "0.0912",
+        "penalty_4980h_a": "2880",
+        "penalty_4980h_b": "4320",
+        "federal_poverty_line": "13590",
+    },
+    2024: {
+        "affordability_threshold": "0.0839",
+        "penalty_4980h_a": "2970",
+        "penalty_4980h_b": "4460",
+        "federal_poverty_line": "14580",
+    },
+    2025: {
+        "affordability_threshold": "0.0902",
+        "penalty_4980h_a": "2900",
+        "penalty_4980h_b": "4350",
+        "federal_poverty_line": "15060",
+    },
+    2026: {
+        "affordability_threshold": "0.0996",
+        "penalty_4980h_a": "3340",
+        "penalty_4980h_b": "5010",
+        "federal_poverty_line": "15650",
+    },
+}
+
+
+@dataclass(frozen=True)
+class TaxYearRules:
+    """Compiled ACA rules for one tax year"""
+    tax_year: int
+    affordability_threshold_bp: int
+    penalty_cents: Mapping[str, int]  # PenaltyType value -> annual amount
+    federal_poverty_line_cents: int
+    coverage_codes: Mapping[str, str]
+    safe_harbor_codes: Mapping[str, str]
+    line_15_required_codes: FrozenSet[str]
+    
+    @property
+    def affordability_threshold(self) -> Decimal:
+        return Decimal(self.affordability_threshold_bp).scaleb(-4)
+
+
+def _whole(amount: Decimal, what: str) -> int:
+    if amount != amount.to_integral_value():
+        raise ValueError(f"{what} is not a whole number: {amount}")
+    return int(amount)
+
+
+def compile_rules(tax_year: int, table: Mapping[str, Any]) -> TaxYearRules:
+    """Compile one year's raw table into integer, read-only lookups"""
+    return TaxYearRules(
+        tax_year=tax_year,
+        affordability_threshold_bp=_whole(
+            Decimal(table["affordability_threshold"]) * 10000, f"{tax_year} affordability threshold in bp"
+        ),
+        penalty_cents=MappingProxyType({
+            "4980h_a": _whole(Decimal(table["penalty_4980h_a"]) * 100, f"{tax_year} 4980H(a) penalty in cents"),
+            "4980h_b": _whole(Decimal(table["penalty_4980h_b"]) * 100, f"{tax_year} 4980H(b) penalty in cents"),
+        }),
+        federal_poverty_line_cents=_whole(
+            Decimal(table["federal_poverty_line"]) * 100, f"{tax_year} poverty line in cents"
+        ),
+        coverage_codes=MappingProxyType(dict(table.get("coverage_codes", COVERAGE_CODES))),
+        safe_harbor_codes=MappingProxyType(dict(table.get("safe_harbor_codes", SAFE_HARBOR_CODES))),
+        line_15_required_codes=frozenset(table.get("line_15_required_codes", LINE_15_REQUIRED_CODES))
+    )
+
+
+class TaxRuleRegistry:
+    """
+    Compiled rules by tax year.
+    
+    Years after the last published one use its rules until new figures are
+    added (with a warning); years before the first are rejected.
+    """
+    
+    def __init__(self, tables: Mapping[int, Mapping[str, Any]]):
+        self._rules: Mapping[int, TaxYearRules] = MappingProxyType({
+            year: compile_rules(year, tables[year]) for year in sorted(tables)
+        })
+        self.years: Tuple[int, ...] = tuple(self._rules)
+        # Changes whenever any figure or code table changes; part of assessment fingerprints
+        self.version = hashlib.blake2b(
+            json.dumps(
+                {year: dict(tables[year]) for year in self.years},
+                sort_keys=True,
+                default=sorted
+            ).encode("utf-8"),
+            digest_size=8
+        ).hexdigest()
+        self._carried_forward = set()
+    
+    def get(self, tax_year: int) -> TaxYearRules:
+        """
+        Rules for a tax year.
+        
+        Raises:
+            ValueError: If the year precedes every registered year
+        """
+        rules = self._rules.get(tax_year)
+        if rules is not None:
+            return rules
+        if not self.years or tax_year < self.years[0]:
+            raise ValueError(f"No ACA rules registered for tax year {tax_year}")
+        
+        latest = self._rules[self.years[-1]]
+        if tax_year not in self._carried_forward:
+            self._carried_forward.add(tax_year)
+            logger.warning(f"No ACA rules for tax year {tax_year}; using {latest.tax_year} figures")
+        return latest
+
+
+# Singleton instance
+tax_rules = TaxRuleRegistry(TAX_YEAR_RULES)
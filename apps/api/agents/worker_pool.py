@@ -0,0 +1,50 @@
+"""
+Worker Pool
+Process pool shared by the agents for CPU-bound batch work.
+"""
+
+from typing import Optional
+from concurrent.futures import ProcessPoolExecutor
+import logging
+import multiprocessing
+import os
+
+logger = logging.getLogger(__name__)
+
+
+# Workers are started from a clean server process (or spawned where fork
+# servers are unavailable), not forked from a serving process and its threads
+START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = 0
+
+
+def get_worker_pool(workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """
+    The shared worker pool, started on first use.
+    
+    It is replaced by a larger one if more workers are asked for; work already
+    submitted to the old pool still completes.
+    
+    Args:
+        workers: Worker processes wanted (defaults to the CPU count)
+    """
+    global _pool, _pool_workers
+    workers = workers or os.cpu_count() or 1
+    if _pool is None or workers > _pool_workers:
+        if _pool is not None:
+            _pool.shutdown(wait=False)
+        _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(START_METHOD))
+        _pool_workers = workers
+        logger.info(f"Started worker pool with {workers} {START_METHOD} workers")
+    return _pool
+
+
+def shutdown_worker_pool() -> None:
+    """Stop the shared worker pool (at application shutdown, or after a worker died)"""
+    global _pool, _pool_workers
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+        _pool_workers = 0
@@ -0,0 +1,3 @@
+"""
+Benchmarks, run as modules from apps/api (e.g. python -m benchmarks.normalizer_modes)
+"""
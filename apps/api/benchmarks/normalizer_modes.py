@@ -0,0 +1,162 @@
+"""
+Normalizer Modes Benchmark
+Times normalize_batch against normalize_sharded (and normalize_columnar), and
+how long each keeps the event loop from serving anything else.
+
+Every mode normalizes the same synthetic compact batch, whose header includes
+names resolved by fuzzy match so every row carries MAPPING transformations.
+The records are checked to be identical before anything is timed. While a
+mode runs, a probe task sleeps in PROBE_INTERVAL steps on the same event loop;
+the longest gap between its wake-ups is the worst stall another request would
+have seen.
+
+Run from apps/api:
+    python -m benchmarks.normalizer_modes --rows 200000 --repeat 3 --workers 4
+"""
+
+from typing import Awaitable, Callable, List, Optional, Tuple
+from datetime import datetime
+import argparse
+import asyncio
+import dataclasses
+import os
+import random
+import time
+
+from agents.connector import DataSourceType, RawRecordBatch
+from agents.mapping_plans import MappingPlanStore
+from agents.normalizer import NormalizationResult, NormalizerAgent
+from agents.worker_pool import get_worker_pool, shutdown_worker_pool
+
+PROBE_INTERVAL = 0.005  # Seconds between event loop probe wake-ups
+
+HEADER = (
+    "Employee ID", "First Name", "Last Name", "DOB", "Emp. Hire Dt", "Term Date", "Status",
+    "Emp Type", "SSN", "Salary", "Rate", "State", "Email", "Dept",
+)
+
+# Candidate raw values per column, including values each cleaning step rewrites
+VALUES = (
+    None,
+    ("Ann", "Bob", "Cy", None),
+    ("Smith", "Jones", None),
+    ("01/02/1980", "1985-03-04", "12/31/99", "bad", None),
+    ("01/02/2020", "2021-05-06", "Jan 2 2020", "15-Mar-2019", None),
+    (None, None, "06/30/2023"),
+    ("A", "T", "Active", "x", None),
+    ("FT", "pt", "seasonal", "zz", None),
+    ("123-45-6789", "12345", "987654321", None),
+    ("$50,000", "70000.5", "abc", None),
+    ("15.5", "$20", None),
+    ("ca", "NY ", None),
+    ("a@b.c", None),
+    ("D", "Ops"),
+)
+
+
+def make_batch(rows: int, seed: int = 1) -> RawRecordBatch:
+    """Synthetic compact batch shaped like a streamed CSV upload"""
+    rng = random.Random(seed)
+    batch = RawRecordBatch(
+        source_type=DataSourceType.MANUAL_UPLOAD,
+        client_id="benchmark",
+        source_prefix="csv_benchmark.csv",
+        header=HEADER,
+        ingested_at=datetime.now()
+    )
+    for i in range(rows):
+        values: Tuple[Optional[str], ...] = (str(i),) + tuple(rng.choice(choices) for choices in VALUES[1:])
+        batch.append(values, i + 2)
+    return batch
+
+
+def _records(result: NormalizationResult) -> List[tuple]:
+    return [
+        dataclasses.astuple(dataclasses.replace(r, transformations=list(r.transformations)))
+        for r in result.normalized_records
+    ]
+
+
+async def _probe(stop: asyncio.Event) -> float:
+    """Longest gap between wake-ups of a task sleeping PROBE_INTERVAL at a time"""
+    longest = 0.0
+    last = time.perf_counter()
+    while not stop.is_set():
+        await asyncio.sleep(PROBE_INTERVAL)
+        now = time.perf_counter()
+        longest = max(longest, now - last - PROBE_INTERVAL)
+        last = now
+    return longest
+
+
+async def _timed(run: Callable[[], Awaitable[object]]) -> Tuple[float, float]:
+    """(seconds, longest event loop stall) of one run"""
+    stop = asyncio.Event()
+    probe = asyncio.create_task(_probe(stop))
+    await asyncio.sleep(0)  # Let the probe start its first sleep
+    start = time.perf_counter()
+    await run()
+    seconds = time.perf_counter() - start
+    stop.set()
+    return seconds, await probe
+
+
+async def _best_of(repeat: int, run: Callable[[], Awaitable[object]]) -> Tuple[float, float]:
+    timings = [await _timed(run) for _ in range(repeat)]
+    return min(seconds for seconds, _ in timings), max(stall for _, stall in timings)
+
+
+async def _materialized(agent: NormalizerAgent, batch: RawRecordBatch) -> None:
+    list((await agent.normalize_columnar(batch, "benchmark")).normalized_records)
+
+
+async def run(rows: int, repeat: int, workers: int) -> None:
+    batch = make_batch(rows)
+    agent = NormalizerAgent(mapping_store=MappingPlanStore(directory=None))
+    agent.llm_mapper = None  # Rules only, so no run waits on the network
+    
+    baseline = await agent.normalize_batch(batch, "benchmark")
+    for mode, result in [
+        ("sharded", await agent.normalize_sharded(batch, "benchmark", max_workers=workers)),
+        ("columnar", await agent.normalize_columnar(batch, "benchmark")),
+    ]:
+        if _records(baseline) != _records(result) or baseline.errors != result.errors:
+            raise SystemExit(f"normalize_{mode} disagrees with normalize_batch; not timing it")
+    
+    modes = {
+        "batch": lambda: agent.normalize_batch(batch, "benchmark"),
+        f"sharded ({workers} workers)": lambda: agent.normalize_sharded(batch, "benchmark", max_workers=workers),
+        "columnar": lambda: agent.normalize_columnar(batch, "benchmark"),
+        "columnar + materialize": lambda: _materialized(agent, batch),
+    }
+    timings = {mode: await _best_of(repeat, run) for mode, run in modes.items()}
+    
+    print(
+        f"{rows} rows, {len(baseline.transformation_journal)} transformations, "
+        f"{baseline.duplicates_detected} duplicates, best of {repeat}, {os.cpu_count()} CPUs"
+    )
+    print(f"  {'mode':<24} {'time':>12}  {'rows/s':>10}  {'speedup':>7}  {'max stall':>10}")
+    batch_seconds = timings["batch"][0]
+    for mode, (seconds, stall) in timings.items():
+        print(
+            f"  {mode:<24} {seconds * 1000:9.1f} ms  {rows / seconds:10.0f}  "
+            f"{batch_seconds / seconds:6.2f}x  {stall * 1000:7.1f} ms"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Time normalizer modes and their event loop stalls")
+    parser.add_argument("--rows", type=int, default=200000, help="Rows in the batch")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per mode (the best time is reported)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes when sharded")
+    args = parser.parse_args()
+    
+    get_worker_pool(args.workers)  # Started before timing, as in a running server
+    try:
+        asyncio.run(run(args.rows, args.repeat, args.workers))
+    finally:
+        shutdown_worker_pool()
+
+
+if __name__ == "__main__":
+    main()
@@ -137,6 +137,7 @@ CREATE TABLE employees (
 );
 
 CREATE INDEX idx_employees_client ON employees(client_id);
+CREATE UNIQUE INDEX idx_employees_client_employee_id ON employees(client_id, employee_id);
 CREATE INDEX idx_employees_status ON employees(employment_status);
 CREATE INDEX idx_employees_type ON employees(employment_type);
 CREATE INDEX idx_employees_ssn_last_four ON employees(ssn_last_four);
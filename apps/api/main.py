@@ -20,6 +20,10 @@ async def lifespan(app: FastAPI):
     logger.info("✅ AI Agents initialized")
     yield
     # Shutdown
+    await compliance_status_store.close()
+    shutdown_range_pool()
+    shutdown_worker_pool()
+    mapping_plan_store.flush()
     logger.info("👋 Synapse API shutting down...")
 
 # Create FastAPI application
@@ -72,6 +76,10 @@ async def root():
 
 # Import and include routers
 from routes import clients, employees, pipeline, compliance, forms
+from agents.connector import shutdown_range_pool
+from agents.mapping_plans import mapping_plan_store
+from agents.worker_pool import shutdown_worker_pool
+from services.compliance_store import compliance_status_store
 
 app.include_router(clients.router, prefix="/api/clients", tags=["Clients"])
 app.include_router(employees.router, prefix="/api/employees", tags=["Employees"])
@@ -5,11 +5,17 @@ ACA compliance management, safe harbor, and penalty risk assessment
 
 from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Optional, List, Dict, Any
 from datetime import datetime, date
 from enum import Enum
+import calendar
 import uuid
 
+from agents.ale import ale_engine
+from agents.compliance import compliance_agent, to_dollars
+from routes.models import MonthlyHoursEntry
+from services.compliance_store import compliance_status_store
+
 router = APIRouter(prefix="/compliance", tags=["compliance"])
 
 
@@ -79,6 +85,66 @@ class AffordabilityAnalysis(BaseModel):
     margin: float
 
 
+class SafeHarborStats(BaseModel):
+    safe_harbor: str
+    line_16_code: str
+    employees: int  # Employees for whom it is the most favorable
+    percentage: float
+    eligible: int
+    affordable: int
+    only_affordable: int
+    avg_contribution: float
+    avg_headroom: float
+
+
+class SafeHarborAnalysis(BaseModel):
+    client_id: Optional[str]  # None when every client's employees are analyzed
+    tax_year: int
+    employees: int
+    affordable: int
+    safe_harbors: List[SafeHarborStats]
+
+
+class MeasurementRequest(BaseModel):
+    as_of: date
+    hire_dates: Dict[str, str] = {}  # employee_id -> YYYY-MM-DD
+    hours: List[MonthlyHoursEntry]
+
+
+class MeasurementStatus(BaseModel):
+    employee_id: str
+    as_of: str
+    status: str
+    period: str  # standard, initial, initial_measurement, none
+    is_ongoing: bool
+    average_monthly_hours: float
+    months_measured: int
+    measurement_start: str
+    measurement_end: str
+    stability_start: str
+    stability_end: str
+
+
+class ALERequest(BaseModel):
+    tax_year: int = 2026
+    group_id: Optional[str] = None  # Count every entry as one aggregated group
+    hours: List[MonthlyHoursEntry]
+
+
+class ALEStatus(BaseModel):
+    group_id: str
+    tax_year: int
+    is_ale: bool
+    average_employee_count: int
+    prior_year_full_time_counts: List[int]
+    prior_year_fte_counts: List[float]
+    full_time_counts: List[int]
+    total_employee_counts: List[int]
+    employee_count: int
+    full_time_employee_count: int
+    has_prior_year_data: bool
+
+
 # Routes
 @router.get("/score", response_model=ComplianceScore)
 async def get_compliance_score():
@@ -108,6 +174,20 @@ async def get_penalty_risk(tax_year: int = Query(default=2025)):
     )
 
 
+@router.post("/ale", response_model=List[ALEStatus])
+async def determine_ale_status(request: ALERequest):
+    """Determine ALE status and Form 1094-C monthly counts from monthly hours."""
+    determinations = ale_engine.determine(
+        group_ids=[request.group_id or entry.group_id or "" for entry in request.hours],
+        employee_ids=[entry.employee_id for entry in request.hours],
+        years=[entry.year for entry in request.hours],
+        months=[entry.month for entry in request.hours],
+        hours=[entry.hours_of_service for entry in request.hours],
+        tax_year=request.tax_year
+    )
+    return [ALEStatus(**vars(d)) for d in determinations.values()]
+
+
 @router.get("/employees", response_model=List[EmployeeCompliance])
 async def list_employee_compliance(
     fte_status: Optional[str] = None,
@@ -187,45 +267,89 @@ async def analyze_affordability(
 @router.get("/measurement-periods")
 async def get_measurement_periods(tax_year: int = Query(default=2025)):
     """Get measurement period configuration."""
+    engine = compliance_agent.measurement_engine
+    measurement_start, measurement_end, stability_start, stability_end = engine.standard_periods(
+        tax_year * 12 + engine.stability_start_month - 1
+    )
     return {
         "standard_measurement": {
-            "start": f"{tax_year - 1}-10-15",
-            "end": f"{tax_year}-10-14",
-            "stability_start": f"{tax_year}-01-01",
-            "stability_end": f"{tax_year}-12-31"
+            "start": _month_bounds(measurement_start)[0],
+            "end": _month_bounds(measurement_end - 1)[1],
+            "admin_period_months": engine.administrative_months,
+            "stability_start": _month_bounds(stability_start)[0],
+            "stability_end": _month_bounds(stability_end - 1)[1]
         },
         "initial_measurement": {
-            "length_months": 12,
-            "admin_period_days": 90
+            "length_months": engine.initial_months,
+            "admin_period_months": engine.initial_administrative_months,
+            "stability_months": engine.stability_months
         }
     }
 
 
-@router.get("/safe-harbor/analysis")
-async def analyze_safe_harbors():
-    """Analyze safe harbor usage across organization."""
-    return {
-        "w2_safe_harbor": {
-            "employees": 2845,
-            "percentage": 63.0,
-            "avg_contribution": 185.50
-        },
-        "rate_of_pay": {
-            "employees": 1234,
-            "percentage": 27.3,
-            "avg_contribution": 198.00
-        },
-        "fpl": {
-            "employees": 442,
-            "percentage": 9.8,
-            "avg_contribution": 145.00
-        },
-        "recommendation": {
-            "switch_to_rate_of_pay": 156,
-            "estimated_risk_reduction": "34%",
-            "rationale": "Better audit protection for variable hour employees"
-        }
-    }
+@router.post("/measurement-periods/evaluate", response_model=List[MeasurementStatus])
+async def evaluate_measurement_periods(request: MeasurementRequest):
+    """Determine look-back measurement status for each employee as of a date."""
+    employees: Dict[str, Dict[str, Any]] = {}
+    for entry in request.hours:
+        employee = employees.setdefault(entry.employee_id, {
+            "employee_id": entry.employee_id,
+            "hire_date": request.hire_dates.get(entry.employee_id),
+            "hours_worked": []
+        })
+        employee["hours_worked"].append({"year": entry.year, "month": entry.month, "hours": entry.hours_of_service})
+    for employee_id, hire_date in request.hire_dates.items():
+        employees.setdefault(employee_id, {"employee_id": employee_id, "hire_date": hire_date})
+    
+    determinations = compliance_agent.measurement_engine.determine(list(employees.values()), request.as_of)
+    return [
+        MeasurementStatus(**{**vars(d), "status": d.status.value})
+        for d in determinations
+    ]
+
+
+@router.get("/safe-harbor/analysis", response_model=SafeHarborAnalysis)
+async def analyze_safe_harbors(
+    client_id: Optional[str] = Query(default=None),
+    tax_year: int = Query(default=compliance_agent.tax_year)
+):
+    """Analyze safe harbor usage across persisted assessments, of one client or all."""
+    if not compliance_status_store.enabled:
+        raise HTTPException(
+            status_code=503,
+            detail="Safe harbor analysis reads persisted assessments; no database is configured"
+        )
+    try:
+        affordabilities = await compliance_status_store.affordabilities(tax_year, client_id)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    if not affordabilities:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No assessed full-time employees for {tax_year}"
+        )
+    
+    summary = compliance_agent.safe_harbor_optimizer.summarize(affordabilities)
+    return SafeHarborAnalysis(
+        client_id=client_id,
+        tax_year=tax_year,
+        employees=summary.total_employees,
+        affordable=summary.affordable,
+        safe_harbors=[
+            SafeHarborStats(
+                safe_harbor=usage.safe_harbor,
+                line_16_code=usage.line_16_code,
+                employees=usage.selected,
+                percentage=round(usage.selected * 100 / summary.total_employees, 1),
+                eligible=usage.eligible,
+                affordable=usage.affordable,
+                only_affordable=usage.only_affordable,
+                avg_contribution=float(to_dollars(usage.average_contribution_cents)),
+                avg_headroom=float(to_dollars(usage.average_headroom_cents))
+            )
+            for usage in summary.usage
+        ]
+    )
 
 
 @router.get("/coverage-gaps")
@@ -260,3 +384,10 @@ async def bulk_update_codes(
         "updated": len(employee_ids),
         "message": f"Updated codes for {len(employee_ids)} employees"
     }
+
+
+def _month_bounds(ordinal: int) -> List[str]:
+    """First and last day of a month ordinal (year * 12 + month - 1)"""
+    year, month = divmod(ordinal, 12)
+    last_day = calendar.monthrange(year, month + 1)[1]
+    return [date(year, month + 1, 1).isoformat(), date(year, month + 1, last_day).isoformat()]
@@ -5,11 +5,18 @@ IRS Form 1094-C and 1095-C generation and management
 
 from fastapi import APIRouter, HTTPException, Query
 from fastapi.responses import Response
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, field_validator
 from typing import List, Optional
 from datetime import datetime
 import uuid
 
+from agents import compliance_agent
+from agents.ale import ALEDetermination, ale_engine
+from agents.compliance import MonthlyCodeEngine, tax_year_end
+from agents.tax_rules import tax_rules
+from routes.models import MonthlyHoursEntry
+from services.pdf_generator import form_1094c_data, pdf_generator
+
 router = APIRouter()
 
 
@@ -38,6 +45,8 @@ class Form1094C(BaseModel):
     ale_member: bool
     full_time_count: int
     total_employee_count: int
+    full_time_counts: List[int]  # Part III column (b), January-December
+    total_employee_counts: List[int]  # Part III column (c), January-December
     generated_at: str
 
 
@@ -45,11 +54,23 @@ class FormGenerationRequest(BaseModel):
     client_id: str
     tax_year: int = 2026
     employee_ids: Optional[List[str]] = None
+    
+    @field_validator("tax_year")
+    @classmethod
+    def _has_tax_rules(cls, tax_year: int) -> int:
+        tax_rules.get(tax_year)  # ValueError (a 422) for years before the first registered
+        return tax_year
+
+
+class Form1094CRequest(FormGenerationRequest):
+    # Monthly hours of service for the prior and tax years (ALE status and Part III)
+    hours: List[MonthlyHoursEntry] = Field(min_length=1)
 
 
 # Demo data
 forms_1095c: dict[str, Form1095C] = {}
 forms_1094c: dict[str, Form1094C] = {}
+ale_determinations: dict[str, ALEDetermination] = {}  # Behind each 1094-C, by form ID
 
 
 @router.get("/1095c", response_model=List[Form1095C])
@@ -90,7 +111,11 @@ async def generate_1095c_forms(request: FormGenerationRequest):
     
     form_id = str(uuid.uuid4())
     
-    # Demo: Create a sample form
+    # Demo: Create a sample form, coded month by month
+    demo_employee = {"employee_id": "EMP-001", "hire_date": "2020-03-01", "employment_type": "full_time"}
+    fte = compliance_agent.fte_engine.determine([demo_employee], tax_year_end(request.tax_year))
+    codes = MonthlyCodeEngine(request.tax_year).determine([demo_employee], fte)[0]
+    
     demo_form = Form1095C(
         id=form_id,
         employee_id="EMP-001",
@@ -98,9 +123,9 @@ async def generate_1095c_forms(request: FormGenerationRequest):
         client_id=request.client_id,
         tax_year=request.tax_year,
         status="draft",
-        line_14_codes=["1A"] * 12,  # Full year qualifying offer
-        line_15_codes=[None] * 12,
-        line_16_codes=[None] * 12,
+        line_14_codes=codes.line_14,
+        line_15_codes=[str(amount) if amount is not None else None for amount in codes.line_15],
+        line_16_codes=codes.line_16,
         generated_at=datetime.now().isoformat(),
         approved_at=None,
         filed_at=None
@@ -160,24 +185,34 @@ async def list_1094c_forms(
 
 
 @router.post("/1094c/generate")
-async def generate_1094c_form(request: FormGenerationRequest):
-    """Generate 1094-C transmittal form for a client"""
+async def generate_1094c_form(request: Form1094CRequest):
+    """Generate 1094-C transmittal form for a client from its monthly hours"""
     form_id = str(uuid.uuid4())
     
+    # Every entry counts toward the client as one ALE member
+    determination = ale_engine.determine_rows(
+        [entry.model_dump() for entry in request.hours],
+        request.tax_year,
+        group_id=request.client_id
+    )[request.client_id]
+    
     demo_form = Form1094C(
         id=form_id,
         client_id=request.client_id,
         client_name="Apex Manufacturing Corp",
         tax_year=request.tax_year,
         status="draft",
-        total_1095c_forms=2340,
-        ale_member=True,
-        full_time_count=2180,
-        total_employee_count=2340,
+        total_1095c_forms=determination.full_time_employee_count,
+        ale_member=determination.is_ale,
+        full_time_count=determination.full_time_employee_count,
+        total_employee_count=determination.employee_count,
+        full_time_counts=determination.full_time_counts,
+        total_employee_counts=determination.total_employee_counts,
         generated_at=datetime.now().isoformat()
     )
     
     forms_1094c[form_id] = demo_form
+    ale_determinations[form_id] = determination
     
     return {
         "message": "Form 1094-C generated",
@@ -185,6 +220,32 @@ async def generate_1094c_form(request: FormGenerationRequest):
     }
 
 
+@router.get("/1094c/{form_id}/pdf")
+async def download_1094c_pdf(form_id: str):
+    """Download 1094-C form as PDF, with its counts from the ALE determination"""
+    if form_id not in forms_1094c:
+        raise HTTPException(status_code=404, detail="Form not found")
+    
+    form = forms_1094c[form_id]
+    # Demo: employer details; in production, from the client record
+    data = form_1094c_data(ale_determinations[form_id], {
+        "employer_name": form.client_name,
+        "employer_ein": "12-3456789",
+        "employer_address": "100 Industrial Way",
+        "employer_city": "Columbus",
+        "employer_state": "OH",
+        "employer_zip": "43215",
+        "employer_contact_name": "Benefits Administrator",
+        "employer_contact_phone": "(555) 010-0100",
+    })
+    
+    return Response(
+        content=pdf_generator.generate_1094c_pdf(data),
+        media_type="application/pdf",
+        headers={"Content-Disposition": f"attachment; filename=1094c_{form_id}.pdf"}
+    )
+
+
 @router.get("/stats/{client_id}")
 async def get_form_stats(client_id: str, tax_year: int = 2026):
     """Get form generation statistics for a client"""
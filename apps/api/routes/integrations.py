@@ -10,6 +10,9 @@ from datetime import datetime
 from enum import Enum
 import uuid
 
+from agents.mapping_plans import mapping_plan_store
+from agents.normalizer import CANONICAL_FIELDS
+
 router = APIRouter(prefix="/integrations", tags=["integrations"])
 
 
@@ -249,9 +252,27 @@ async def delete_webhook(webhook_id: str):
 
 
 # Data mapping
+def _mapping_client_id(connection_id: str, client_id: Optional[str]) -> Optional[str]:
+    """Client whose schema hints a connection's field mapping feeds"""
+    if client_id:
+        return client_id
+    conn = next((c for c in mock_connections if c.id == connection_id), None)
+    return conn.config.get("client_id") if conn else None
+
+
 @router.get("/connections/{connection_id}/field-mapping")
-async def get_field_mapping(connection_id: str):
+async def get_field_mapping(connection_id: str, client_id: Optional[str] = Query(default=None)):
     """Get field mapping configuration."""
+    mapping_client = _mapping_client_id(connection_id, client_id)
+    hints = mapping_plan_store.get_hints(mapping_client) if mapping_client else {}
+    if hints:
+        return {
+            "mappings": [
+                {"source": source, "target": target, "transform": None}
+                for source, target in hints.items()
+            ]
+        }
+    
     return {
         "mappings": [
             {"source": "employee_id", "target": "external_id", "transform": None},
@@ -264,6 +285,26 @@ async def get_field_mapping(connection_id: str):
 
 
 @router.put("/connections/{connection_id}/field-mapping")
-async def update_field_mapping(connection_id: str, mappings: List[dict]):
-    """Update field mapping configuration."""
+async def update_field_mapping(
+    connection_id: str,
+    mappings: List[dict],
+    client_id: Optional[str] = Query(default=None)
+):
+    """
+    Update field mapping configuration.
+    
+    The mapping becomes the client's persisted schema hints, so the normalizer
+    compiles it into the header mapping plans used for that client's uploads.
+    Targets must be canonical field names.
+    """
+    mapping_client = _mapping_client_id(connection_id, client_id)
+    if not mapping_client:
+        raise HTTPException(status_code=400, detail="client_id is required for this connection")
+    
+    hints = {m["source"]: m["target"] for m in mappings if m.get("source") and m.get("target")}
+    unknown = sorted(set(hints.values()) - set(CANONICAL_FIELDS))
+    if unknown:
+        raise HTTPException(status_code=422, detail=f"Unknown target fields: {', '.join(unknown)}")
+    
+    mapping_plan_store.update_hints(mapping_client, hints, replace=True)
     return {"message": "Field mapping updated successfully"}
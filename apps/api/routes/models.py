@@ -0,0 +1,15 @@
+"""
+Shared API Models
+Request models used by more than one route module
+"""
+
+from pydantic import BaseModel, Field
+from typing import Optional
+
+
+class MonthlyHoursEntry(BaseModel):
+    employee_id: str
+    year: int
+    month: int = Field(ge=1, le=12)
+    hours_of_service: float
+    group_id: Optional[str] = None  # Client or aggregated group member
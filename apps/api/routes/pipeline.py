@@ -3,13 +3,19 @@ Pipeline API Routes
 Handles data upload, processing, and pipeline status
 """
 
-from fastapi import APIRouter, UploadFile, File, HTTPException, BackgroundTasks
+from fastapi import APIRouter, UploadFile, File, HTTPException, BackgroundTasks, Query
 from pydantic import BaseModel
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, AsyncIterator
 from datetime import datetime
+from contextlib import AsyncExitStack
+import os
 import uuid
 
 from agents import connector_agent, normalizer_agent, compliance_agent
+from agents.connector import DEFAULT_BATCH_SIZE
+from agents.normalizer import NormalizedRecord, DEFAULT_SHARD_SIZE
+from agents.entity_resolution import DuplicateDetector
+from services.compliance_store import compliance_status_store
 
 router = APIRouter()
 
@@ -118,6 +124,56 @@ async def upload_data(
     )
 
 
+@router.post("/upload/{client_id}/stream", response_model=UploadResponse)
+async def upload_data_stream(
+    client_id: str,
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    batch_size: int = Query(default=DEFAULT_BATCH_SIZE, ge=100, le=50000)
+):
+    """
+    Upload a large CSV file and run it through the pipeline batch by batch.
+    
+    The pipeline ID is returned as soon as the upload is received, and the file
+    is processed by a background task; poll /status/{pipeline_id} for progress
+    and errors. The file is read in fixed-size chunks rather than loaded whole.
+    Each batch of raw records is normalized off the event loop as soon as it is
+    parsed and passed straight on to compliance (and persistence, with a
+    database configured), so only the batches in flight are held in memory.
+    
+    The multipart body itself is not streamed: Starlette spools it (to a
+    temporary file past 1 MB) before this handler runs, so memory stays flat
+    but processing starts once the whole upload has been received.
+    """
+    if not file.filename.endswith('.csv'):
+        raise HTTPException(status_code=400, detail="Only CSV files are supported")
+    
+    pipeline_id = str(uuid.uuid4())
+    pipelines[pipeline_id] = PipelineStatus(
+        pipeline_id=pipeline_id,
+        client_id=client_id,
+        status="queued",
+        stage="connector",
+        records_total=0,
+        records_processed=0,
+        records_flagged=0,
+        started_at=datetime.now().isoformat(),
+        completed_at=None,
+        error=None
+    )
+    pipeline_results[pipeline_id] = []
+    
+    # The spooled upload stays open until background tasks have run
+    background_tasks.add_task(process_pipeline_stream, pipeline_id, client_id, file, batch_size)
+    
+    return UploadResponse(
+        pipeline_id=pipeline_id,
+        message="Upload received; records are counted as the pipeline streams them",
+        records_detected=0,
+        schema={"fields": []}
+    )
+
+
 @router.get("/status/{pipeline_id}", response_model=PipelineStatus)
 async def get_pipeline_status(pipeline_id: str):
     """Get the current status of a processing pipeline"""
@@ -152,90 +208,281 @@ async def trigger_processing(pipeline_id: str, background_tasks: BackgroundTasks
 
 
 async def process_pipeline(pipeline_id: str, client_id: str, raw_records: List[Dict]):
-    """Background task to process data through all pipeline stages"""
+    """Background task to process uploaded rows through all pipeline stages"""
+    normalizer_stage = PipelineStageResult(
+        stage="normalizer",
+        status="processing",
+        records_in=len(raw_records),
+        records_out=0,
+        duration_ms=0,
+        transformations=[]
+    )
+    
     try:
-        # Update status
-        pipelines[pipeline_id].status = "processing"
-        
-        # Stage 2: Normalization
-        pipelines[pipeline_id].stage = "normalizer"
-        norm_result = await normalizer_agent.normalize_batch(
-            [{"raw_data": r} for r in raw_records],
-            client_id
+        # Stage 2: Normalization (large files are normalized ahead of compliance
+        # in worker processes so the event loop keeps serving requests)
+        processes = (os.cpu_count() or 1) if len(raw_records) > DEFAULT_SHARD_SIZE else 0
+        norm_results = normalizer_agent.normalize_stream(
+            _raw_batches(raw_records, DEFAULT_BATCH_SIZE),
+            client_id,
+            processes=processes
         )
+        await _run_stages(pipeline_id, client_id, norm_results, normalizer_stage, processes)
+    
+    except Exception as e:
+        _fail_pipeline(pipeline_id, str(e))
+
+
+async def process_pipeline_stream(
+    pipeline_id: str,
+    client_id: str,
+    file: UploadFile,
+    batch_size: int
+):
+    """Background task to stream an upload through all pipeline stages"""
+    connector_stage = PipelineStageResult(
+        stage="connector",
+        status="processing",
+        records_in=0,
+        records_out=0,
+        duration_ms=0,
+        transformations=[]
+    )
+    normalizer_stage = PipelineStageResult(
+        stage="normalizer",
+        status="processing",
+        records_in=0,
+        records_out=0,
+        duration_ms=0,
+        transformations=[]
+    )
+    pipeline_results[pipeline_id].append(connector_stage)
+    
+    try:
+        norm_results = _normalize_upload(
+            pipeline_id, client_id, file, batch_size, connector_stage, normalizer_stage
+        )
+        processes = os.cpu_count() or 1
+        await _run_stages(pipeline_id, client_id, norm_results, normalizer_stage, processes)
+    
+    except Exception as e:
+        _fail_pipeline(pipeline_id, str(e))
+
+
+async def _run_stages(
+    pipeline_id: str,
+    client_id: str,
+    norm_results: AsyncIterator[Any],
+    normalizer_stage: PipelineStageResult,
+    processes: int = 0
+):
+    """
+    Run normalized batches through the compliance, persistence and reporter stages.
+    
+    Records flow from normalization into compliance batch by batch, so stage
+    results update as each batch completes and only the batches in flight are
+    held as normalized records and employee dicts. With a database configured,
+    each batch of assessments is also copied into staging as it completes and
+    upserted into compliance_status once compliance finishes.
+    
+    Args:
+        pipeline_id: Pipeline to report progress on
+        client_id: Client ID
+        norm_results: NormalizationResult per batch, in input order
+        normalizer_stage: Stage result that normalization progress is recorded on
+        processes: Worker processes assessing batches (0 assesses inline)
+    """
+    compliance_stage = PipelineStageResult(
+        stage="compliance",
+        status="processing",
+        records_in=0,
+        records_out=0,
+        duration_ms=0,
+        transformations=[]
+    )
+    stages = [normalizer_stage, compliance_stage]
+    persistence_stage = None
+    if compliance_status_store.enabled:
+        persistence_stage = PipelineStageResult(
+            stage="persistence",
+            status="processing",
+            records_in=0,
+            records_out=0,
+            duration_ms=0,
+            transformations=[]
+        )
+        stages.append(persistence_stage)
+    
+    # Update status
+    pipelines[pipeline_id].status = "processing"
+    pipelines[pipeline_id].stage = "normalizer"
+    pipeline_results[pipeline_id].extend(stages)
+    
+    # Stage 3: Compliance, fed by normalized batches as they complete (in
+    # worker processes too for large files), with each batch staged for
+    # persistence as it arrives
+    compliant = 0
+    async with AsyncExitStack() as stack:
+        writer = None
+        if persistence_stage:
+            writer = await stack.enter_async_context(
+                compliance_status_store.writer(client_id, compliance_agent.tax_year)
+            )
+        async for compliance_result in compliance_agent.assess_compliance_stream(
+            _employee_batches(pipeline_id, norm_results, normalizer_stage),
+            client_id,
+            processes=processes
+        ):
+            pipelines[pipeline_id].stage = "compliance"
+            compliance_stage.records_in += compliance_result.total_assessed
+            compliance_stage.records_out += compliance_result.total_assessed
+            compliance_stage.duration_ms += compliance_result.duration_ms
+            compliant += compliance_result.compliant
+            remaining = 10 - len(compliance_stage.transformations)
+            if remaining > 0:
+                samples = _sample_assessments(compliance_result.assessments)
+                compliance_stage.transformations.extend(samples[:remaining])
+            if writer:
+                persistence_stage.records_in += await writer.stage(compliance_result.assessments)
         
-        pipeline_results[pipeline_id].append(PipelineStageResult(
-            stage="normalizer",
-            status="completed",
-            records_in=len(raw_records),
-            records_out=norm_result.records_normalized,
-            duration_ms=norm_result.duration_ms,
-            transformations=[
-                {
-                    "field": t.field,
-                    "source": t.source_value,
-                    "target": t.normalized_value,
-                    "type": t.transformation_type.value,
-                    "confidence": t.confidence
-                }
-                for rec in norm_result.normalized_records[:10]
-                for t in rec.transformations[:3]
-            ]
-        ))
-        
-        pipelines[pipeline_id].records_processed = norm_result.records_normalized
-        pipelines[pipeline_id].records_flagged = norm_result.records_flagged
-        
-        # Stage 3: Compliance
-        pipelines[pipeline_id].stage = "compliance"
-        employee_dicts = [
-            {
-                "employee_id": r.employee_id or r.record_id,
-                "first_name": r.first_name,
-                "last_name": r.last_name,
-                "hire_date": r.hire_date,
-                "employment_type": r.employment_type,
-                "employment_status": r.employment_status,
-                "annual_salary": r.annual_salary,
-                "hourly_rate": r.hourly_rate
-            }
-            for r in norm_result.normalized_records
-        ]
-        
-        compliance_result = await compliance_agent.assess_compliance(employee_dicts, client_id)
+        normalizer_stage.status = "completed"
+        compliance_stage.status = "completed"
         
-        pipeline_results[pipeline_id].append(PipelineStageResult(
-            stage="compliance",
-            status="completed",
-            records_in=norm_result.records_normalized,
-            records_out=compliance_result.total_assessed,
-            duration_ms=compliance_result.duration_ms,
-            transformations=[
-                {
-                    "employee_id": a.employee_id,
-                    "status": a.status.value,
-                    "fte_status": a.fte_determination.status.value,
-                    "line_14_code": a.line_14_code
-                }
-                for a in compliance_result.assessments[:10]
-            ]
-        ))
+        # Stage 4: Persistence (the upsert runs as the writer closes)
+        if writer:
+            pipelines[pipeline_id].stage = "persistence"
+    
+    if writer:
+        persistence_stage.status = "completed"
+        persistence_stage.records_out = writer.result.rows_written
+        persistence_stage.duration_ms = writer.result.duration_ms
+        rows_unmatched = writer.result.rows_unmatched
+        if rows_unmatched:
+            persistence_stage.transformations.append({"rows_unmatched": rows_unmatched})
+    
+    # Stage 5: Reporter (placeholder)
+    pipelines[pipeline_id].stage = "reporter"
+    pipeline_results[pipeline_id].append(PipelineStageResult(
+        stage="reporter",
+        status="completed",
+        records_in=compliance_stage.records_out,
+        records_out=compliant,
+        duration_ms=50,
+        transformations=[]
+    ))
+    
+    # Complete
+    pipelines[pipeline_id].status = "completed"
+    pipelines[pipeline_id].completed_at = datetime.now().isoformat()
+
+
+def _fail_pipeline(pipeline_id: str, error: str):
+    """Mark a pipeline, and any of its stages still processing, as failed"""
+    for stage in pipeline_results.get(pipeline_id, []):
+        if stage.status == "processing":
+            stage.status = "failed"
+    pipelines[pipeline_id].status = "failed"
+    pipelines[pipeline_id].error = error
+
+
+async def _normalize_upload(
+    pipeline_id: str,
+    client_id: str,
+    file: UploadFile,
+    batch_size: int,
+    connector_stage: PipelineStageResult,
+    normalizer_stage: PipelineStageResult
+) -> AsyncIterator[Any]:
+    """
+    Ingest an upload chunk by chunk and normalize each batch as it is parsed.
+    
+    Records connector progress, and raises ValueError if nothing could be ingested.
+    """
+    ingest_errors: List[str] = []
+    duplicate_detector = DuplicateDetector()
+    async for batch in connector_agent.ingest_csv_stream(
+        file, client_id, file.filename, batch_size=batch_size
+    ):
+        connector_stage.duration_ms += batch.duration_ms
+        ingest_errors.extend(batch.errors)
+        if not len(batch.raw_records):
+            continue
         
-        # Stage 4: Reporter (placeholder)
-        pipelines[pipeline_id].stage = "reporter"
-        pipeline_results[pipeline_id].append(PipelineStageResult(
-            stage="reporter",
-            status="completed",
-            records_in=compliance_result.total_assessed,
-            records_out=compliance_result.compliant,
-            duration_ms=50,
-            transformations=[]
-        ))
+        connector_stage.records_in += batch.records_ingested
+        connector_stage.records_out += batch.records_ingested
+        normalizer_stage.records_in += batch.records_ingested
+        pipelines[pipeline_id].records_total += batch.records_ingested
+        yield await normalizer_agent.normalize_columnar(
+            batch.raw_records, client_id, duplicate_detector=duplicate_detector
+        )
+    
+    if ingest_errors and not connector_stage.records_out:
+        raise ValueError(f"Ingestion failed: {ingest_errors[:5]}")
+    connector_stage.status = "completed"
+
+
+async def _raw_batches(raw_records: List[Dict], batch_size: int) -> AsyncIterator[List[Dict]]:
+    """Slice uploaded rows into normalizer input batches"""
+    for start in range(0, len(raw_records), batch_size):
+        yield [{"raw_data": r} for r in raw_records[start:start + batch_size]]
+
+
+async def _employee_batches(
+    pipeline_id: str,
+    norm_results: AsyncIterator[Any],
+    normalizer_stage: PipelineStageResult
+) -> AsyncIterator[List[Dict[str, Any]]]:
+    """Record normalizer progress for each batch and pass it on as employee dicts"""
+    async for norm_result in norm_results:
+        normalizer_stage.records_out += norm_result.records_normalized
+        normalizer_stage.duration_ms += norm_result.duration_ms
+        if not normalizer_stage.transformations:
+            normalizer_stage.transformations = _sample_transformations(norm_result.normalized_records)
         
-        # Complete
-        pipelines[pipeline_id].status = "completed"
-        pipelines[pipeline_id].completed_at = datetime.now().isoformat()
+        pipelines[pipeline_id].records_processed += norm_result.records_normalized
+        pipelines[pipeline_id].records_flagged += norm_result.records_flagged
         
-    except Exception as e:
-        pipelines[pipeline_id].status = "failed"
-        pipelines[pipeline_id].error = str(e)
+        yield [_employee_dict(r) for r in norm_result.normalized_records]
+
+
+def _sample_transformations(normalized_records: List[NormalizedRecord]) -> List[Dict[str, Any]]:
+    """Sample transformations shown in the normalizer stage result"""
+    return [
+        {
+            "field": t.field,
+            "source": t.source_value,
+            "target": t.normalized_value,
+            "type": t.transformation_type.value,
+            "confidence": t.confidence
+        }
+        for rec in normalized_records[:10]
+        for t in rec.transformations[:3]
+    ]
+
+
+def _sample_assessments(assessments: List[Any]) -> List[Dict[str, Any]]:
+    """Sample assessments shown in the compliance stage result"""
+    return [
+        {
+            "employee_id": a.employee_id,
+            "status": a.status.value,
+            "fte_status": a.fte_determination.status.value,
+            "line_14_code": a.line_14_code
+        }
+        for a in assessments[:10]
+    ]
+
+
+def _employee_dict(record: NormalizedRecord) -> Dict[str, Any]:
+    """Employee fields the compliance agent reads from a normalized record"""
+    return {
+        "employee_id": record.employee_id or record.record_id,
+        "first_name": record.first_name,
+        "last_name": record.last_name,
+        "hire_date": record.hire_date,
+        "termination_date": record.termination_date,
+        "employment_type": record.employment_type,
+        "employment_status": record.employment_status,
+        "annual_salary": record.annual_salary,
+        "hourly_rate": record.hourly_rate
+    }
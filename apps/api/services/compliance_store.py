@@ -0,0 +1,382 @@
+"""
+Compliance Status Store
+Persists compliance assessments to the compliance_status table in bulk.
+
+Assessments are expanded into 12 monthly rows per employee and streamed with
+binary COPY into a temporary staging table, then applied with a single
+set-based upsert on (employee_id, year, month). A client-year of a million
+or more rows costs one COPY per batch and one statement, not one per row.
+
+Each row keeps its assessment's affordability calculation, so safe harbor
+usage can be summarized from the persisted results.
+"""
+
+from typing import List, Any, Optional, Iterable, Iterator, Tuple
+from dataclasses import asdict, dataclass
+from datetime import datetime
+import asyncio
+import itertools
+import json
+import logging
+import os
+import uuid
+
+# asyncpg imports (install with: pip install synapse-api[db])
+try:
+    import asyncpg
+    ASYNCPG_AVAILABLE = True
+except ImportError:
+    ASYNCPG_AVAILABLE = False
+    logging.warning("asyncpg not installed. Compliance results will not be persisted.")
+
+from agents.compliance import (
+    AffordabilityCalculation, ComplianceAssessment, ComplianceStatus, FTEStatus, ALL_MONTHS,
+)
+
+logger = logging.getLogger(__name__)
+
+DATABASE_URL = os.getenv("DATABASE_URL")
+
+STAGING_TABLE = "compliance_status_staging"
+UPSERT_WORK_MEM = "256MB"  # Per upsert transaction, enough to sort ~1M staged rows in memory
+UNMATCHED_SAMPLE_SIZE = 10  # Unmatched employee ids named in the warning log
+STAGING_COLUMNS = (
+    "row_id", "employee_ref", "year", "month", "aca_status", "is_full_time",
+    "is_affordable", "affordability_method", "affordability_calculation", "penalty_risks",
+    "line_14_code", "line_15_premium", "line_16_code", "determination_confidence",
+    "requires_human_review",
+)
+
+# Dropped with the transaction; employee_ref is the client's own employee id,
+# resolved to employees.id by the upsert
+_CREATE_STAGING = f"""
+CREATE TEMP TABLE {STAGING_TABLE} (
+    row_id BIGINT NOT NULL,
+    employee_ref VARCHAR(100) NOT NULL,
+    year INTEGER NOT NULL,
+    month INTEGER NOT NULL,
+    aca_status VARCHAR(50) NOT NULL,
+    is_full_time BOOLEAN,
+    is_affordable BOOLEAN,
+    affordability_method VARCHAR(50),
+    affordability_calculation JSONB,
+    penalty_risks JSONB,
+    line_14_code VARCHAR(10),
+    line_15_premium DECIMAL(8,2),
+    line_16_code VARCHAR(10),
+    determination_confidence INTEGER,
+    requires_human_review BOOLEAN
+) ON COMMIT DROP
+"""
+
+# The latest staged row wins for an employee-month staged more than once;
+# unchanged rows are left alone so reassessing a client rewrites only what moved
+_UPSERT = f"""
+INSERT INTO compliance_status (
+    employee_id, client_id, year, month, aca_status, is_full_time,
+    is_affordable, affordability_method, affordability_calculation, penalty_risks,
+    line_14_code, line_15_premium, line_16_code, determination_confidence, requires_human_review
+)
+SELECT DISTINCT ON (e.id, s.year, s.month)
+    e.id, e.client_id, s.year, s.month, s.aca_status, s.is_full_time,
+    s.is_affordable, s.affordability_method, s.affordability_calculation, s.penalty_risks,
+    s.line_14_code, s.line_15_premium, s.line_16_code, s.determination_confidence,
+    s.requires_human_review
+FROM {STAGING_TABLE} s
+JOIN employees e ON e.client_id = $1 AND e.employee_id = s.employee_ref
+ORDER BY e.id, s.year, s.month, s.row_id DESC
+ON CONFLICT (employee_id, year, month) DO UPDATE SET
+    client_id = EXCLUDED.client_id,
+    aca_status = EXCLUDED.aca_status,
+    is_full_time = EXCLUDED.is_full_time,
+    is_affordable = EXCLUDED.is_affordable,
+    affordability_method = EXCLUDED.affordability_method,
+    affordability_calculation = EXCLUDED.affordability_calculation,
+    penalty_risks = EXCLUDED.penalty_risks,
+    line_14_code = EXCLUDED.line_14_code,
+    line_15_premium = EXCLUDED.line_15_premium,
+    line_16_code = EXCLUDED.line_16_code,
+    determination_confidence = EXCLUDED.determination_confidence,
+    requires_human_review = EXCLUDED.requires_human_review,
+    updated_at = NOW()
+WHERE (
+    compliance_status.client_id, compliance_status.aca_status, compliance_status.is_full_time,
+    compliance_status.is_affordable, compliance_status.affordability_method,
+    compliance_status.affordability_calculation,
+    compliance_status.penalty_risks, compliance_status.line_14_code,
+    compliance_status.line_15_premium, compliance_status.line_16_code,
+    compliance_status.determination_confidence, compliance_status.requires_human_review
+) IS DISTINCT FROM (
+    EXCLUDED.client_id, EXCLUDED.aca_status, EXCLUDED.is_full_time,
+    EXCLUDED.is_affordable, EXCLUDED.affordability_method,
+    EXCLUDED.affordability_calculation,
+    EXCLUDED.penalty_risks, EXCLUDED.line_14_code,
+    EXCLUDED.line_15_premium, EXCLUDED.line_16_code,
+    EXCLUDED.determination_confidence, EXCLUDED.requires_human_review
+)
+"""
+
+# Staged rows the upsert's join will drop: no employee of the client has the id
+_UNMATCHED = f"""
+SELECT count(*), count(DISTINCT s.employee_ref),
+    (array_agg(DISTINCT s.employee_ref ORDER BY s.employee_ref))[1:{UNMATCHED_SAMPLE_SIZE}]
+FROM {STAGING_TABLE} s
+WHERE NOT EXISTS (
+    SELECT 1 FROM employees e WHERE e.client_id = $1 AND e.employee_id = s.employee_ref
+)
+"""
+
+# Each employee's calculation is the same in every month of the year
+_AFFORDABILITY = """
+SELECT DISTINCT ON (employee_id) affordability_calculation
+FROM compliance_status
+WHERE year = $1 AND ($2::uuid IS NULL OR client_id = $2) AND affordability_calculation IS NOT NULL
+ORDER BY employee_id, month DESC
+"""
+
+_NO_PENALTY_RISKS = "[]"
+
+
+def _client_uuid(client_id: str) -> str:
+    """Canonical form of a client UUID"""
+    try:
+        return str(uuid.UUID(str(client_id)))
+    except ValueError:
+        raise ValueError(f"Compliance status persistence needs a client UUID, got {client_id!r}")
+
+
+@dataclass
+class PersistenceResult:
+    """Outcome of writing one client's assessments"""
+    client_id: str
+    rows_staged: int  # Monthly rows copied into staging
+    rows_written: int  # Rows inserted or changed (unknown employees and unchanged rows are skipped)
+    rows_unmatched: int  # Staged rows dropped because no employee of the client has their employee_id
+    duration_ms: int
+
+
+class ComplianceStatusWriter:
+    """
+    Stages assessments for one client in a single transaction.
+    
+    Use as an async context manager: stage() copies each batch into the
+    staging table as it arrives, and a clean exit runs the upsert and
+    commits; an exception rolls everything back. The outcome is in result.
+    
+    Raises:
+        ValueError: client_id is not a UUID (checked before any connection is taken)
+    """
+    
+    def __init__(self, store: "ComplianceStatusStore", client_id: str, tax_year: int):
+        self.client_id = _client_uuid(client_id)
+        self.store = store
+        self.tax_year = tax_year
+        self.result: Optional[PersistenceResult] = None
+        self._row_ids = itertools.count()
+        self._rows_staged = 0
+        self._elapsed = 0.0
+        self._connection = None
+        self._transaction = None
+    
+    async def __aenter__(self) -> "ComplianceStatusWriter":
+        start_time = datetime.now()
+        pool = await self.store.pool()
+        self._connection = await pool.acquire()
+        try:
+            self._transaction = self._connection.transaction()
+            await self._transaction.start()
+            await self._connection.execute(_CREATE_STAGING)
+        except BaseException:
+            await pool.release(self._connection)
+            raise
+        self._elapsed += (datetime.now() - start_time).total_seconds()
+        return self
+    
+    async def stage(self, assessments: Iterable[ComplianceAssessment]) -> int:
+        """
+        Copy a batch of assessments into the staging table.
+        
+        Returns:
+            Monthly rows staged from this batch
+        """
+        start_time = datetime.now()
+        status = await self._connection.copy_records_to_table(
+            STAGING_TABLE,
+            records=_monthly_rows(assessments, self.tax_year, self._row_ids),
+            columns=STAGING_COLUMNS
+        )
+        staged = _row_count(status)
+        self._rows_staged += staged
+        self._elapsed += (datetime.now() - start_time).total_seconds()
+        return staged
+    
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        start_time = datetime.now()
+        pool = await self.store.pool()
+        try:
+            if exc_type is not None:
+                await self._transaction.rollback()
+                return
+            try:
+                # Temp tables have no statistics until analyzed; the dedupe
+                # sort spills to disk at the default work_mem
+                await self._connection.execute(f"ANALYZE {STAGING_TABLE}")
+                await self._connection.execute(f"SET LOCAL work_mem = '{UPSERT_WORK_MEM}'")
+                unmatched_rows, unmatched_employees, sample = await self._connection.fetchrow(
+                    _UNMATCHED, self.client_id
+                )
+                status = await self._connection.execute(_UPSERT, self.client_id)
+            except BaseException:
+                await self._transaction.rollback()
+                raise
+            await self._transaction.commit()
+        finally:
+            await pool.release(self._connection)
+        
+        self._elapsed += (datetime.now() - start_time).total_seconds()
+        self.result = PersistenceResult(
+            client_id=self.client_id,
+            rows_staged=self._rows_staged,
+            rows_written=_row_count(status),
+            rows_unmatched=unmatched_rows,
+            duration_ms=int(self._elapsed * 1000)
+        )
+        logger.info(
+            f"Persisted compliance status for client {self.client_id}: "
+            f"{self.result.rows_written} of {self.result.rows_staged} rows written "
+            f"in {self.result.duration_ms}ms"
+        )
+        if unmatched_rows:
+            logger.warning(
+                f"Dropped {unmatched_rows} compliance status rows for client {self.client_id}: "
+                f"{unmatched_employees} employee ids not found in employees (e.g. {', '.join(sample)})"
+            )
+
+
+class ComplianceStatusStore:
+    """
+    Bulk writer (and affordability reader) for compliance_status, backed by an
+    asyncpg connection pool.
+    
+    Disabled (enabled is False) without asyncpg or a database URL; callers
+    skip persistence then.
+    """
+    
+    def __init__(self, dsn: Optional[str] = DATABASE_URL, max_connections: int = 4):
+        self.dsn = dsn
+        self.max_connections = max_connections
+        self._pool = None
+        self._pool_lock = asyncio.Lock()
+    
+    @property
+    def enabled(self) -> bool:
+        return ASYNCPG_AVAILABLE and bool(self.dsn)
+    
+    async def pool(self):
+        """The connection pool, created on first use"""
+        if not self.enabled:
+            raise RuntimeError("Compliance status persistence requires asyncpg and DATABASE_URL")
+        async with self._pool_lock:
+            if self._pool is None:
+                self._pool = await asyncpg.create_pool(self.dsn, min_size=1, max_size=self.max_connections)
+        return self._pool
+    
+    def writer(self, client_id: str, tax_year: int) -> ComplianceStatusWriter:
+        """
+        Writer that stages batches for one client and upserts them together.
+        
+        Args:
+            client_id: Client UUID (rows are matched to employees of this client;
+                rows whose employee_id matches none are dropped and counted)
+            tax_year: Year for assessments that do not carry their own
+        """
+        return ComplianceStatusWriter(self, client_id, tax_year)
+    
+    async def write(
+        self,
+        assessments: List[ComplianceAssessment],
+        client_id: str,
+        tax_year: int
+    ) -> PersistenceResult:
+        """Persist one batch of assessments (12 monthly rows each)"""
+        async with self.writer(client_id, tax_year) as writer:
+            await writer.stage(assessments)
+        return writer.result
+    
+    async def affordabilities(
+        self,
+        tax_year: int,
+        client_id: Optional[str] = None
+    ) -> List[AffordabilityCalculation]:
+        """
+        Persisted affordability calculations, one per assessed full-time employee.
+        
+        Args:
+            tax_year: Year assessed
+            client_id: Client UUID (every client's employees when omitted)
+        
+        Raises:
+            ValueError: client_id is not a UUID
+        """
+        client_uuid = _client_uuid(client_id) if client_id is not None else None
+        pool = await self.pool()
+        rows = await pool.fetch(_AFFORDABILITY, tax_year, client_uuid)
+        return [AffordabilityCalculation(**json.loads(row[0])) for row in rows]
+    
+    async def close(self) -> None:
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+
+
+def _monthly_rows(
+    assessments: Iterable[ComplianceAssessment],
+    tax_year: int,
+    row_ids: Iterator[int]
+) -> Iterator[Tuple[Any, ...]]:
+    """Staging rows (STAGING_COLUMNS order), 12 per assessment"""
+    for assessment in assessments:
+        year = assessment.tax_year or tax_year
+        status = assessment.status.value
+        review = assessment.status == ComplianceStatus.PENDING_REVIEW
+        confidence = int(assessment.fte_determination.confidence)
+        affordability = assessment.affordability
+        is_affordable = affordability.is_affordable if affordability else None
+        method = affordability.safe_harbor_used if affordability else None
+        calculation = json.dumps(asdict(affordability)) if affordability else None
+        
+        risk = assessment.penalty_risk
+        risk_json, risk_months = _NO_PENALTY_RISKS, ()
+        if risk is not None:
+            risk_months = frozenset(risk.months_at_risk)
+            risk_json = json.dumps([{
+                "penalty_type": risk.penalty_type.value,
+                "reason_code": risk.reason_code.value,
+                "potential_penalty_cents": risk.potential_penalty_cents
+            }])
+        
+        monthly = assessment.monthly_codes
+        if monthly is not None:
+            full_time_months = monthly.full_time_months
+            line_14, line_15, line_16 = monthly.line_14, monthly.line_15, monthly.line_16
+        else:
+            full_time = assessment.fte_determination.status == FTEStatus.FULL_TIME
+            full_time_months = ALL_MONTHS if full_time else 0
+            line_14, line_15, line_16 = [assessment.line_14_code] * 12, [None] * 12, [assessment.line_16_code] * 12
+        
+        for m in range(12):
+            yield (
+                next(row_ids), assessment.employee_id, year, m + 1, status,
+                bool(full_time_months >> m & 1), is_affordable, method, calculation,
+                risk_json if m + 1 in risk_months else _NO_PENALTY_RISKS,
+                line_14[m], line_15[m], line_16[m], confidence, review
+            )
+
+
+def _row_count(status: str) -> int:
+    """Row count from a command status such as 'COPY 12' or 'INSERT 0 12'"""
+    return int(status.rsplit(" ", 1)[-1])
+
+
+# Singleton instance
+compliance_status_store = ComplianceStatusStore()
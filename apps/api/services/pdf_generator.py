@@ -9,6 +9,8 @@ from dataclasses import dataclass
 from datetime import date
 import logging
 
+from agents.ale import ALEDetermination
+
 # ReportLab imports (install with: pip install reportlab)
 try:
     from reportlab.lib import colors
@@ -79,13 +81,49 @@ class Form1094CData:
     aggregated_group_members: List[str]
     
     # Monthly FTE counts
-    monthly_fte_counts: List[int]  # 12 months
+    monthly_fte_counts: List[int]  # 12 months, Part III column (b)
     
     # Certifications
     qualifying_offer_method: bool
     section_4980h_transition_relief: bool
     
     tax_year: int
+    
+    monthly_total_employee_counts: Optional[List[int]] = None  # 12 months, Part III column (c)
+    is_ale_member: bool = True
+
+
+def form_1094c_data(
+    determination: ALEDetermination,
+    employer: Dict[str, str],
+    aggregated_group_members: Optional[List[str]] = None,
+    qualifying_offer_method: bool = False,
+    section_4980h_transition_relief: bool = False
+) -> Form1094CData:
+    """
+    Form 1094-C data with its ALE member counts taken from an ALE determination.
+    
+    Args:
+        determination: ALE engine result for the employer's tax year
+        employer: The employer_* fields of Form1094CData
+        aggregated_group_members: Other members of the employer's aggregated group, if any
+        qualifying_offer_method: Certification of the Qualifying Offer Method
+        section_4980h_transition_relief: Certification of 4980H transition relief
+    """
+    return Form1094CData(
+        **employer,
+        total_employees=determination.employee_count,
+        full_time_employees=determination.full_time_employee_count,
+        total_1095c_forms=determination.full_time_employee_count,
+        is_aggregated_group=bool(aggregated_group_members),
+        aggregated_group_members=list(aggregated_group_members or []),
+        monthly_fte_counts=list(determination.full_time_counts),
+        qualifying_offer_method=qualifying_offer_method,
+        section_4980h_transition_relief=section_4980h_transition_relief,
+        tax_year=determination.tax_year,
+        monthly_total_employee_counts=list(determination.total_employee_counts),
+        is_ale_member=determination.is_ale
+    )
 
 
 class PDFGenerator:
@@ -104,7 +142,7 @@ class PDFGenerator:
         """Set up custom paragraph styles for IRS forms"""
         if not self.styles:
             return
-            
+        
         self.styles.add(ParagraphStyle(
             name='FormTitle',
             parent=self.styles['Heading1'],
@@ -310,6 +348,7 @@ class PDFGenerator:
             ["Total Number of Employees:", str(data.total_employees)],
             ["Full-Time Employees:", str(data.full_time_employees)],
             ["Total 1095-C Forms:", str(data.total_1095c_forms)],
+            ["ALE Member:", "Yes" if data.is_ale_member else "No"],
             ["Aggregated Group:", "Yes" if data.is_aggregated_group else "No"],
         ], colWidths=[2.5*inch, 2*inch])
         summary_table.setStyle(TableStyle([
@@ -327,6 +366,8 @@ class PDFGenerator:
         fte_data = [['Month'] + months]
         fte_counts = data.monthly_fte_counts if data.monthly_fte_counts else [0] * 12
         fte_data.append(['FTE Count'] + [str(c) for c in fte_counts])
+        total_counts = data.monthly_total_employee_counts or [0] * 12
+        fte_data.append(['Total Count'] + [str(c) for c in total_counts])
         
         fte_table = Table(fte_data, colWidths=[1*inch] + [0.5*inch] * 12)
         fte_table.setStyle(TableStyle([
@@ -0,0 +1,11 @@
+"""
+Shared test setup: agents run rule-based only and persist nothing to the
+working directory.
+"""
+
+import os
+import tempfile
+
+os.environ.pop("ANTHROPIC_API_KEY", None)
+os.environ.setdefault("MAPPING_PLAN_DIR", tempfile.mkdtemp(prefix="synapse-plans-"))
+os.environ.setdefault("LLM_MAPPING_CACHE_DIR", tempfile.mkdtemp(prefix="synapse-llm-cache-"))
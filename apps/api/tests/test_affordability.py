@@ -0,0 +1,116 @@
+"""
+Integer-cent affordability against an exact reference.
+
+The reference converts amounts with to_cents (Decimal, half up) and decides
+every safe harbor with exact rational arithmetic, so the vectorized batch
+path must agree with it to the cent, including contributions exactly at the
+threshold.
+"""
+
+from decimal import Decimal
+from fractions import Fraction
+
+from hypothesis import given, settings, strategies as st
+
+from agents.compliance import (
+    ComplianceAgent, SAFE_HARBORS, RATE_OF_PAY_MONTHLY_HOURS, to_cents,
+)
+from agents.tax_rules import tax_rules
+
+AGENT = ComplianceAgent(parallel_threshold=0)
+
+
+def _amounts(max_value: int):
+    """Dollar amounts as the inputs arrive: floats, strings and Decimals with up to 3 decimals"""
+    thousandths = st.integers(min_value=0, max_value=max_value * 1000)
+    return st.one_of(
+        st.none(),
+        thousandths.map(lambda n: str(Decimal(n).scaleb(-3))),
+        thousandths.map(lambda n: Decimal(n).scaleb(-3)),
+        thousandths.map(lambda n: float(Decimal(n).scaleb(-3))),
+    )
+
+
+def _reference(employee, contribution_cents):
+    rules = tax_rules.get(employee.get("tax_year") or AGENT.tax_year)
+    bases = {}
+    for harbor, field in (("W2", "annual_salary"), ("rate_of_pay", "hourly_rate")):
+        value = employee.get(field)
+        cents = to_cents(value) if value else 0
+        if cents > 0:
+            bases[harbor] = cents * (RATE_OF_PAY_MONTHLY_HOURS * 12 if harbor == "rate_of_pay" else 1)
+    bases["FPL"] = rules.federal_poverty_line_cents
+    best = max(SAFE_HARBORS, key=lambda h: (bases.get(h, -1), -SAFE_HARBORS.index(h)))
+    threshold = Fraction(rules.affordability_threshold_bp, 10000)
+    return best, contribution_cents * 12 <= threshold * bases[best]
+
+
+@st.composite
+def _batches(draw):
+    employees = draw(st.lists(
+        st.fixed_dictionaries({
+            "employee_id": st.text(min_size=1, max_size=4),
+            "annual_salary": _amounts(300000),
+            "hourly_rate": _amounts(150),
+            "tax_year": st.sampled_from([None, 2023, 2024, 2025, 2026]),
+        }),
+        min_size=1,
+        max_size=20
+    ))
+    # Either any premium, or one that puts the first employee's best harbor
+    # exactly at (or a cent either side of) the threshold
+    best, _ = _reference(employees[0], 0)
+    rules = tax_rules.get(employees[0]["tax_year"] or AGENT.tax_year)
+    base = {
+        "W2": to_cents(employees[0]["annual_salary"] or 0),
+        "rate_of_pay": to_cents(employees[0]["hourly_rate"] or 0) * RATE_OF_PAY_MONTHLY_HOURS * 12,
+        "FPL": rules.federal_poverty_line_cents,
+    }[best]
+    at_threshold = base * rules.affordability_threshold_bp // 120000
+    premium_cents = draw(st.one_of(
+        st.integers(min_value=0, max_value=300000),
+        st.sampled_from([at_threshold - 1, at_threshold, at_threshold + 1]).filter(lambda c: c >= 0),
+    ))
+    return employees, Decimal(premium_cents).scaleb(-2)
+
+
+@settings(max_examples=300, deadline=None)
+@given(_batches())
+def test_batch_affordability_matches_exact_reference(batch):
+    employees, premium = batch
+    results = AGENT._calculate_affordability_batch(employees, {"employee_monthly_premium": premium})
+    contribution_cents = to_cents(premium)
+    for employee, result in zip(employees, results):
+        best, affordable = _reference(employee, contribution_cents)
+        assert result.safe_harbor_used == best
+        assert result.is_affordable == affordable
+        assert result.employee_contribution_cents == contribution_cents
+        assert (result.affordability_percentage <= result.threshold) == affordable
+        for field, cents in (("annual_salary", result.household_income_cents), ("hourly_rate", result.hourly_rate_cents)):
+            value = employee[field]
+            expected = to_cents(value) if value else 0
+            assert cents == (expected if expected > 0 else None)
+
+
+@given(st.integers(min_value=0, max_value=10 ** 9))
+def test_cents_column_rounds_like_to_cents(thousandths):
+    amount = Decimal(thousandths).scaleb(-3)
+    values = [str(amount), amount, float(amount)]
+    cents, present = AGENT._cents_column([{"x": v} for v in values], "x")
+    expected = to_cents(amount)
+    assert cents.tolist() == [expected] * 3
+    assert present.tolist() == [bool(amount)] * 3
+
+
+def test_w2_contribution_exactly_at_threshold_is_affordable():
+    rules = tax_rules.get(2026)
+    annual_cents = 12 * 10000 * 100  # 1,200,000 cents; 9.96% / 12 of it is a whole cent amount
+    contribution_cents = annual_cents * rules.affordability_threshold_bp // 120000
+    assert contribution_cents * 120000 == annual_cents * rules.affordability_threshold_bp
+    employee = {"employee_id": "e", "annual_salary": Decimal(annual_cents).scaleb(-2)}
+    coverage = {"employee_monthly_premium": Decimal(contribution_cents).scaleb(-2)}
+    at, = AGENT._calculate_affordability_batch([employee], coverage)
+    coverage["employee_monthly_premium"] += Decimal("0.01")
+    above, = AGENT._calculate_affordability_batch([employee], coverage)
+    assert at.safe_harbor_used == "W2" and at.is_affordable
+    assert not above.is_affordable
@@ -0,0 +1,40 @@
+"""
+Issue and recommendation text rendered from an assessment's reason codes.
+"""
+
+import asyncio
+import dataclasses
+import json
+
+from agents.compliance import ComplianceAgent, ReasonCode
+
+AGENT = ComplianceAgent(tax_year=2026, parallel_threshold=0)
+
+
+def _assess(employee, coverage):
+    return asyncio.run(AGENT.assess_compliance([employee], "client", coverage)).assessments[0]
+
+
+def test_to_dict_carries_the_rendered_text():
+    assessment = _assess(
+        {"employee_id": "e", "hire_date": "2020-01-01", "employment_type": "full_time"},
+        {"offer_made": False}
+    )
+    data = assessment.to_dict()
+
+    assert "issues" not in dataclasses.asdict(assessment)
+    assert data["issues"] == assessment.issues
+    assert data["recommendations"] == assessment.recommendations
+    assert data["penalty_risk"]["reason_code"] == ReasonCode.NO_OFFER
+    assert data["penalty_risk"]["reason"] == "No coverage offered to full-time employee"
+    assert data["penalty_risk"]["mitigation_options"] == assessment.penalty_risk.mitigation_options
+    json.dumps(data, default=str)
+
+
+def test_to_dict_without_penalty_risk():
+    assessment = _assess({"employee_id": "e", "hire_date": "2020-01-01"}, {"offer_made": True})
+    data = assessment.to_dict()
+
+    assert data["penalty_risk"] is None
+    assert data["issues"] == assessment.issues
+    assert data["reason_codes"] == assessment.reason_codes
@@ -0,0 +1,164 @@
+"""
+Compliance status persistence.
+
+The integration tests need a PostgreSQL database with db/schema.sql applied,
+named by DATABASE_URL, and asyncpg; they are skipped otherwise. They add one
+organization, client and its employees, and delete them again afterwards.
+"""
+
+import asyncio
+import uuid
+from datetime import date
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from agents.compliance import ComplianceAgent
+from routes import compliance
+from services.compliance_store import (
+    ASYNCPG_AVAILABLE, DATABASE_URL, ComplianceStatusStore, compliance_status_store,
+)
+
+requires_database = pytest.mark.skipif(
+    not (ASYNCPG_AVAILABLE and DATABASE_URL),
+    reason="needs asyncpg and DATABASE_URL pointing at a database with db/schema.sql"
+)
+
+AGENT = ComplianceAgent(tax_year=2026, parallel_threshold=0)
+COVERAGE = {"offer_made": True, "employee_monthly_premium": 120}
+
+
+def _employees(ids):
+    return [{"employee_id": i, "hire_date": "2020-01-01", "employment_type": "full_time"} for i in ids]
+
+
+def _client_with_employees(conn, ids):
+    """Insert an organization and client with the given employees; returns (org, client)"""
+    async def run():
+        org = await conn.fetchval(
+            "INSERT INTO organizations (name, type) VALUES ('test', 'employer') RETURNING id"
+        )
+        client = await conn.fetchval(
+            "INSERT INTO clients (organization_id, name, ein) "
+            "VALUES ($1, 'test', '00-0000000') RETURNING id", org
+        )
+        await conn.executemany(
+            "INSERT INTO employees "
+            "(organization_id, client_id, first_name, last_name, employee_id, hire_date) "
+            "VALUES ($1, $2, 'f', 'l', $3, $4)",
+            [(org, client, employee_id, date(2020, 1, 1)) for employee_id in ids]
+        )
+        return org, client
+    return run()
+
+
+def test_client_id_must_be_a_uuid():
+    store = ComplianceStatusStore(dsn=None)
+    with pytest.raises(ValueError, match="client UUID"):
+        store.writer("client-1", 2026)
+    client_id = uuid.uuid4()
+    assert store.writer(str(client_id).upper(), 2026).client_id == str(client_id)
+
+
+@requires_database
+def test_upsert_counts_written_unchanged_and_unmatched_rows():
+    import asyncpg
+
+    async def run():
+        conn = await asyncpg.connect(DATABASE_URL)
+        org, client = await _client_with_employees(conn, ["e1", "e2"])
+        store = ComplianceStatusStore(DATABASE_URL)
+        try:
+            # e3 is not an employee of the client, and a record without an
+            # employee_id is assessed under a fallback id that matches no one
+            employees = _employees(["e1", "e2", "e3"]) + [{"hire_date": "2020-01-01", "employment_type": "full_time"}]
+            result = await AGENT.assess_compliance(employees, str(client), COVERAGE)
+            assessments = result.assessments
+
+            first = await store.write(assessments, str(client), 2026)
+            again = await store.write(assessments, str(client), 2026)
+            rows = await conn.fetchval("SELECT count(*) FROM compliance_status WHERE client_id = $1", client)
+            return first, again, rows
+        finally:
+            await store.close()
+            await conn.execute("DELETE FROM organizations WHERE id = $1", org)
+            await conn.close()
+
+    first, again, rows = asyncio.run(run())
+
+    assert (first.rows_staged, first.rows_written, first.rows_unmatched) == (48, 24, 24)
+    assert (again.rows_written, again.rows_unmatched) == (0, 24)
+    assert rows == 24
+
+
+@requires_database
+def test_duplicate_employee_ids_are_rejected():
+    import asyncpg
+
+    async def run():
+        conn = await asyncpg.connect(DATABASE_URL)
+        try:
+            async with conn.transaction():
+                org = await conn.fetchval(
+            "INSERT INTO organizations (name, type) VALUES ('test', 'employer') RETURNING id"
+        )
+                client = await conn.fetchval(
+                    "INSERT INTO clients (organization_id, name, ein) VALUES ($1, 'test', '00-0000000') RETURNING id", org
+                )
+                await conn.executemany(
+                    "INSERT INTO employees (organization_id, client_id, first_name, last_name, employee_id, hire_date) "
+                    "VALUES ($1, $2, 'f', 'l', 'e1', $3)",
+                    [(org, client, date(2020, 1, 1))] * 2
+                )
+        finally:
+            await conn.close()
+
+    with pytest.raises(Exception, match="idx_employees_client_employee_id"):
+        asyncio.run(run())
+
+
+def test_safe_harbor_analysis_needs_a_database(monkeypatch):
+    app = FastAPI()
+    app.include_router(compliance.router, prefix="/api")
+    monkeypatch.setattr(compliance_status_store, "dsn", None)
+
+    response = TestClient(app).get("/api/compliance/safe-harbor/analysis")
+    assert response.status_code == 503
+
+
+@requires_database
+def test_safe_harbor_analysis_reads_persisted_affordability():
+    import asyncpg
+
+    ids = [f"e{i}" for i in range(30)]
+    employees = [
+        {**employee, "annual_salary": 9000 + 1500 * i, "hourly_rate": (None, 7.25, 12)[i % 3]}
+        for i, employee in enumerate(_employees(ids))
+    ]
+
+    async def run():
+        conn = await asyncpg.connect(DATABASE_URL)
+        org, client = await _client_with_employees(conn, ids)
+        store = ComplianceStatusStore(DATABASE_URL)
+        try:
+            result = await AGENT.assess_compliance(employees, str(client), COVERAGE)
+            assessments = result.assessments
+            await store.write(assessments, str(client), 2026)
+            persisted = await store.affordabilities(2026, str(client))
+            everyone = await store.affordabilities(2026)
+            return assessments, persisted, everyone
+        finally:
+            await store.close()
+            await conn.execute("DELETE FROM organizations WHERE id = $1", org)
+            await conn.close()
+
+    assessments, persisted, everyone = asyncio.run(run())
+    optimizer = AGENT.safe_harbor_optimizer
+    expected = optimizer.summarize([a.affordability for a in assessments if a.affordability])
+
+    assert optimizer.summarize(persisted) == expected
+    assert len({u.selected for u in expected.usage}) > 1
+    assert len(everyone) >= len(persisted) == 30
+    with pytest.raises(ValueError, match="client UUID"):
+        asyncio.run(ComplianceStatusStore(DATABASE_URL).affordabilities(2026, "client-1"))
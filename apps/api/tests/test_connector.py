@@ -0,0 +1,142 @@
+"""
+Chunked and drop-directory ingestion against whole-file ingestion. A local
+directory stands in for the SFTP landing zone.
+"""
+
+import asyncio
+import io
+
+import pytest
+
+from agents.connector import ConnectorAgent
+
+AGENT = ConnectorAgent()
+
+
+class _Upload:
+    """UploadFile stand-in with an async read(size)"""
+
+    def __init__(self, data: bytes):
+        self._file = io.BytesIO(data)
+
+    async def read(self, size: int) -> bytes:
+        return self._file.read(size)
+
+
+def _stream(data, chunk_size, batch_size=3, **kwargs):
+    async def collect():
+        return [
+            r async for r in AGENT.ingest_csv_stream(
+                _Upload(data), "client", "census.csv", batch_size=batch_size, chunk_size=chunk_size, **kwargs
+            )
+        ]
+    return asyncio.run(collect())
+
+
+def _ingest(directory, range_size=64):
+    async def collect():
+        return [r async for r in AGENT.ingest_from_directory("client", str(directory), range_size=range_size)]
+    return asyncio.run(collect())
+
+
+def test_picks_up_csv_files_in_filename_order(tmp_path):
+    (tmp_path / "b_hours.csv").write_text("id,hours\n1,130\n")
+    (tmp_path / "a_census.CSV").write_text("id,name\n1,Ann\n2,Bob\n")
+    (tmp_path / "notes.txt").write_text("id\n9\n")
+    (tmp_path / "empty.csv").write_bytes(b"")
+    (tmp_path / "archive.csv").mkdir()
+    (tmp_path / "archive.csv" / "old.csv").write_text("id\n8\n")
+
+    results = _ingest(tmp_path)
+
+    assert [r.raw_records.source_prefix for r in results] == ["csv_a_census.CSV", "csv_b_hours.csv"]
+    assert [r.raw_records.source_id(0) for r in results] == ["csv_a_census.CSV_2", "csv_b_hours.csv_2"]
+    assert results[0].raw_records[1].raw_data == {"id": "2", "name": "Bob"}
+    assert all(r.success for r in results)
+
+
+def test_ranges_match_whole_file_ingestion(tmp_path):
+    rows = ["Employee ID, Notes "] + [
+        f'{i},"line one\nline ""two"", {i}"' if i % 3 == 0 else f"{i}," for i in range(40)
+    ]
+    data = "\r\n".join(rows).encode()
+    (tmp_path / "census.csv").write_bytes(data)
+
+    results = _ingest(tmp_path, range_size=50)
+    whole = asyncio.run(AGENT.ingest_csv(data, "client", "census.csv"))
+
+    assert len(results) > 1
+    records = [(r.source_id, r.raw_data) for result in results for r in result.raw_records]
+    assert records == [(r.source_id, r.raw_data) for r in whole.raw_records]
+
+
+def test_bad_rows_and_bad_ranges_are_reported(tmp_path):
+    (tmp_path / "census.csv").write_bytes(b"id,name\n1,Ann\n2,Bob,extra\n3,\xff\xfe\n4,Dee\n")
+
+    results = _ingest(tmp_path, range_size=1)
+    errors = [e for r in results for e in r.errors]
+
+    assert errors[0] == "Row 3: Expected 2 fields, found 3"
+    assert errors[1].startswith("Bytes 26-31:")
+    assert [r.raw_records.source_id(0) for r in results if r.raw_records] == ["csv_census.csv_2", "csv_census.csv_5"]
+    assert [r.records_failed for r in results] == [0, 1, 1, 0]
+
+
+def test_parallel_keeps_the_ranges_around_a_bad_byte(tmp_path):
+    rows = ["id,name,notes"] + [
+        f'{i},Name{i},"line one\nline two"' if i % 50 == 0 else f"{i},Name{i}," for i in range(4000)
+    ]
+    rows[1234] += ",extra"
+    data = bytearray("\n".join(rows).encode() + b"\n")
+    data[data.index(b"Name2000")] = 0xFF
+    path = tmp_path / "census.csv"
+    path.write_bytes(data)
+
+    async def ingest():
+        ranged = [r async for r in AGENT.ingest_csv_path(str(path), "client", range_size=4096)]
+        parallel = await AGENT.ingest_csv_parallel(
+            str(path), "client", max_workers=2, range_size=4096
+        )
+        return ranged, parallel
+
+    ranged, parallel = asyncio.run(ingest())
+    records = [(r.source_id, r.raw_data) for result in ranged for r in result.raw_records]
+
+    assert 3000 < len(parallel.raw_records) < 4000
+    assert [(r.source_id, r.raw_data) for r in parallel.raw_records] == records
+    assert parallel.errors == [e for result in ranged for e in result.errors]
+    assert parallel.errors[0] == "Row 1235: Expected 3 fields, found 4"
+    assert parallel.errors[1].startswith("Bytes ")
+    assert not parallel.success
+
+
+def test_missing_directory_raises(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        _ingest(tmp_path / "missing")
+
+
+def test_stream_matches_whole_file_at_any_chunk_size():
+    rows = ["\ufeffEmployee ID, Name ,Notes"] + [
+        f'{i},"Smith, Ann","line one\nline ""two"" é"' if i % 4 == 0 else f"{i},Bob" for i in range(20)
+    ]
+    rows[6] = "5,Cy,x,extra"  # Wider than the header
+    rows[9] = ""  # Blank lines are skipped
+    data = "\r\n".join(rows).encode()
+    whole = asyncio.run(AGENT.ingest_csv(data, "client", "census.csv"))
+
+    assert whole.errors == ["Row 7: Expected 3 fields, found 4"]
+    for chunk_size in (1, 2, 7, 64, len(data)):
+        results = _stream(data, chunk_size)
+        records = [(r.source_id, r.raw_data) for result in results for r in result.raw_records]
+        assert records == [(r.source_id, r.raw_data) for r in whole.raw_records]
+        assert [e for result in results for e in result.errors] == whole.errors
+        assert all(len(result.raw_records) <= 3 for result in results)
+
+
+def test_stream_stops_at_an_unterminated_quote():
+    data = b'id,notes\n0,ok\n1,"never closed\n' + b"x" * 100 + b"\n2,lost\n"
+
+    results = _stream(data, chunk_size=16, max_record_size=50)
+
+    assert [r.raw_data for result in results for r in result.raw_records] == [{"id": "0", "notes": "ok"}]
+    assert results[-1].errors == ["CSV record exceeds 50 characters (unterminated quoted field?)"]
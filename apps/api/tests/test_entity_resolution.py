@@ -0,0 +1,104 @@
+"""
+Duplicate detection across the records of one upload.
+"""
+
+from agents import entity_resolution
+from agents.entity_resolution import SSN_TYPO_CREDIT, DuplicateDetector
+
+
+def _columns(rows):
+    names = ("ssn", "date_of_birth", "email", "last_name", "first_name")
+    return {name: [row.get(name) for row in rows] for name in names}
+
+
+def _person(i, **overrides):
+    row = {
+        "ssn": f"{100000000 + i * 7919:09d}",
+        "date_of_birth": f"1980-01-{1 + i % 28:02d}",
+        "email": f"person{i}@example.com",
+        "last_name": f"Name{i}",
+        "first_name": ("Ann", "Bob", "Cy")[i % 3],
+    }
+    row.update(overrides)
+    return row
+
+
+def _matches(detector, rows, offset=0):
+    ids = [f"r{offset + i}" for i in range(len(rows))]
+    return [
+        (m.index + offset, m.duplicate_of, m.score, m.matched_fields)
+        for m in detector.add(ids, _columns(rows))
+    ]
+
+
+def test_pair_chunks_do_not_change_matches(monkeypatch):
+    rows = [_person(i % 40, first_name=("Ann", "Bob")[i % 2]) for i in range(200)]
+    expected = _matches(DuplicateDetector(), rows)
+
+    monkeypatch.setattr(entity_resolution, "PAIR_CHUNK_SIZE", 7)
+    assert _matches(DuplicateDetector(), rows) == expected
+    assert len(expected) == 160
+
+
+def test_distinct_people_are_not_flagged():
+    assert _matches(DuplicateDetector(), [_person(i) for i in range(300)]) == []
+
+
+def test_ssn_typo_and_transposition():
+    person = _person(1, ssn="123456789")
+    typo = _person(1, ssn="123456780")
+    swapped = _person(1, ssn="213456789")
+    detector = DuplicateDetector()
+
+    matches = _matches(detector, [person, typo, swapped])
+    assert [(m[0], m[1]) for m in matches] == [(1, "r0"), (2, "r0")]
+    assert all(m[3][0] == "ssn (typo)" for m in matches)
+    assert matches[0][2] == int(35 * SSN_TYPO_CREDIT + 65)  # Every other field agrees
+
+    # Two unrelated digit changes are not a typo, and leave the pair under the threshold
+    assert _matches(DuplicateDetector(), [person, _person(1, ssn="923456781")]) == []
+
+
+def test_rehire_with_a_new_email():
+    person = _person(5)
+    rehire = _person(5, email="rehired5@example.com")
+
+    matches = _matches(DuplicateDetector(), [person, _person(6), rehire])
+    [(index, duplicate_of, score, fields)] = matches
+    assert (index, duplicate_of, score) == (2, "r0", 80)
+    assert fields == ["ssn", "date_of_birth", "last_name", "first_name"]
+
+
+def test_duplicates_across_batches():
+    detector = DuplicateDetector()
+    assert _matches(detector, [_person(i) for i in range(10)]) == []
+
+    second = [_person(i) for i in range(10, 15)] + [_person(3, email=None)]
+    [(index, duplicate_of, score, fields)] = _matches(detector, second, offset=10)
+    assert (index, duplicate_of, score) == (15, "r3", 100)
+    assert "email" not in fields
+
+
+def test_threshold():
+    person = _person(7)
+    rehire = _person(7, email="other@example.com")  # Scores exactly 80
+
+    assert len(_matches(DuplicateDetector(threshold=80), [person, rehire])) == 1
+    assert _matches(DuplicateDetector(threshold=81), [person, rehire]) == []
+
+    # A shared email alone is too little evidence to score at all
+    bare = {"email": "shared@example.com"}
+    assert _matches(DuplicateDetector(threshold=1), [bare, dict(bare)]) == []
+
+
+def test_candidates_are_capped_per_block():
+    same_block = {"date_of_birth": "1980-01-01", "last_name": "Smith"}
+    rows = [
+        _person(i, first_name=name, **same_block)
+        for i, name in enumerate(("Ann", "Bob", "Cy", "Dee", "Eve"))
+    ]
+    # Reachable only through the last name + date of birth block
+    rows.append(_person(0, ssn=None, email=None, **same_block))
+
+    assert [m[:2] for m in _matches(DuplicateDetector(max_block_candidates=5), rows)] == [(5, "r0")]
+    assert _matches(DuplicateDetector(max_block_candidates=3), rows) == []
@@ -0,0 +1,147 @@
+"""
+Reuse of unchanged assessments through the fingerprint store.
+"""
+
+import asyncio
+from datetime import datetime
+
+from agents.compliance import AssessmentFingerprintStore, ClientComplianceTotals, ComplianceAgent
+
+COVERAGE = {"offer_made": True, "employee_monthly_premium": 300}
+
+
+def _agent():
+    return ComplianceAgent(tax_year=2026, fingerprint_store=AssessmentFingerprintStore(), parallel_threshold=0)
+
+
+def _employee(employee_id, tax_year=2026, salary=30000):
+    return {
+        "employee_id": employee_id,
+        "hire_date": "2020-01-01",
+        "employment_type": "full_time",
+        "annual_salary": salary,
+        "tax_year": tax_year,
+    }
+
+
+def _assess(agent, employees, coverage=COVERAGE):
+    return asyncio.run(agent.assess_compliance(employees, "client", coverage))
+
+
+def _population(n=40):
+    # Salaries either side of the affordability threshold, so statuses differ
+    return [_employee(f"e{i}", salary=12000 + 700 * i) for i in range(n)]
+
+
+def _fresh(employees, coverage=COVERAGE):
+    """The same batch assessed without any reuse"""
+    return [a.to_dict() for a in _assess(_agent(), employees, coverage).assessments]
+
+
+def _recounted(assessments):
+    totals = ClientComplianceTotals()
+    for assessment in assessments:
+        totals.apply(assessment, 1)
+    return totals
+
+
+def test_each_tax_year_keeps_its_own_assessment():
+    agent = _agent()
+    employees = [_employee("e1", 2024), _employee("e1", 2026)]
+
+    assert _assess(agent, employees).reused == 0
+    assert _assess(agent, employees).reused == 2
+    assert agent.fingerprint_store.totals("client").total_assessed == 2
+    assert sorted(a.tax_year for a in agent.fingerprint_store.assessments("client")) == [2024, 2026]
+
+
+def test_unchanged_employees_are_not_reassessed(monkeypatch):
+    agent = _agent()
+    employees = _population()
+    first = _assess(agent, employees)
+
+    monkeypatch.setattr(agent, "_assess_employee", None)  # Any reassessment fails
+    second = _assess(agent, [dict(employee) for employee in employees])
+
+    assert second.reused == len(employees)
+    assert all(a is b for a, b in zip(first.assessments, second.assessments))
+    assert (second.compliant, second.at_risk, second.non_compliant) == (
+        first.compliant, first.at_risk, first.non_compliant
+    )
+    assert second.aggregate_penalty_cents == first.aggregate_penalty_cents
+
+
+def test_changed_input_field_is_reassessed():
+    agent = _agent()
+    employees = _population()
+    _assess(agent, employees)
+
+    employees[3] = {**employees[3], "annual_salary": 90000}
+    employees[7] = {**employees[7], "offer_months": [1, 2, 3]}
+    result = _assess(agent, employees)
+
+    assert result.reused == len(employees) - 2
+    assert [a.to_dict() for a in result.assessments] == _fresh(employees)
+
+
+def test_changed_coverage_reassesses_everyone():
+    agent = _agent()
+    employees = _population()
+    _assess(agent, employees)
+
+    coverage = {**COVERAGE, "employee_monthly_premium": 150}
+    result = _assess(agent, employees, coverage)
+
+    assert result.reused == 0
+    assert [a.to_dict() for a in result.assessments] == _fresh(employees, coverage)
+    assert _assess(agent, employees, coverage).reused == len(employees)
+
+
+def test_totals_follow_replaced_assessments():
+    agent = _agent()
+    store = agent.fingerprint_store
+    employees = _population()
+    _assess(agent, employees)
+    before = store.totals("client")
+    assert before == _recounted(store.assessments("client"))
+    assert before.at_risk and before.compliant
+
+    # Raise the lowest salaries (affordable now) and add a new hire in a later batch
+    _assess(agent, [_employee(f"e{i}", salary=60000) for i in range(5)])
+    _assess(agent, [_employee("new", salary=12000)])
+    after = store.totals("client")
+
+    assert after == _recounted(store.assessments("client"))
+    assert after.total_assessed == len(employees) + 1
+    assert after.compliant > before.compliant
+    assert after.aggregate_penalty_cents != before.aggregate_penalty_cents
+
+
+def test_stale_entries_are_reassessed_in_collect():
+    agent = _agent()
+    employees = _population()
+    _assess(agent, employees)
+
+    # Fingerprints looked up, then the client is dropped before the batch is collected
+    known = agent._known_fingerprints(employees, "client")
+    fingerprints, assessments = agent._assess_rows(employees, "client", COVERAGE, known)
+    assert assessments == [None] * len(employees)
+    agent.fingerprint_store.forget("client")
+    start = datetime.now()
+    result = agent._collect(employees, "client", COVERAGE, fingerprints, assessments, start)
+
+    assert result.reused == 0
+    assert [a.to_dict() for a in result.assessments] == _fresh(employees)
+    assert agent.fingerprint_store.totals("client") == _recounted(result.assessments)
+    assert _assess(agent, employees).reused == len(employees)
+
+
+def test_evicted_clients_are_reassessed():
+    store = AssessmentFingerprintStore(max_clients=1)
+    agent = ComplianceAgent(tax_year=2026, fingerprint_store=store, parallel_threshold=0)
+    employees = _population(5)
+    _assess(agent, employees)
+    asyncio.run(agent.assess_compliance(employees, "other", COVERAGE))
+
+    assert agent.fingerprint_store.assessments("client") == []
+    assert _assess(agent, employees).reused == 0
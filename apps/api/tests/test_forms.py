@@ -0,0 +1,81 @@
+"""
+Form generation routes.
+"""
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from routes import forms
+
+app = FastAPI()
+app.include_router(forms.router, prefix="/api/forms")
+client = TestClient(app)
+
+
+def _hours(employee_id: str, year: int, months, hours: float):
+    return [
+        {"employee_id": employee_id, "year": year, "month": m, "hours_of_service": hours}
+        for m in months
+    ]
+
+
+def test_1094c_counts_come_from_monthly_hours():
+    hours = []
+    for i in range(50):
+        hours += _hours(f"ft{i}", 2025, range(1, 13), 130) + _hours(f"ft{i}", 2026, range(1, 13), 130)
+    hours += _hours("late", 2026, range(7, 13), 140)  # Full-time from July
+    hours += _hours("pt", 2026, range(1, 13), 60)
+
+    response = client.post("/api/forms/1094c/generate", json={"client_id": "c", "tax_year": 2026, "hours": hours})
+    assert response.status_code == 200
+    form = forms.forms_1094c[response.json()["form_id"]]
+
+    assert form.ale_member
+    assert form.full_time_counts == [50] * 6 + [51] * 6
+    assert form.total_employee_counts == [51] * 6 + [52] * 6
+    assert (form.full_time_count, form.total_employee_count, form.total_1095c_forms) == (51, 52, 51)
+
+
+def test_1094c_pdf_counts_come_from_the_ale_determination(monkeypatch):
+    hours = []
+    for i in range(60):
+        hours += _hours(f"ft{i}", 2025, range(1, 13), 130)
+        hours += _hours(f"ft{i}", 2026, range(1, 13), 130)
+    hours += _hours("late", 2026, range(4, 13), 135)
+    request = {"client_id": "c", "tax_year": 2026, "hours": hours}
+    form_id = client.post("/api/forms/1094c/generate", json=request).json()["form_id"]
+
+    response = client.get(f"/api/forms/1094c/{form_id}/pdf")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/pdf"
+    assert response.content.startswith(b"%PDF")
+
+    rendered = []
+    render = lambda data: rendered.append(data) or b""  # noqa: E731
+    monkeypatch.setattr(forms.pdf_generator, "generate_1094c_pdf", render)
+    client.get(f"/api/forms/1094c/{form_id}/pdf")
+    [data] = rendered
+    assert data.is_ale_member
+    assert data.monthly_fte_counts == [60] * 3 + [61] * 9
+    assert data.monthly_total_employee_counts == [60] * 3 + [61] * 9
+    assert (data.full_time_employees, data.total_employees, data.total_1095c_forms) == (61, 61, 61)
+    assert data.tax_year == 2026
+    assert client.get("/api/forms/1094c/missing/pdf").status_code == 404
+
+
+def test_1094c_below_the_ale_threshold():
+    hours = _hours("a", 2025, range(1, 13), 130) + _hours("a", 2026, range(1, 13), 130)
+    response = client.post("/api/forms/1094c/generate", json={"client_id": "c", "tax_year": 2026, "hours": hours})
+    assert not forms.forms_1094c[response.json()["form_id"]].ale_member
+
+
+def test_1094c_requires_hours():
+    response = client.post("/api/forms/1094c/generate", json={"client_id": "c", "tax_year": 2026, "hours": []})
+    assert response.status_code == 422
+
+
+def test_tax_years_without_rules_are_rejected():
+    for path, extra in [("1095c/generate", {}), ("1094c/generate", {"hours": _hours("a", 2019, [1], 130)})]:
+        response = client.post(f"/api/forms/{path}", json={"client_id": "c", "tax_year": 2019, **extra})
+        assert response.status_code == 422
+        assert "No ACA rules registered for tax year 2019" in response.text
@@ -0,0 +1,72 @@
+"""Fuzzy header resolution: near-miss headers must not claim canonical fields"""
+
+import pytest
+
+from agents.header_index import FuzzyHeaderIndex, covers, header_tokens
+from agents.mapping_plans import MappingPlanStore
+from agents.normalizer import HEADER_INDEX, NormalizerAgent
+
+
+@pytest.mark.parametrize("header, canonical", [
+    ("Emp. Hire Dt", "hire_date"),
+    ("Date of Hire", "hire_date"),
+    ("Hire Dates", "hire_date"),
+    ("Term Dt", "termination_date"),
+    ("Soc Sec No", "ssn"),
+    ("Birth Dt", "date_of_birth"),
+    ("Addr Line 1", "address_line1"),
+    ("Emp Status", "employment_status"),
+])
+def test_abbreviated_headers_resolve(header, canonical):
+    match = HEADER_INDEX.match(header)
+    assert match is not None
+    assert match.canonical == canonical
+
+
+@pytest.mark.parametrize("header", [
+    "Status Date",
+    "State Tax",
+    "Employer ID",
+    "Manager Employee ID",
+    "Spouse Date of Birth",
+    "Last Hire Date",
+    "Rehire Date",
+    "Address 3",
+])
+def test_qualified_headers_do_not_resolve(header):
+    assert HEADER_INDEX.match(header) is None
+
+
+def test_similarity_alone_is_not_a_match():
+    index = FuzzyHeaderIndex({"hire_date": "hire_date"}, threshold=0.0)
+    assert index.match("rehire date") is None
+    assert index.match("hire dt").canonical == "hire_date"
+
+
+def test_covers():
+    alias = header_tokens("termination date")
+    assert covers(alias, header_tokens("term date"))
+    assert covers(alias, header_tokens("emp termination dates"))
+    assert not covers(alias, header_tokens("termination date tax"))
+    assert not covers(header_tokens("address line1"), header_tokens("address line 2"))
+
+
+def test_resolve_header_leaves_near_misses_unmapped():
+    agent = NormalizerAgent(mapping_store=MappingPlanStore(directory=None))
+    header = ("Employee ID", "Rehire Date", "Spouse Date of Birth", "Emp. Hire Dt")
+    canonical, confidence = agent._resolve_header(header, {})
+    assert canonical[0] == "employee_id" and confidence[0] == 100
+    assert canonical[1] != "hire_date" and confidence[1] == 0
+    assert canonical[2] != "date_of_birth" and confidence[2] == 0
+    assert canonical[3] == "hire_date" and 75 <= confidence[3] < 100
+
+
+def test_plans_from_older_resolvers_are_recompiled(tmp_path):
+    store = MappingPlanStore(directory=str(tmp_path))
+    with open(store._path("c1"), "w", encoding="utf-8") as f:
+        f.write(
+            '{"hints": {"x": "ssn"}, "plans": {"sig": {"header": ["Rehire Date"], '
+            '"canonical": ["hire_date"], "confidence": [80]}}}'
+        )
+    assert store.get_plan("c1", "sig") is None
+    assert store.get_hints("c1") == {"x": "ssn"}
@@ -0,0 +1,135 @@
+"""
+LLM-assisted field mapping against a mock Messages API.
+"""
+
+import asyncio
+import json
+import threading
+from datetime import datetime
+
+import httpx
+import pytest
+
+from agents.connector import DataSourceType, RawRecordBatch
+from agents.llm_mapper import LLMFieldMapper
+from agents.mapping_plans import MappingPlanStore
+from agents.normalizer import NormalizerAgent, CANONICAL_FIELDS, CANONICAL_VALUES
+
+REQUEST = dict(
+    header_signature="sig",
+    unresolved_headers=["Wrk Start", "Mystery"],
+    unmapped_values={"employment_status": ["Sabbatical", "Gone Fishing"]},
+    canonical_fields=CANONICAL_FIELDS,
+    allowed_values=CANONICAL_VALUES,
+)
+
+
+class _Model:
+    """Messages API stand-in that replies with a fixed answer and records requests"""
+
+    def __init__(self, answer=None, error=None):
+        self.answer = answer
+        self.error = error
+        self.requests = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(json.loads(request.content))
+        if self.error is not None:
+            raise self.error
+        if isinstance(self.answer, int):
+            return httpx.Response(self.answer, json={"error": {"type": "api_error"}})
+        text = "Here you go:\n" + json.dumps(self.answer)
+        return httpx.Response(200, json={"content": [{"type": "text", "text": text}]})
+
+
+def _batch() -> RawRecordBatch:
+    batch = RawRecordBatch(
+        source_type=DataSourceType.MANUAL_UPLOAD,
+        client_id="client",
+        source_prefix="csv_test.csv",
+        header=("employee id", "hire date", "status"),
+        ingested_at=datetime(2026, 1, 1)
+    )
+    batch.append(("1", "01/02/2020", "Sabbatical"), 2)
+    return batch
+
+
+def _mapper(model: _Model, cache_dir=None) -> LLMFieldMapper:
+    return LLMFieldMapper(
+        "test-key",
+        base_url="http://model.test",
+        cache_dir=cache_dir,
+        transport=httpx.MockTransport(model)
+    )
+
+
+def test_answers_are_restricted_to_allowed_targets():
+    model = _Model({
+        "field_mappings": {"Wrk Start": "hire_date", "Mystery": "shoe_size", "Not Asked": "salary"},
+        "value_mappings": {
+            "employment_status": {"Sabbatical": "on_leave", "Gone Fishing": "fishing", "Never Sent": "active"},
+            "employment_type": {"FT": "full_time"},
+        },
+    })
+    result = asyncio.run(_mapper(model).resolve(**REQUEST))
+
+    assert result.field_mappings == {"Wrk Start": "hire_date"}
+    assert result.value_mappings == {"employment_status": {"Sabbatical": "on_leave"}}
+    assert model.requests[0]["messages"][0]["content"].count("Sabbatical") == 1
+
+
+def test_cache_hit_skips_the_model(tmp_path):
+    model = _Model({"field_mappings": {"Wrk Start": "hire_date"}})
+    first = asyncio.run(_mapper(model, str(tmp_path)).resolve(**REQUEST))
+    # Same headers and values in another order hit the entry written above
+    reordered = dict(REQUEST, unresolved_headers=["Mystery", "Wrk Start", "Mystery"])
+    second = asyncio.run(_mapper(model, str(tmp_path)).resolve(**reordered))
+
+    assert len(model.requests) == 1
+    assert (first.cached, second.cached) == (False, True)
+    assert second.field_mappings == first.field_mappings == {"Wrk Start": "hire_date"}
+
+
+def test_cache_files_are_read_and_written_off_the_event_loop(tmp_path, monkeypatch):
+    threads = []
+    for name in ("_read_cache", "_write_cache"):
+        method = getattr(LLMFieldMapper, name)
+
+        def recorded(self, *args, _name=name, _method=method):
+            threads.append((_name, threading.get_ident()))
+            return _method(self, *args)
+
+        monkeypatch.setattr(LLMFieldMapper, name, recorded)
+
+    mapper = _mapper(_Model({"field_mappings": {"Wrk Start": "hire_date"}}), str(tmp_path))
+
+    async def resolve():
+        await mapper.resolve(**REQUEST)
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(resolve())
+
+    assert [name for name, _ in threads] == ["_read_cache", "_write_cache"]
+    assert all(thread != loop_thread for _, thread in threads)
+
+
+@pytest.mark.parametrize("model", [
+    _Model(error=httpx.ReadTimeout("timed out")),
+    _Model(500),
+    _Model(429),
+])
+def test_model_failures_fall_back_to_rules(tmp_path, model):
+    mapper = _mapper(model, str(tmp_path))
+    with pytest.raises(httpx.HTTPError):
+        asyncio.run(mapper.resolve(**REQUEST))
+    assert not list(tmp_path.iterdir())  # Failures are not cached
+
+    agent = NormalizerAgent(mapping_store=MappingPlanStore(directory=None), llm_mapper=mapper)
+    rules_only = NormalizerAgent(mapping_store=MappingPlanStore(directory=None))
+    rules_only.llm_mapper = None
+    result = asyncio.run(agent.normalize_batch(_batch(), "client"))
+    expected = asyncio.run(rules_only.normalize_batch(_batch(), "client"))
+
+    assert len(model.requests) == 2
+    assert result.success
+    assert result.normalized_records[0].employment_status == expected.normalized_records[0].employment_status
@@ -0,0 +1,66 @@
+"""
+Mapping plan persistence and the field-mapping route that edits the hints.
+"""
+
+import json
+import threading
+import uuid
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from agents.mapping_plans import HeaderMappingPlan, MappingPlanStore, mapping_plan_store
+from routes import integrations
+
+app = FastAPI()
+app.include_router(integrations.router, prefix="/api")
+client = TestClient(app)
+
+
+def _plan(signature: str) -> HeaderMappingPlan:
+    return HeaderMappingPlan(signature=signature, header=("SSN",), canonical=("ssn",), confidence=(100,))
+
+
+def test_writes_are_coalesced_and_flushed(tmp_path, monkeypatch):
+    store = MappingPlanStore(directory=str(tmp_path))
+    writes = []
+    gate = threading.Event()
+    write = store._write
+
+    def held_write(*args):
+        gate.wait()  # Hold the first write until every change below is made
+        writes.append(args)
+        write(*args)
+
+    monkeypatch.setattr(store, "_write", held_write)
+
+    store.update_hints("c1", {"Badge": "employee_id"})
+    for i in range(50):
+        store.put_plan("c1", _plan(f"sig{i}"))
+    gate.set()
+    store.flush()
+
+    assert len(writes) == 1
+    with open(store._path("c1"), encoding="utf-8") as f:
+        stored = json.load(f)
+    assert stored["hints"] == {"badge": "employee_id"}
+    assert len(stored["plans"]) == 50
+
+    reloaded = MappingPlanStore(directory=str(tmp_path))
+    assert reloaded.get_plan("c1", "sig49") == _plan("sig49")
+
+
+def test_field_mapping_rejects_unknown_targets():
+    client_id = str(uuid.uuid4())  # The shared store persists to MAPPING_PLAN_DIR
+    url = f"/api/integrations/connections/conn/field-mapping?client_id={client_id}"
+    response = client.put(url, json=[
+        {"source": "Badge", "target": "employee_id"},
+        {"source": "Shoe", "target": "shoe_size"},
+    ])
+    assert response.status_code == 422
+    assert "shoe_size" in response.json()["detail"]
+    assert mapping_plan_store.get_hints(client_id) == {}
+
+    response = client.put(url, json=[{"source": "Badge", "target": "employee_id"}])
+    assert response.status_code == 200
+    assert mapping_plan_store.get_hints(client_id) == {"badge": "employee_id"}
@@ -0,0 +1,61 @@
+"""
+Look-back measurement feeding the assessment.
+
+Determinations are made as of the end of the assessed tax year, and the
+monthly form codes follow the stability periods month by month rather than
+the whole-year FTE verdict.
+"""
+
+from agents.compliance import ALL_MONTHS, ComplianceAgent, FTEStatus, MeasurementPeriodEngine
+
+AGENT = ComplianceAgent(tax_year=2026, parallel_threshold=0)
+ENGINE = AGENT.measurement_engine
+
+
+def _hours(first_month: int, last_month: int, hours: float):
+    """hours_worked entries for month ordinals first_month..last_month - 1"""
+    return [
+        {"period": f"{m // 12:04d}-{m % 12 + 1:02d}", "hours": hours}
+        for m in range(first_month, last_month)
+    ]
+
+
+def test_new_hire_status_is_as_of_the_tax_year_end():
+    employee = {"employee_id": "e", "hire_date": "2025-03-01", "employment_type": "full_time"}
+    assert AGENT._determine_fte([{**employee, "tax_year": 2025}])[0].is_new_hire
+    assert not AGENT._determine_fte([{**employee, "tax_year": 2026}])[0].is_new_hire
+
+
+def test_monthly_codes_follow_the_stability_period():
+    # Full-time over the standard measurement period for 2026, part-time since:
+    # the latest look-back window says part-time, the stability period says
+    # full-time for the whole year
+    measurement_start, measurement_end, _, _ = ENGINE.standard_periods(2026 * 12)
+    employee = {
+        "employee_id": "e",
+        "hire_date": "2020-01-01",
+        "hours_worked": _hours(measurement_start, measurement_end, 140) + _hours(measurement_end, 2026 * 12 + 12, 40),
+    }
+    assessment = AGENT._assess_employee(employee, "client", None)
+    assert assessment.fte_determination.status == FTEStatus.PART_TIME
+    assert assessment.monthly_codes.full_time_months == ALL_MONTHS
+    assert "2B" not in assessment.monthly_codes.line_16
+
+
+def test_classified_employees_keep_the_whole_year_status():
+    employee = {"employee_id": "e", "hire_date": "2020-01-01", "employment_type": "full_time"}
+    assessment = AGENT._assess_employee(employee, "client", None)
+    assert assessment.monthly_codes.full_time_months == ALL_MONTHS
+
+
+def test_hours_calendar_is_clamped_to_the_measurement_window():
+    engine = MeasurementPeriodEngine()
+    window = engine.measurement_window(2026 * 12, 2026 * 12 + 11)
+    employees = [
+        {"hours_worked": [{"period": "1900-01", "hours": 130}, {"period": "2025-06", "hours": 130}]},
+        {"hours_worked": [{"period": "9999-12", "hours": 130}]},
+    ]
+    calendar = engine.hours_calendar(employees, window)
+    assert calendar.hours.shape[1] <= window[1] - window[0] + 1
+    assert calendar.hours[:, -1].tolist() == [130, 0]
+    assert engine.full_time_months(employees, 2026).tolist() == engine.full_time_months(employees, 2026, calendar).tolist()
@@ -0,0 +1,128 @@
+"""
+Columnar, sharded and streamed normalization against the row-wise path.
+"""
+
+import asyncio
+import dataclasses
+from datetime import datetime
+
+from agents.connector import DataSourceType, RawRecordBatch
+from agents.llm_mapper import LLMMappingResult
+from agents.mapping_plans import MappingPlanStore
+from agents.normalizer import NormalizerAgent
+
+HEADER = ("employee id", "hire date", "salary", "status")
+PERSON_HEADER = ("employee id", "first name", "last name", "ssn", "dob", "hire date", "salary", "status")
+
+
+class _Unreadable:
+    """A raw value whose text cannot be read"""
+
+    def __str__(self) -> str:
+        raise ValueError("unreadable value")
+
+
+class _CountingMapper:
+    """LLMFieldMapper stand-in that maps one status value and counts calls"""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def resolve(self, **kwargs) -> LLMMappingResult:
+        self.calls += 1
+        return LLMMappingResult(value_mappings={"employment_status": {"Sabbatical": "on_leave"}})
+
+
+def _batch(rows, header=HEADER) -> RawRecordBatch:
+    batch = RawRecordBatch(
+        source_type=DataSourceType.MANUAL_UPLOAD,
+        client_id="client",
+        source_prefix="csv_test.csv",
+        header=header,
+        ingested_at=datetime(2026, 1, 1)
+    )
+    for row_num, row in enumerate(rows, start=2):
+        batch.append(row, row_num)
+    return batch
+
+
+def _record_tuple(record):
+    return dataclasses.astuple(dataclasses.replace(record, transformations=list(record.transformations)))
+
+
+def test_columnar_reports_failed_records_like_the_row_path():
+    unreadable = _Unreadable()
+    batch = _batch([
+        ("1", "01/02/2020", "$50,000", "A"),
+        ("2", unreadable, "1", "A"),
+        ("3", "2020-01-01", unreadable, "T"),
+        ("4", unreadable, "2", "A"),
+    ])
+    agent = NormalizerAgent(mapping_store=MappingPlanStore(directory=None))
+    rows = asyncio.run(agent.normalize_batch(batch, "client"))
+    columns = asyncio.run(agent.normalize_columnar(batch, "client"))
+
+    assert columns.errors == rows.errors == ["Record 1: unreadable value", "Record 3: unreadable value"]
+    assert not columns.success
+    assert (columns.records_normalized, columns.records_failed) == (2, 2)
+    assert [_record_tuple(r) for r in columns.normalized_records] == [_record_tuple(r) for r in rows.normalized_records]
+
+
+def test_stream_learns_mappings_once():
+    mapper = _CountingMapper()
+    agent = NormalizerAgent(mapping_store=MappingPlanStore(directory=None), llm_mapper=mapper)
+
+    async def batches():
+        yield _batch([("1", "01/02/2020", "1", "Sabbatical")])
+        yield _batch([("2", "01/02/2020", "1", "Sabbatical")])
+
+    async def normalize():
+        return [result async for result in agent.normalize_stream(batches(), "client")]
+
+    results = asyncio.run(normalize())
+    assert mapper.calls == 1
+    assert [r.normalized_records[0].employment_status for r in results] == ["on_leave", "on_leave"]
+
+
+def _people(n):
+    # Every seventh row repeats an earlier person (a rehire), often in another shard
+    rows = []
+    for i in range(n):
+        person = i - 5 if i % 7 == 6 else i
+        rows.append((
+            str(i),
+            ("Ann", "Bob", "Cy")[person % 3],
+            f"Name{person}",
+            f"{100000000 + person * 7919:09d}",
+            f"01/{1 + person % 28:02d}/1980",
+            ("01/02/2020", "2021-05-06", "bad date")[i % 3],
+            ("$50,000", "70000.5", "abc")[i % 3],
+            ("A", "T", "x")[i % 3],
+        ))
+    return _batch(rows, PERSON_HEADER)
+
+
+def test_sharded_and_streamed_match_batch():
+    batch = _people(60)
+    agent = NormalizerAgent(mapping_store=MappingPlanStore(directory=None))
+    agent.llm_mapper = None
+    expected = asyncio.run(agent.normalize_batch(batch, "client"))
+    sharded = asyncio.run(agent.normalize_sharded(batch, "client", max_workers=2, shard_size=8))
+
+    async def normalize():
+        async def batches():
+            for offset in range(0, len(batch), 8):
+                yield batch.shard(offset, offset + 8)
+        return [result async for result in agent.normalize_stream(batches(), "client", processes=2)]
+
+    streamed = asyncio.run(normalize())
+
+    assert expected.duplicates_detected and expected.records_flagged > expected.duplicates_detected
+    assert [_record_tuple(r) for r in sharded.normalized_records] == [_record_tuple(r) for r in expected.normalized_records]
+    assert [_record_tuple(r) for result in streamed for r in result.normalized_records] == [
+        _record_tuple(r) for r in expected.normalized_records
+    ]
+    for results in ([sharded], streamed):
+        assert [e for r in results for e in r.errors] == expected.errors
+        assert sum(r.records_flagged for r in results) == expected.records_flagged
+        assert sum(r.duplicates_detected for r in results) == expected.duplicates_detected
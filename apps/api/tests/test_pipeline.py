@@ -0,0 +1,65 @@
+"""
+Streaming upload route.
+"""
+
+import uuid
+from contextlib import asynccontextmanager
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from routes import pipeline
+from services.compliance_store import compliance_status_store
+
+
+@asynccontextmanager
+async def lifespan(app):
+    yield
+    await compliance_status_store.close()
+
+
+app = FastAPI(lifespan=lifespan)
+app.include_router(pipeline.router, prefix="/api/pipeline")
+
+CSV = "Employee ID,First Name,Hire Date,Employment Type\n" + "".join(
+    f"{i},Ann,01/02/2020,FT\n" for i in range(250)
+)
+
+
+@pytest.fixture(scope="module")
+def client():
+    # One event loop for every request, as in a server (the store's pool is bound to it)
+    with TestClient(app) as client:
+        yield client
+
+
+def _upload(client, data, filename="census.csv"):
+    return client.post(
+        f"/api/pipeline/upload/{uuid.uuid4()}/stream?batch_size=100",  # Persisted with DATABASE_URL set
+        files={"file": (filename, data, "text/csv")}
+    )
+
+
+def test_stream_upload_returns_before_processing(client):
+    response = _upload(client, CSV)
+    assert response.status_code == 200
+    assert response.json()["records_detected"] == 0
+
+    # TestClient runs background tasks before handing back the response
+    pipeline_id = response.json()["pipeline_id"]
+    status = client.get(f"/api/pipeline/status/{pipeline_id}").json()
+    assert (status["status"], status["error"]) == ("completed", None)
+    assert status["records_total"] == status["records_processed"] == 250
+    stages = client.get(f"/api/pipeline/stages/{pipeline_id}").json()
+    assert [s["stage"] for s in stages][:3] == ["connector", "normalizer", "compliance"]
+    assert stages[0]["records_out"] == stages[2]["records_out"] == 250
+
+
+def test_stream_upload_failures_are_reported_on_the_status(client):
+    assert _upload(client, "a,b\n", filename="census.txt").status_code == 400
+
+    response = _upload(client, "id,name\n1,Ann,extra\n")
+    status = client.get(f"/api/pipeline/status/{response.json()['pipeline_id']}").json()
+    assert status["status"] == "failed"
+    assert "Expected 2 fields, found 3" in status["error"]
@@ -0,0 +1,46 @@
+"""
+Penalty scenarios against full assessments.
+"""
+
+import asyncio
+
+from agents.compliance import ComplianceAgent, PenaltyScenario, to_basis_points
+from agents.tax_rules import tax_rules
+
+AGENT = ComplianceAgent(tax_year=2026, parallel_threshold=0)
+
+
+def _employees(tax_year, salaries):
+    return [
+        {
+            "employee_id": f"{tax_year}-{i}",
+            "hire_date": "2020-01-01",
+            "employment_type": "full_time",
+            "annual_salary": salary,
+            "tax_year": tax_year,
+        }
+        for i, salary in enumerate(salaries)
+    ]
+
+
+def test_threshold_rounds_half_up_to_basis_points():
+    assert to_basis_points("0.09125") == 913
+    assert to_basis_points(0.0912) == 912
+    assert to_basis_points("0.091249") == 912
+
+
+def test_mixed_tax_years_match_assess_compliance():
+    assert tax_rules.get(2025).affordability_threshold_bp != tax_rules.get(2026).affordability_threshold_bp
+    salaries = [14000 + 250 * i for i in range(40)]
+    employees = _employees(2025, salaries) + _employees(2026, salaries)
+    scenarios = [PenaltyScenario(name=f"${premium}", employee_monthly_premium=premium) for premium in (120, 135)]
+
+    exposures = AGENT.simulate_scenarios(employees, scenarios, {"offer_made": True})
+
+    for scenario, exposure in zip(scenarios, exposures):
+        coverage = {"offer_made": True, "employee_monthly_premium": scenario.employee_monthly_premium}
+        result = asyncio.run(AGENT.assess_compliance(employees, "client", coverage))
+        assert exposure.total_penalty_cents == result.aggregate_penalty_cents
+        # The 2025 threshold leaves some employees unaffordable that 2026's does not, or the reverse
+        single_year = AGENT.simulate_scenarios(_employees(2026, salaries) * 2, [scenario], {"offer_made": True})[0]
+        assert exposure.unaffordable_count != single_year.unaffordable_count
@@ -0,0 +1,53 @@
+"""
+Assessment on the shared worker pool against inline assessment.
+"""
+
+import asyncio
+
+from agents import worker_pool
+from agents.compliance import ComplianceAgent
+
+COVERAGE = {"offer_made": True, "employee_monthly_premium": 120}
+
+
+def _employees(n):
+    return [
+        {
+            "employee_id": f"e{i}",
+            "hire_date": f"20{10 + i % 15}-0{1 + i % 9}-15",
+            "employment_type": ("full_time", "part_time", "variable")[i % 3],
+            "hours_worked": [{"hours": 40 + 11 * ((i + m) % 13)} for m in range(12)],
+            "annual_salary": 9000 + 400 * i,
+            "offer_months": list(range(1 + i % 4, 13)) if i % 5 else [],
+            "tax_year": (2025, 2026)[i % 2],
+        }
+        for i in range(n)
+    ]
+
+
+def _dicts(result):
+    return [assessment.to_dict() for assessment in result.assessments]
+
+
+def test_pool_matches_inline_assessment():
+    employees = _employees(60)
+    inline = asyncio.run(ComplianceAgent(tax_year=2026, parallel_threshold=0).assess_compliance(
+        employees, "client", COVERAGE
+    ))
+    pooled_agent = ComplianceAgent(tax_year=2026, parallel_threshold=1, shard_size=7)
+    pooled = asyncio.run(pooled_agent.assess_compliance(employees, "client", COVERAGE, max_workers=2))
+
+    async def stream():
+        async def batches():
+            for offset in range(0, len(employees), 25):
+                yield employees[offset:offset + 25]
+        return [r async for r in pooled_agent.assess_compliance_stream(batches(), "client", COVERAGE, processes=2)]
+
+    streamed = asyncio.run(stream())
+    pool = worker_pool.get_worker_pool(2)
+    worker_pool.shutdown_worker_pool()
+
+    assert _dicts(pooled) == _dicts(inline)
+    assert [d for result in streamed for d in _dicts(result)] == _dicts(inline)
+    assert pooled.aggregate_penalty_cents == inline.aggregate_penalty_cents
+    assert pool._mp_context.get_start_method() == worker_pool.START_METHOD